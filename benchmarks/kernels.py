@@ -0,0 +1,357 @@
+"""
+Micro-benchmark of the hot kernels of `binpacksolver.utils`.
+
+Times each kernel for several numbers of items and item-size distributions,
+recording the calls per second and the peak memory allocated by one call, as
+traced by `tracemalloc`, which stands for how much a kernel allocates.
+Results can be saved as a baseline and later compared against it, failing when
+a kernel regresses beyond a threshold:
+
+    python -m benchmarks.kernels --save
+    python -m benchmarks.kernels --compare --threshold 0.2
+
+The kernels whose cost grows quadratically are only run up to their own
+maximum number of items, unless `--all-sizes` is given.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+from tabulate import tabulate
+
+from binpacksolver.utils import (best_fit_decreasing, container_insert,
+                                 first_fit, fitness, generate_container,
+                                 local_search, merge_np, repair_solution,
+                                 valid_solution)
+
+CAPACITY = 1000
+BASELINE = "benchmarks/kernels_baseline.json"
+DISTRIBUTIONS = {
+    "uniform": (0.001, 1.0),
+    "small": (0.001, 0.25),
+    "medium": (0.25, 0.5),
+}
+
+
+class Kernel(NamedTuple):
+    """Builds the call of a kernel for some items, and its largest size."""
+
+    setup: Callable[[np.ndarray, np.random.Generator], Callable[[], object]]
+    max_n: int
+
+
+def __repair(items: np.ndarray, rng: np.random.Generator) -> Callable[[], object]:
+    """A permutation with 10% of its positions invalidated."""
+    new_solution = np.where(rng.random(len(items)) < 0.1, -1, rng.permutation(items))
+    return lambda: repair_solution(items, new_solution, CAPACITY)
+
+
+def __merge(items: np.ndarray, _) -> Callable[[], object]:
+    """Two sorted halves of the items."""
+    half = len(items) // 2
+    a, b = np.sort(items[:half]), np.sort(items[half:])
+    return lambda: merge_np(a, b)
+
+
+def __container_insert(
+    items: np.ndarray, rng: np.random.Generator
+) -> Callable[[], object]:
+    """Moves between random pairs of bins, repacking when fewer than two are left."""
+    state = {}
+
+    def reset():
+        state["solution"] = valid_solution(items, CAPACITY)
+        state["containers"] = generate_container(state["solution"], CAPACITY)
+
+    def call():
+        if len(state["solution"]) < 2:
+            reset()
+        a, b = rng.choice(len(state["solution"]), 2, replace=False)
+        container_insert(
+            (a, b),
+            state["containers"],
+            state["solution"],
+            len(state["solution"]),
+            CAPACITY,
+        )
+
+    reset()
+    return call
+
+
+KERNELS: Dict[str, Kernel] = {
+    "repair_solution": Kernel(__repair, 1000),
+    "fitness": Kernel(lambda items, _: lambda: fitness(items, CAPACITY), 100000),
+    "valid_solution": Kernel(
+        lambda items, _: lambda: valid_solution(items, CAPACITY), 100000
+    ),
+    "first_fit": Kernel(lambda items, _: lambda: first_fit(items, CAPACITY, []), 1000),
+    "best_fit_decreasing": Kernel(
+        lambda items, _: lambda: best_fit_decreasing(items, CAPACITY, []), 1000
+    ),
+    "merge_np": Kernel(__merge, 100000),
+    "container_insert": Kernel(__container_insert, 100000),
+    "local_search": Kernel(
+        lambda items, _: lambda: local_search(items, CAPACITY, 1, CAPACITY), 10000
+    ),
+}
+
+
+def generate_items(n: int, distribution: str, seed: int = 0) -> np.ndarray:
+    """
+    Draws the sizes of n items.
+
+    Parameters
+    ----------
+    n : int
+        Number of items.
+    distribution : str
+        Name of the distribution, see `DISTRIBUTIONS`.
+    seed : int, optional
+        Seed of the generator, by default 0.
+
+    Returns
+    -------
+    np.ndarray
+        The item sizes, between 1 and `CAPACITY`.
+    """
+    low, high = DISTRIBUTIONS[distribution]
+    rng = np.random.default_rng(seed)
+    low, high = max(int(low * CAPACITY), 1), int(high * CAPACITY)
+    return rng.integers(low, high, n, endpoint=True)
+
+
+def measure(call: Callable[[], object], min_time: float, repeat: int) -> float:
+    """
+    Measures the calls per second of a function.
+
+    The function is called until `min_time` seconds have passed, and the best
+    rate of `repeat` rounds is kept.
+
+    Parameters
+    ----------
+    call : Callable[[], object]
+        The function to time.
+    min_time : float
+        Minimum duration of each round in seconds.
+    repeat : int
+        Number of rounds.
+
+    Returns
+    -------
+    float
+        The calls per second of the best round.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while not calls or elapsed < min_time:
+            call()
+            calls += 1
+            elapsed = time.perf_counter() - start
+        best = max(best, calls / elapsed)
+    return best
+
+
+def peak_memory(call: Callable[[], object]) -> float:
+    """
+    Peak memory allocated during one call, in KiB.
+
+    Parameters
+    ----------
+    call : Callable[[], object]
+        The function to trace.
+
+    Returns
+    -------
+    float
+        The peak of the memory traced by `tracemalloc` during the call.
+    """
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+# pylint: disable=R0913
+def run(
+    kernels: List[str],
+    sizes: List[int],
+    distributions: List[str],
+    min_time: float = 0.2,
+    repeat: int = 3,
+    all_sizes: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Runs the benchmark cases.
+
+    Parameters
+    ----------
+    kernels : List[str]
+        Names of the kernels, see `KERNELS`.
+    sizes : List[int]
+        Numbers of items.
+    distributions : List[str]
+        Names of the item-size distributions.
+    min_time : float, optional
+        Minimum duration of each timing round, by default 0.2.
+    repeat : int, optional
+        Number of timing rounds, by default 3.
+    all_sizes : bool, optional
+        Also run the sizes above the maximum of each kernel, by default False.
+
+    Returns
+    -------
+    Dict[str, Dict[str, float]]
+        Calls per second and peak memory of each case, by "kernel/n/distribution".
+    """
+    results = {}
+    for name in kernels:
+        kernel = KERNELS[name]
+        for n in sizes:
+            if n > kernel.max_n and not all_sizes:
+                continue
+            for distribution in distributions:
+                items = generate_items(n, distribution)
+                rng = np.random.default_rng(0)
+                np.random.seed(0)
+                peak = peak_memory(kernel.setup(items, rng))
+                ops = measure(kernel.setup(items, rng), min_time, repeat)
+                results[f"{name}/{n}/{distribution}"] = {"ops": ops, "peak_kib": peak}
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> Tuple[List[list], List[str]]:
+    """
+    Compares results against a baseline.
+
+    A case regresses when its calls per second drop below `1 - threshold` times
+    the baseline, or its peak memory grows above `1 + threshold` times it.
+
+    Parameters
+    ----------
+    results : Dict[str, Dict[str, float]]
+        Results of `run`.
+    baseline : Dict[str, Dict[str, float]]
+        Results saved as the baseline.
+    threshold : float
+        Allowed relative regression.
+
+    Returns
+    -------
+    Tuple[List[list], List[str]]
+        The table rows and the cases that regressed.
+    """
+    rows, regressions = [], []
+    for case, result in results.items():
+        reference = baseline.get(case)
+        row = [*case.split("/"), result["ops"], result["peak_kib"]]
+        if reference is None:
+            rows.append(row + [None, None, "new"])
+            continue
+
+        ratio = result["ops"] / reference["ops"]
+        slower = ratio < 1 - threshold
+        larger = result["peak_kib"] > (1 + threshold) * reference["peak_kib"] + 1
+        status = "REGRESSION" if slower or larger else "ok"
+        if status != "ok":
+            regressions.append(case)
+        rows.append(row + [reference["ops"], ratio, status])
+    return rows, regressions
+
+
+def main(args: List[str] = None) -> int:
+    """Runs the benchmark, saves or compares the baseline and prints the table."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--kernels", nargs="+", default=list(KERNELS), help="kernels")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[100, 1000, 10000, 100000],
+        help="numbers of items",
+    )
+    parser.add_argument(
+        "--distributions",
+        nargs="+",
+        default=list(DISTRIBUTIONS),
+        help="item-size distributions",
+    )
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--repeat", type=int, default=3, help="rounds per case")
+    parser.add_argument(
+        "--all-sizes", action="store_true", help="ignore the maximum size of kernels"
+    )
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="save as the baseline")
+    parser.add_argument(
+        "--compare", action="store_true", help="fail on regressions of the baseline"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed relative regression"
+    )
+    options = parser.parse_args(args)
+
+    baseline = {}
+    if options.compare:
+        try:
+            with open(options.baseline, encoding="utf-8") as file:
+                baseline = json.load(file)["cases"]
+        except FileNotFoundError:
+            parser.error(
+                f"no baseline at {options.baseline}, create it first with --save"
+            )
+
+    results = run(
+        options.kernels,
+        options.sizes,
+        options.distributions,
+        options.min_time,
+        options.repeat,
+        options.all_sizes,
+    )
+
+    rows, regressions = compare(results, baseline, options.threshold)
+    headers = ["kernel", "n", "distribution", "ops/s", "peak memory (KiB)"]
+    if options.compare:
+        headers += ["baseline (ops/s)", "ratio", "status"]
+    else:
+        rows = [row[:5] for row in rows]
+    print(tabulate(rows, headers=headers, floatfmt=".4g"))
+
+    if options.save:
+        with open(options.baseline, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "cases": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed more than {options.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
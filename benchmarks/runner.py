@@ -0,0 +1,309 @@
+"""
+Benchmark runner over the instances of `data/dados.zip`.
+
+Runs heuristics, or the `Solver` with its default configuration, on the
+instances of the zip file, with fixed seeds and time budgets, and
+writes one row per heuristic, instance and budget in the layout of the files of
+`docs/Benchmark`:
+
+    python -m benchmarks.runner --heuristics tabu_search consistent_neighborhood_search \
+        --groups bin3data --time-max 1 10 --runs 3 --output log/benchmark.csv
+
+The instances are parsed once into a memory-mapped binary cache next to the
+zip file, or streamed from the zip with `--no-cache`. Runs are distributed over
+worker processes. The errors against the best solution use the best-known
+values of `Solutions.xlsx`, falling back to the theoretical minimum for the
+instances without one, and with `--target` every run stops as soon as it
+reaches the best-known solution.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+from binpacksolver import Solver, heuristic
+from binpacksolver.utils import (BestKnown, load_best_known, load_instances,
+                                 read_zip_instances, theoretical_minimum)
+
+COLUMNS = [
+    "heuristica",
+    "arquivo",
+    "time_max",
+    "n_itens",
+    "capacidade",
+    "best_fit_mean",
+    "best_fit_min",
+    "best_fit_max",
+    "rmse_theoretical_mean",
+    "mae_theoretical_mean",
+    "mse_theoretical_mean",
+    "rmse_best_solution_mean",
+    "mae_best_solution_mean",
+    "mse_best_solution_mean",
+    "real_time_mean",
+    "real_time_min",
+    "real_time_max",
+]
+
+
+# pylint: disable=R0913
+def run_once(
+    name: str,
+    weights: np.ndarray,
+    capacity: int,
+    time_max: float,
+    seed: int,
+    target: Optional[int] = None,
+) -> Tuple[int, float]:
+    """
+    Runs a heuristic once on an instance.
+
+    Parameters
+    ----------
+    name : str
+        Name of a function of `binpacksolver.heuristic`, or "solver" for the
+        `Solver` with its default heuristics.
+    weights : np.ndarray
+        The item weights.
+    capacity : int
+        The capacity of the bins.
+    time_max : float
+        Time budget of the run in seconds.
+    seed : int
+        Seed of the `random` and `numpy` generators.
+    target : int, optional
+        Number of bins at which the run stops, by default the theoretical
+        minimum.
+
+    Returns
+    -------
+    Tuple[int, float]
+        Number of bins of the solution found and the real time of the run.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    start = time.perf_counter()
+    if name == "solver":
+        solver = Solver(
+            capacity, weights.copy(), time_max=time_max, best_known=target, target=True
+        )
+        _, best_fit = solver.run()
+    else:
+        _, best_fit = getattr(heuristic, name)(
+            weights.copy(), capacity, time_max=time_max, target=target
+        )
+    return int(best_fit), time.perf_counter() - start
+
+
+def summarize(
+    fits: List[int], times: List[float], theoretical: int, best_known: int
+) -> Dict[str, float]:
+    """
+    Summarizes the runs of a heuristic on an instance.
+
+    The errors are computed for each run and then averaged over the runs.
+
+    Parameters
+    ----------
+    fits : List[int]
+        Number of bins found by each run.
+    times : List[float]
+        Real time of each run.
+    theoretical : int
+        Theoretical minimum of the instance.
+    best_known : int
+        Best-known number of bins of the instance.
+
+    Returns
+    -------
+    Dict[str, float]
+        The statistics, by column name.
+    """
+    row = {
+        "best_fit_mean": float(np.mean(fits)),
+        "best_fit_min": int(np.min(fits)),
+        "best_fit_max": int(np.max(fits)),
+    }
+    references = {"theoretical": theoretical, "best_solution": best_known}
+    for suffix, reference in references.items():
+        error = np.array(fits, dtype=float) - reference
+        row[f"rmse_{suffix}_mean"] = float(np.mean(np.sqrt(error**2)))
+        row[f"mae_{suffix}_mean"] = float(np.mean(np.abs(error)))
+        row[f"mse_{suffix}_mean"] = float(np.mean(error**2))
+    row.update(
+        {
+            "real_time_mean": float(np.mean(times)),
+            "real_time_min": float(np.min(times)),
+            "real_time_max": float(np.max(times)),
+        }
+    )
+    return row
+
+
+# pylint: disable=R0913,R0914
+def run_benchmark(
+    instances: Iterable[Tuple[str, str, int, np.ndarray]],
+    heuristics: List[str],
+    budgets: List[float],
+    runs: int = 3,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    best_known: Optional[BestKnown] = None,
+    target: bool = False,
+) -> List[Dict[str, object]]:
+    """
+    Runs every heuristic on every instance for every time budget.
+
+    Parameters
+    ----------
+    instances : Iterable[Tuple[str, str, int, np.ndarray]]
+        The group, file name, capacity and item weights of each instance, as
+        yielded by `read_zip_instances`.
+    heuristics : List[str]
+        Names of the heuristics, see `run_once`.
+    budgets : List[float]
+        Time budgets in seconds.
+    runs : int, optional
+        Number of runs of each heuristic on each instance, by default 3.
+    seed : int, optional
+        Seed of the first run, run r uses `seed + r`, by default 0.
+    workers : int, optional
+        Number of worker processes, by default the number of CPUs. With 1 the
+        runs are executed in the current process.
+    best_known : BestKnown, optional
+        Best-known solutions of the instances.
+    target : bool, optional
+        If set to True, every run stops at the best-known solution of its
+        instance, by default False.
+
+    Returns
+    -------
+    List[Dict[str, object]]
+        One row per heuristic, instance and budget, ordered by heuristic,
+        budget and instance.
+    """
+    best_known = best_known or {}
+    target = target and bool(best_known)
+    workers = workers or os.cpu_count()
+    executor = (
+        concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        if workers > 1
+        else None
+    )
+
+    info, results = {}, {}
+    pending = []
+    for _, name, capacity, weights in instances:
+        theoretical = theoretical_minimum(weights, capacity)
+        best = best_known.get(name, theoretical)
+        info[name] = (len(weights), capacity, theoretical, best)
+        for key in ((h, t, name) for h in heuristics for t in budgets):
+            for run in range(runs):
+                args = (key[0], weights, capacity, key[1], seed + run)
+                args += (best if target else None,)
+                if executor is None:
+                    results.setdefault(key, []).append(run_once(*args))
+                else:
+                    pending.append((key, executor.submit(run_once, *args)))
+
+    if executor is not None:
+        futures = {future: key for key, future in pending}
+        for future in tqdm(
+            concurrent.futures.as_completed(futures),
+            total=len(futures),
+            desc="Running benchmark",
+        ):
+            results.setdefault(futures[future], []).append(future.result())
+        executor.shutdown()
+
+    rows = []
+    for name_heuristic in heuristics:
+        for time_max in budgets:
+            for name, (n, capacity, theoretical, best) in info.items():
+                fits, times = zip(*results[(name_heuristic, time_max, name)])
+                row = {
+                    "heuristica": name_heuristic,
+                    "arquivo": name,
+                    "time_max": time_max,
+                    "n_itens": n,
+                    "capacidade": capacity,
+                }
+                row.update(summarize(fits, times, theoretical, best))
+                rows.append(row)
+    return rows
+
+
+def write_csv(rows: List[Dict[str, object]], path: str):
+    """
+    Writes the benchmark rows in the layout of the files of `docs/Benchmark`.
+
+    Parameters
+    ----------
+    rows : List[Dict[str, object]]
+        Rows returned by `run_benchmark`.
+    path : str
+        Path of the CSV file.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(args: List[str] = None):
+    """Runs the benchmark from the command line and writes the CSV file."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--zip", default="data/dados.zip", help="instances file")
+    parser.add_argument("--groups", nargs="*", help="folders of the zip to run")
+    parser.add_argument("--files", default="*", help="pattern of the file names")
+    parser.add_argument("--cache", help="binary cache path without extension")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="stream the instances from the zip"
+    )
+    parser.add_argument(
+        "--heuristics",
+        nargs="+",
+        default=list(heuristic.__all__),
+        help="heuristic names or 'solver'",
+    )
+    parser.add_argument(
+        "--time-max", nargs="+", type=float, default=[1.0], help="time budgets"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="runs per instance")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--best-known", help="best-known index, see BestKnown")
+    parser.add_argument(
+        "--target", action="store_true", help="stop at the best-known solutions"
+    )
+    parser.add_argument("--output", default="log/benchmark.csv", help="CSV file")
+    options = parser.parse_args(args)
+
+    budgets = [int(t) if float(t).is_integer() else t for t in options.time_max]
+    if options.no_cache:
+        instances = read_zip_instances(options.zip, options.groups, options.files)
+    else:
+        cache = load_instances(options.zip, options.cache)
+        instances = cache.select(options.groups, options.files)
+    rows = run_benchmark(
+        instances,
+        options.heuristics,
+        budgets,
+        runs=options.runs,
+        seed=options.seed,
+        workers=options.workers,
+        best_known=load_best_known(options.zip, options.best_known),
+        target=options.target,
+    )
+    write_csv(rows, options.output)
+
+
+if __name__ == "__main__":
+    main()
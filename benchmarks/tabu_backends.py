@@ -0,0 +1,133 @@
+"""
+Micro-benchmark of the tabu structures.
+
+Compares the native `tabu_structure` extension with the pure Python fallback of
+`binpacksolver.utils.old_tabu_structure`, timing the operations used by the
+heuristics. Run it with the Python version you want to decide about:
+
+    python -m benchmarks.tabu_backends --size 10000 --repeat 5
+
+Only the fallback is timed when the extension is not installed.
+"""
+
+import argparse
+import timeit
+from typing import Callable, Dict, List
+
+import numpy as np
+from tabulate import tabulate
+
+from binpacksolver.utils import old_tabu_structure
+
+
+def load_backends() -> Dict[str, object]:
+    """
+    Loads the available tabu structure modules.
+
+    Returns
+    -------
+    Dict[str, object]
+        Module providing the tabu structures, by backend name.
+    """
+    backends = {"python": old_tabu_structure}
+    try:
+        import tabu_structure  # pylint: disable=C0415
+
+        backends["rust"] = tabu_structure
+    except ImportError:
+        pass
+    return backends
+
+
+def cases(module, size: int) -> Dict[str, Callable[[], None]]:
+    """
+    Builds the benchmark cases of one backend.
+
+    Parameters
+    ----------
+    module : object
+        Module providing the tabu structures.
+    size : int
+        Number of operations of each case.
+
+    Returns
+    -------
+    Dict[str, Callable[[], None]]
+        Function running each case, by case name.
+    """
+    rng = np.random.default_rng(0)
+    pairs = [tuple(pair) for pair in rng.integers(0, size, (size, 2)).tolist()]
+    attributes = rng.integers(0, size, size).astype(np.int64)
+    attribute_list = attributes.tolist()
+
+    structure = module.TabuStructure(size // 10)
+    for pair in pairs:
+        structure.insert(pair)
+
+    def structure_insert():
+        tabu = module.TabuStructure(size // 10)
+        for pair in pairs:
+            tabu.insert(pair)
+
+    def structure_find():
+        for pair in pairs:
+            structure.find(pair)
+
+    selected: Dict[str, Callable[[], None]] = {
+        "TabuStructure.insert": structure_insert,
+        "TabuStructure.find": structure_find,
+    }
+    if not hasattr(module, "TabuMatrix"):
+        return selected
+
+    matrix = module.TabuMatrix(size)
+    matrix.insert_many(attributes, 5)
+
+    def matrix_insert():
+        for attribute in attribute_list:
+            matrix.insert(attribute, 5)
+
+    def matrix_find():
+        for attribute in attribute_list:
+            matrix.find(attribute)
+
+    selected.update(
+        {
+            "TabuMatrix.insert": matrix_insert,
+            "TabuMatrix.find": matrix_find,
+            "TabuMatrix.insert_many": lambda: matrix.insert_many(attributes, 5),
+            "TabuMatrix.find_many": lambda: matrix.find_many(attributes),
+        }
+    )
+    return selected
+
+
+def main(args: List[str] = None):
+    """Runs the benchmark and prints the operations per second of each case."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--size", type=int, default=10000, help="operations per case")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per case")
+    options = parser.parse_args(args)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for backend, module in load_backends().items():
+        for name, case in cases(module, options.size).items():
+            best = min(timeit.repeat(case, number=1, repeat=options.repeat))
+            results.setdefault(name, {})[backend] = options.size / best
+
+    backends = list(load_backends())
+    rows = []
+    for name, timings in results.items():
+        row = [name] + [timings.get(backend) for backend in backends]
+        if {"python", "rust"} <= timings.keys():
+            row.append(timings["rust"] / timings["python"])
+        rows.append(row)
+
+    headers = ["operation"] + [f"{backend} (ops/s)" for backend in backends]
+    if "rust" in backends:
+        headers.append("speedup")
+    print(tabulate(rows, headers=headers, floatfmt=".3g"))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,38 @@ Module for implementing the Artificial Bee Colony (ABC) algorithm for optimizati
 """
 
 import time
+import warnings
 from typing import List, Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, local_search,
-                                 repair_solution, theoretical_minimum,
-                                 tournament_roulette)
+                                 generate_solution, increment,
+                                 local_search_population, repair_population,
+                                 theoretical_minimum)
+
+
+def __update_sources(
+    bees_matrix: np.ndarray, selected: np.ndarray, new_solutions: np.ndarray, c: int
+) -> np.ndarray:
+    """
+    Evaluates the candidate solutions found for the selected food sources, keeping
+    the best candidate of each source when it improves it and updating the trial
+    counters of the sources that did not improve.
+    """
+    new_fit = fitness_population(new_solutions, c)
+    order = np.lexsort((new_fit, selected))
+    first = np.r_[True, selected[order][1:] != selected[order][:-1]]
+    best = order[first]
+    sources = selected[best]
+
+    improved = new_fit[best] < bees_matrix[sources, -2]
+    np.add.at(bees_matrix[:, -1], selected, 1)
+    bees_matrix[sources[improved], :-2] = new_solutions[best[improved]]
+    bees_matrix[sources[improved], -2] = new_fit[best[improved]]
+    bees_matrix[sources[improved], -1] = 0
+    return bees_matrix
 
 
 def __employed_bees(
@@ -32,18 +55,11 @@ def __employed_bees(
     np.ndarray
         Updated solution matrix.
     """
-    for i in range(bees_matrix.shape[0]):
-        new_solution = local_search(bees_matrix[i, :-2].copy(), c, min_value, max_value)
-        new_fit = fitness(new_solution, c)
-
-        if new_fit < bees_matrix[i, -2]:
-            bees_matrix[i, :-2] = new_solution
-            bees_matrix[i, -2] = new_fit
-            bees_matrix[i, -1] = 0
-        else:
-            bees_matrix[i, -1] += 1
-
-    return bees_matrix
+    new_solutions = local_search_population(
+        bees_matrix[:, :-2], c, min_value, max_value
+    )
+    selected = np.arange(bees_matrix.shape[0])
+    return __update_sources(bees_matrix, selected, new_solutions, c)
 
 
 def __onlooker_bees(
@@ -53,7 +69,6 @@ def __onlooker_bees(
     onlooker: int,
     min_value: int,
     max_value: int,
-    tournament_size: int = 3,
 ) -> np.ndarray:
     """
     Updates the solutions of the onlooker bees based on roulette wheel selection.
@@ -74,25 +89,14 @@ def __onlooker_bees(
     np.ndarray
         Updated solution matrix.
     """
-    fitness_values = 1 / (bees_matrix[:, -1] + 1e-6)
-    probabilities = fitness_values**gama / np.sum(fitness_values**gama)
-
-    for _ in range(onlooker):
-        selected_idx = tournament_roulette(bees_matrix[:, :-1], tournament_size)
-        selected_idx = np.random.choice(range(bees_matrix.shape[0]), p=probabilities)
-        new_solution = local_search(
-            bees_matrix[selected_idx, :-2].copy(), c, min_value, max_value
-        )
-        new_fit = fitness(new_solution, c)
-
-        if new_fit < bees_matrix[selected_idx, -2]:
-            bees_matrix[selected_idx, :-2] = new_solution
-            bees_matrix[selected_idx, -2] = new_fit
-            bees_matrix[selected_idx, -1] = 0
-        else:
-            bees_matrix[selected_idx, -1] += 1
+    fitness_values = (1 / (bees_matrix[:, -2] + 1e-6)) ** gama
+    probabilities = fitness_values / np.sum(fitness_values)
 
-    return bees_matrix
+    selected = np.random.choice(bees_matrix.shape[0], size=onlooker, p=probabilities)
+    new_solutions = local_search_population(
+        bees_matrix[selected, :-2], c, min_value, max_value
+    )
+    return __update_sources(bees_matrix, selected, new_solutions, c)
 
 
 def __scout_bees(bees_matrix: np.ndarray, c: int, scout_limit: int = 10) -> np.ndarray:
@@ -113,19 +117,19 @@ def __scout_bees(bees_matrix: np.ndarray, c: int, scout_limit: int = 10) -> np.n
     np.ndarray
         Updated solution matrix.
     """
-    for i in range(bees_matrix.shape[0]):
-        if bees_matrix[i, -1] > scout_limit:
-            shuffled_solution = bees_matrix[i, :-2].copy()
-            np.random.shuffle(shuffled_solution)
-            new_solution = repair_solution(
-                bees_matrix[i, :-2],
-                shuffled_solution[: len(shuffled_solution[:-2]) // 2],
-                c,
-            )
-            new_fit = fitness(new_solution, c)
-            bees_matrix[i, :-2] = new_solution
-            bees_matrix[i, -2] = new_fit
-            bees_matrix[i, -1] = 0
+    scouts = np.flatnonzero(bees_matrix[:, -1] > scout_limit)
+    if not scouts.size:
+        return bees_matrix
+
+    # Keep a random half of each solution and reinsert the rest with best fit
+    solutions = bees_matrix[scouts, :-2]
+    order = np.random.rand(*solutions.shape).argsort(axis=1)
+    shuffled = np.take_along_axis(solutions, order, axis=1)
+    shuffled[:, solutions.shape[1] // 2 :] = -1
+    new_solutions = repair_population(solutions, shuffled, c)
+    bees_matrix[scouts, :-2] = new_solutions
+    bees_matrix[scouts, -2] = fitness_population(new_solutions, c)
+    bees_matrix[scouts, -1] = 0
 
     return bees_matrix
 
@@ -139,7 +143,8 @@ def artificial_bee_colony(
     onlooker: int = 3,
     scout: int = 5,
     gama: float = 1.8,
-    tournament_size: int = 3,
+    tournament_size: int = None,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Solves the BPP using the artificial bee colony algorithm.
@@ -162,12 +167,25 @@ def artificial_bee_colony(
         Scout limit before resetting a bee, by default 10.
     gama : float, optional
         Parameter for roulette selection, by default 1.8.
+    tournament_size : int, optional
+        Deprecated and ignored, since the onlookers are selected with a fitness
+        roulette. Passing it raises a DeprecationWarning.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
     Tuple[List[np.ndarray], int]
         Best solution found and its fitness value.
     """
+    if tournament_size is not None:
+        warnings.warn(
+            "tournament_size is deprecated and ignored by artificial_bee_colony",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
     min_value = array_base.min()
     max_value = array_base.max()
 
@@ -185,14 +203,15 @@ def artificial_bee_colony(
 
     # Initial variables
     onlooker = min(onlooker, employed)
-    th_min = theoretical_minimum(array_base, c)
+    th_min = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     time_start = time.time()
 
     while check_end(th_min, best_fit, time_max, time_start, time.time(), max_it, it):
+        increment("iterations")
         bees_matrix = __employed_bees(bees_matrix, c, min_value, max_value)
         bees_matrix = __onlooker_bees(
-            bees_matrix, c, gama, onlooker, min_value, max_value, tournament_size
+            bees_matrix, c, gama, onlooker, min_value, max_value
         )
         bees_matrix = __scout_bees(bees_matrix, c, scout)
 
@@ -5,38 +5,59 @@ into bins by simulating the social hunting behavior of grey wolves with chaotic
 factors to enhance exploration and exploitation.
 """
 
-import random
 import time
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def chaotic_map(t: int, max_value: int) -> np.ndarray:
+def chaotic_map(t: np.ndarray, max_value: int) -> np.ndarray:
     """
-    Generates a chaotic value based on the current iteration and max value.
+    Generates chaotic values based on the iterations and max value.
 
     Parameters
     ----------
-    t : int
-        Current iteration number.
+    t : np.ndarray
+        Iteration number, or an array of iteration numbers.
     max_value : int
         Maximum number of iterations.
 
     Returns
     -------
     np.ndarray
-        Chaotic value for the current iteration.
+        Chaotic value for each iteration.
     """
     return np.sin(np.pi * t / max_value)
 
 
+def chaotic_sequence(start: int, length: int, max_value: int) -> np.ndarray:
+    """
+    Precomputes a block of the chaotic sequence, so the map is evaluated once
+    per block instead of once per iteration.
+
+    Parameters
+    ----------
+    start : int
+        First iteration of the block.
+    length : int
+        Number of iterations in the block.
+    max_value : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    np.ndarray
+        Chaotic values for iterations `start` to `start + length - 1`.
+    """
+    return chaotic_map(np.arange(start, start + length), max_value)
+
+
 def update_position(
-    position: np.ndarray,
+    positions: np.ndarray,
     alpha: np.ndarray,
     beta: np.ndarray,
     delta: np.ndarray,
@@ -47,12 +68,16 @@ def update_position(
     wolf_adjustment: float = 0.5,
 ) -> np.ndarray:
     """
-    Updates the position of the wolf based on the positions of the best wolves.
+    Updates the positions of the wolves based on the positions of the best wolves.
+
+    The random coefficients are drawn as one block for every wolf and dimension,
+    so the whole pack is moved with array expressions.
 
     Parameters
     ----------
-    position : np.ndarray
-        Current position of the wolf (solution).
+    positions : np.ndarray
+        Current positions of the wolves, one wolf per row (a single 1D wolf is
+        also accepted).
     alpha : np.ndarray
         Position of the best wolf (alpha).
     beta : np.ndarray
@@ -73,27 +98,21 @@ def update_position(
     Returns
     -------
     np.ndarray
-        Updated position of the wolf.
+        Updated positions of the wolves.
     """
-    new_position = np.copy(position)
-    for i, pos in enumerate(position):
-        r1 = random.random()
-        r2 = random.random()
-        adaptive_coeff = 2 * acf * r1 - acf
-        chaotic_coeff = 2 * r2
-
-        dist_alpha = abs(chaotic_coeff * alpha[i] - pos)
-        dist_beta = abs(chaotic_coeff * beta[i] - pos)
-        dist_delta = abs(chaotic_coeff * delta[i] - pos)
-
-        x1 = alpha[i] - adaptive_coeff * dist_alpha
-        x2 = beta[i] - adaptive_coeff * dist_beta
-        x3 = delta[i] - adaptive_coeff * dist_delta
-
-        new_position[i] = (x1 + x2 + x3) / 3
-        new_position[i] += chaotic_factor * (random.random() - wolf_adjustment)
+    r1, r2, r3 = np.random.random((3,) + positions.shape)
+    adaptive_coeff = 2 * acf * r1 - acf
+    chaotic_coeff = 2 * r2
+
+    new_positions = np.zeros(positions.shape)
+    for leader in (alpha, beta, delta):
+        new_positions += leader - adaptive_coeff * np.abs(
+            chaotic_coeff * leader - positions
+        )
 
-    return np.clip(new_position, min_value, max_value)
+    new_positions /= 3
+    new_positions += chaotic_factor * (r3 - wolf_adjustment)
+    return np.clip(new_positions, min_value, max_value)
 
 
 def caotic_grey_wolf_optimization(
@@ -103,6 +122,7 @@ def caotic_grey_wolf_optimization(
     max_it: int = None,
     population_size: int = 7,
     wolf_adjustment: float = 0.5,
+    target: int = None,
 ) -> np.ndarray:
     """
     Executes the Chaotic Grey Wolf Optimization (CGWO) algorithm for the BPP.
@@ -122,6 +142,9 @@ def caotic_grey_wolf_optimization(
     wolf_adjustment : float, optional
         Adjustment factor for chaotic influence, by default 0.5. The value is
         automatically clipped between 0 and 1.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -140,14 +163,17 @@ def caotic_grey_wolf_optimization(
     # Identify the best solution in the initial population
     best_idx = np.argmin(wolves_matrix[:, -1])
     best_fit = wolves_matrix[best_idx, -1]
-    best_alpha = wolves_matrix[best_idx, :-1]
+    best_alpha = wolves_matrix[best_idx, :-1].copy()
 
     # Initial variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
+    horizon = max_it or max((time_max * 1e8) // population_size, 100)
+    chaos = chaotic_sequence(0, max_it + 1 if max_it else 1024, horizon)
     it = 0
     start = time.time()
 
     while check_end(th, best_fit, time_max, start, time.time(), max_it, it):
+        increment("iterations")
 
         sorted_indices = np.argsort(wolves_matrix[:, -1])
         alpha = wolves_matrix[sorted_indices[0], :-1]
@@ -155,30 +181,32 @@ def caotic_grey_wolf_optimization(
         delta = wolves_matrix[sorted_indices[2], :-1]
 
         a = 2 - 2 * (it / max_it) if max_it else 1
-        chaotic_factor = chaotic_map(
-            it, max_it or max((time_max * 1e8) // population_size, 100)
-        )
-
-        for i in range(1, population_size):
-            new_wolf = update_position(
-                wolves_matrix[i, :-1],
-                alpha,
-                beta,
-                delta,
-                a,
-                chaotic_factor,
-                min_value,
-                max_value,
-                wolf_adjustment,
-            )
-            wolves_matrix[i, :-1] = repair_solution(
-                wolves_matrix[i, :-1].copy(), new_wolf, c
+        if it >= len(chaos):
+            chaos = np.concatenate(
+                (chaos, chaotic_sequence(len(chaos), len(chaos), horizon))
             )
-            wolves_matrix[i, -1] = fitness(wolves_matrix[i, :-1], c)
+
+        new_wolves = update_position(
+            wolves_matrix[1:, :-1],
+            alpha,
+            beta,
+            delta,
+            a,
+            chaos[it],
+            min_value,
+            max_value,
+            wolf_adjustment,
+        )
+        wolves_matrix[1:, :-1] = repair_population(
+            wolves_matrix[1:, :-1], new_wolves, c
+        )
+        wolves_matrix[1:, -1] = fitness_population(wolves_matrix[1:, :-1], c)
 
         best_idx = np.argmin(wolves_matrix[:, -1])
         if wolves_matrix[best_idx, -1] < best_fit:
             best_fit = wolves_matrix[best_idx, -1]
-            best_alpha = wolves_matrix[best_idx, :-1]
+            best_alpha = wolves_matrix[best_idx, :-1].copy()
+
+        it += 1
 
     return generate_solution(best_alpha, c, VALID=True)[0], best_fit
@@ -8,53 +8,60 @@ from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def update_position_and_velocity(
-    bat: np.ndarray,
-    velocity: np.ndarray,
+def update_positions_and_velocities(
+    bats: np.ndarray,
+    velocities: np.ndarray,
     best_bat: np.ndarray,
-    frequency: float,
-    loudness: float,
-    r: float,
+    frequencies: np.ndarray,
+    loudness: np.ndarray,
+    pulse_rates: np.ndarray,
     min_value: int,
     max_value: int,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Updates the velocity and position of a bat based on its frequency,
-    the global best, and its local random behavior.
+    Updates the velocities and positions of all bats based on their frequencies,
+    the global best, and a local random walk around the best bat.
 
     Parameters
     ----------
-    bat : np.ndarray
-        The current bat (solution).
-    velocity : np.ndarray
-        The current velocity of the bat.
+    bats : np.ndarray
+        2D matrix with the current bats (solutions).
+    velocities : np.ndarray
+        2D matrix with the current velocities of the bats.
     best_bat : np.ndarray
         The best bat (global best solution).
-    frequency : float
-        The frequency at which the bat moves.
-    loudness : float
-        Loudness value, controlling local search behavior.
-    r : float
-        Pulse emission rate.
+    frequencies : np.ndarray
+        The frequency at which each bat moves.
+    loudness : np.ndarray
+        Loudness of each bat, controlling the local random walk.
+    pulse_rates : np.ndarray
+        Pulse emission rate of each bat.
+    min_value : int
+        Minimum allowable value for any dimension.
+    max_value : int
+        Maximum allowable value for any dimension.
 
     Returns
     -------
     Tuple[np.ndarray, np.ndarray]
-        The new position and velocity of the bat.
+        The new positions and velocities of the bats.
     """
-    velocity = velocity + (bat - best_bat) * frequency
-    new_position = bat + velocity
+    velocities = velocities + (bats - best_bat) * frequencies[:, np.newaxis]
+    new_positions = bats + velocities
 
-    if np.random.rand() > r:
-        new_position = best_bat + loudness * np.random.uniform(-1, 1, len(bat))
+    walk = np.flatnonzero(np.random.rand(bats.shape[0]) > pulse_rates)
+    if walk.size:
+        new_positions[walk] = best_bat + loudness[walk, np.newaxis] * np.random.uniform(
+            -1, 1, (walk.size, bats.shape[1])
+        )
 
-    return np.clip(new_position, min_value, max_value).astype(int), velocity
+    return np.clip(new_positions, min_value, max_value).astype(int), velocities
 
 
 def bat_algorithm(
@@ -68,6 +75,8 @@ def bat_algorithm(
     f_min: float = 0,
     f_max: float = 1,
     loudness_factor: float = 0.9,
+    gamma: float = 0.9,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Bat Algorithm (BA) applied to the Bin Packing Problem (BPP).
@@ -94,6 +103,11 @@ def bat_algorithm(
         Maximum frequency, by default 1.
     loudness_factor : float, optional
         Controlling loudness, by default 0.9.
+    gamma : float, optional
+        Growth rate of the pulse emission rate, by default 0.9.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -107,7 +121,9 @@ def bat_algorithm(
     # Initialize the population as a matrix with fitness values in the last column
     bat_matrix = generate_initial_matrix_population(array_base, c, pop_size, VALID=True)
     velocities = np.zeros((pop_size, num_items))  # Initialize velocity to zero
-    frequencies = np.zeros(pop_size)  # Initialize frequencies
+    loudness = np.full(pop_size, loudness, dtype=float)
+    pulse_rates = np.zeros(pop_size)
+    initial_pulse_rate = r
 
     # Initialize global best solution and fitness
     best_idx = np.argmin(bat_matrix[:, -1])
@@ -115,36 +131,43 @@ def bat_algorithm(
     best_fitness = bat_matrix[best_idx, -1]
 
     # Control variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
-        for i in range(pop_size):
-            frequencies[i] = f_min + (f_max - f_min) * np.random.rand()
-
-            new_bat, velocities[i] = update_position_and_velocity(
-                bat_matrix[i, :-1],
-                velocities[i],
-                best_solution,
-                frequencies[i],
-                loudness,
-                r,
-                min_value,
-                max_value,
-            )
-
-            bat_matrix[i, :-1] = repair_solution(bat_matrix[i, :-1], new_bat, c)
-
-            fitness_value = fitness(bat_matrix[i, :-1], c)
-            bat_matrix[i, -1] = fitness_value
-
-            if fitness_value < best_fitness:
-                best_solution = bat_matrix[i, :-1].copy()
-                best_fitness = fitness_value
-
-        loudness *= loudness_factor
-        r = r * (1 - np.exp(-it))
+        increment("iterations")
+        frequencies = f_min + (f_max - f_min) * np.random.rand(pop_size)
+        new_bats, velocities = update_positions_and_velocities(
+            bat_matrix[:, :-1],
+            velocities,
+            best_solution,
+            frequencies,
+            loudness,
+            pulse_rates,
+            min_value,
+            max_value,
+        )
+        new_bats = repair_population(bat_matrix[:, :-1], new_bats, c)
+        new_fitness = fitness_population(new_bats, c)
+
+        # Improvements are always accepted, ties only depending on loudness
+        improved = new_fitness < bat_matrix[:, -1]
+        accepted = improved | (
+            (new_fitness == bat_matrix[:, -1]) & (np.random.rand(pop_size) < loudness)
+        )
+        bat_matrix[accepted, :-1] = new_bats[accepted]
+        bat_matrix[accepted, -1] = new_fitness[accepted]
+
+        # Bats that improved become quieter and emit pulses more often
+        loudness[improved] *= loudness_factor
+        pulse_rates[improved] = initial_pulse_rate * (1 - np.exp(-gamma * (it + 1)))
+
+        best_idx = np.argmin(bat_matrix[:, -1])
+        if bat_matrix[best_idx, -1] < best_fitness:
+            best_solution = bat_matrix[best_idx, :-1].copy()
+            best_fitness = bat_matrix[best_idx, -1]
+
         it += 1
 
     return generate_solution(best_solution, c, VALID=True)[0], best_fitness
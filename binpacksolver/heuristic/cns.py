@@ -5,40 +5,87 @@ and Tabu Search algorithms for bin packing optimization problems.
 
 import random
 import time
-from typing import List, Tuple
+from bisect import bisect_right, insort
+from itertools import product
+from typing import List, Optional, Set, Tuple, Union
 
 import numpy as np
 
-from binpacksolver.utils import (TabuStructure, check_end, generate_container,
-                                 generate_solution, merge_np,
-                                 theoretical_minimum, valid_solution)
+from binpacksolver.utils import (ReactiveTabu, check_end, generate_solution,
+                                 increment, profiled, theoretical_minimum)
 
 
-def __pack_items(
-    bin_items: np.ndarray, unplaced_items: List[np.ndarray], c
-) -> Tuple[np.ndarray, List[np.ndarray]]:
+def __pick(pool: List[int], residual: int, taken: Set[int]) -> int:
     """
-    Packs items into a bin without exceeding its capacity.
+    Finds the position of the largest pool item that fits in the residual and
+    was not taken yet, or -1 if there is none.
+    """
+    idx = bisect_right(pool, residual) - 1
+    while idx >= 0 and idx in taken:
+        idx -= 1
+    return idx
+
+
+def __fill_bin(
+    bin_items: List[int], load: int, pool: List[int], c: int
+) -> Optional[Tuple[List[int], Set[int]]]:
+    """
+    Fills a bin from the pool of unplaced items with two greedy passes, largest
+    item first: one that keeps the items of the bin and only inserts pool items
+    in its residual, and one that refills the bin from the bin items and the
+    pool together.
 
     Parameters
     ----------
-    bin_items : np.ndarray
-        Items already placed in the bin.
-    unplaced_items : np.ndarray
-        Items that have not been packed yet.
+    bin_items : List[int]
+        Items of the bin.
+    load : int
+        Current load of the bin.
+    pool : List[int]
+        Sorted unplaced items.
     c : int
         Capacity of the bin.
 
     Returns
     -------
-    Tuple[np.ndarray, List[np.ndarray]]
-        A tuple containing the updated bin and the remaining unplaced items.
+    Optional[Tuple[List[int], Set[int]]]
+        The bin items that stay and the positions in the pool of the items that
+        enter the bin, or None if neither pass increases the load of the bin.
     """
-    combined_items = merge_np(np.concatenate(unplaced_items), bin_items)
-    remaining_items = valid_solution(combined_items, c)
-    return remaining_items[-1], remaining_items[:-1] if len(remaining_items) > 1 else []
+    # Keep the bin and insert pool items in its residual
+    residual = c - load
+    taken: Set[int] = set()
+    idx = __pick(pool, residual, taken)
+    while idx >= 0:
+        taken.add(idx)
+        residual -= pool[idx]
+        idx = __pick(pool, residual, taken)
+    best = (c - residual, bin_items, taken)
+
+    # Refill the bin with the largest items of the bin and the pool
+    residual = c
+    kept: List[int] = []
+    refill: Set[int] = set()
+    candidates = sorted(bin_items, reverse=True)
+    while True:
+        idx = __pick(pool, residual, refill)
+        own = next((item for item in candidates if item <= residual), None)
+        if own is not None and (idx < 0 or own >= pool[idx]):
+            candidates.remove(own)
+            kept.append(own)
+            residual -= own
+        elif idx >= 0:
+            refill.add(idx)
+            residual -= pool[idx]
+        else:
+            break
+    if c - residual > best[0]:
+        best = (c - residual, kept, refill)
 
+    return best[1:] if best[0] > load else None
 
+
+@profiled("move")
 def __descent(
     bins: List[np.ndarray],
     unplaced_items: List[np.ndarray],
@@ -48,6 +95,10 @@ def __descent(
     """
     Performs a descent-based search to optimize the current bin packing solution.
 
+    Unplaced items are kept in a sorted pool and the load of each bin is
+    cached, so each bin is filled from the pool with bisect queries without
+    rebuilding the pool. A round that improves no bin ends the descent.
+
     Parameters
     ----------
     bins : List[np.ndarray]
@@ -64,109 +115,422 @@ def __descent(
     Tuple[List[np.ndarray], List[np.ndarray]]
         The updated bins and the list of unplaced items.
     """
+    pool = sorted(np.concatenate(unplaced_items).tolist()) if unplaced_items else []
+    loads = [int(bin_.sum()) for bin_ in bins]
+    order = list(range(len(bins)))
+
     it = 0
-    while it < max_attempts:
+    improved = True
+    while improved and it < max_attempts:
         it += 1
-        random.shuffle(bins)
-        for i, bin_ in enumerate(bins):
-            bins[i], unplaced_items = __pack_items(bin_, unplaced_items, c)
-            if len(unplaced_items) < 3:
-                if len(unplaced_items) > 1:
-                    unplaced_items, _ = generate_solution(
-                        np.concatenate(unplaced_items), c, FF=True
-                    )
-                bins.extend(unplaced_items)
+        improved = False
+        random.shuffle(order)
+        for i in order:
+            if not pool:
                 return bins, []
-    return bins, unplaced_items
 
+            move = __fill_bin(bins[i].tolist(), loads[i], pool, c)
+            if move is None:
+                continue
+
+            kept, taken = move
+            entering = [pool[k] for k in taken]
+            leaving = bins[i].tolist()
+            for item in kept:
+                leaving.remove(item)
+            for k in sorted(taken, reverse=True):
+                pool.pop(k)
+            for item in leaving:
+                insort(pool, item)
+
+            bins[i] = np.array(kept + entering, dtype=int)
+            gain = sum(entering) - sum(leaving)
+            loads[i] += gain
+            improved = True
+
+    return bins, [np.array(pool, dtype=int)] if pool else []
 
-def __initialize_containers(
-    current_solution: List[np.ndarray], solution: List[np.ndarray], c: int
-) -> Tuple[int, int, List[int], int]:
+
+def __best_shift(
+    bins: List[np.ndarray], c: int, movable: np.ndarray
+) -> Tuple[int, List[Tuple[int, int, int]]]:
     """
-    Initialize container values and sums for bin packing.
+    Finds the move between packed bins that most increases the sum of the
+    squared loads of the bins, which concentrates their slack: either the
+    relocation of one item or the swap of two items of different bins.
 
     Parameters
     ----------
-    current_solution : List[np.ndarray]
-        The current solution of bins with placed items.
-    solution : List[np.ndarray]
-        The list of items placed into bins.
+    bins : List[np.ndarray]
+        The packed bins.
     c : int
         Bin capacity.
+    movable : np.ndarray
+        Boolean mask of the items, in the bin-major order of the packing, that
+        may leave their bin.
 
     Returns
     -------
-    Tuple[int, int, List[int], int]
-        n: Number of filled bins,
-        m: Total number of bins (including unplaced items),
-        containers: List of bin capacities,
-        sum_container: Sum of capacities used by unplaced items.
+    Tuple[int, List[Tuple[int, int, int]]]
+        The gain of the move and, for each moved item, its bin, its position in
+        that bin and the bin it goes to, or an empty list if no move exists.
+    """
+    lengths = np.array([len(bin_) for bin_ in bins])
+    items = np.concatenate(bins).astype(np.int64)
+    if not items.size:
+        return 0, []
+    owner = np.repeat(np.arange(len(bins)), lengths)
+    loads = np.array([bin_.sum() for bin_ in bins], dtype=np.int64)
+    own_load = loads[owner]
+    lowest = np.iinfo(np.int64).min
+
+    # Relocation of item k to bin b
+    relocation = np.where(
+        movable[:, np.newaxis]
+        & (items[:, np.newaxis] <= c - loads[np.newaxis, :])
+        & (owner[:, np.newaxis] != np.arange(len(bins))[np.newaxis, :]),
+        items[:, np.newaxis]
+        * (loads[np.newaxis, :] - own_load[:, np.newaxis] + items[:, np.newaxis]),
+        lowest,
+    )
+
+    # Swap of item k with a smaller item j of another bin
+    delta = items[:, np.newaxis] - items[np.newaxis, :]
+    swap = np.where(
+        (movable[:, np.newaxis] & movable[np.newaxis, :])
+        & (delta > 0)
+        & (owner[:, np.newaxis] != owner[np.newaxis, :])
+        & (delta <= c - own_load[np.newaxis, :]),
+        delta * (own_load[np.newaxis, :] - own_load[:, np.newaxis] + delta),
+        lowest,
+    )
+
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    if relocation.max() >= swap.max():
+        if relocation.max() == lowest:
+            return 0, []
+        k, b = divmod(int(np.argmax(relocation)), relocation.shape[1])
+        return int(relocation[k, b]), [(owner[k], k - starts[owner[k]], b)]
+
+    k, j = divmod(int(np.argmax(swap)), swap.shape[1])
+    return int(swap[k, j]), [
+        (owner[k], k - starts[owner[k]], owner[j]),
+        (owner[j], j - starts[owner[j]], owner[k]),
+    ]
+
+
+def __apply_shift(
+    bins: List[np.ndarray], moved: List[Tuple[int, int, int]]
+) -> List[int]:
     """
-    n = len(current_solution)
-    m = len(solution)
-    containers = generate_container(solution, c)
-    sum_container = sum(containers[n:])
-    return n, m, containers, sum_container
+    Applies a move found by `__best_shift` in place.
+
+    Parameters
+    ----------
+    bins : List[np.ndarray]
+        The packed bins.
+    moved : List[Tuple[int, int, int]]
+        For each moved item, its bin, its position in that bin and the bin it
+        goes to.
+
+    Returns
+    -------
+    List[int]
+        The moved items.
+    """
+    values = [int(bins[a][position]) for a, position, _ in moved]
+    for a, position, _ in moved:
+        bins[a] = np.delete(bins[a], position)
+    for value, (_, _, b) in zip(values, moved):
+        bins[b] = np.append(bins[b], value)
+    return values
+
+
+@profiled("move")
+def __concentrate(
+    bins: List[np.ndarray], c: int, max_attempts: int = 1000
+) -> List[np.ndarray]:
+    """
+    Descent that moves items between packed bins while the sum of the squared
+    loads of the bins increases, so the slack gathers in a few bins where the
+    unplaced items find room.
+
+    Parameters
+    ----------
+    bins : List[np.ndarray]
+        The packed bins.
+    c : int
+        Bin capacity.
+    max_attempts : int, optional
+        Maximum number of moves, by default 1000.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The updated bins, which may include empty bins.
+    """
+    movable = np.ones(sum(len(bin_) for bin_ in bins), dtype=bool)
+    for _ in range(max_attempts):
+        gain, moved = __best_shift(bins, c, movable)
+        if gain <= 0:
+            break
+        __apply_shift(bins, moved)
+    return bins
+
+
+def __pool_pairs(pool: np.ndarray, max_pool: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the sorted index of the sums of every pair of unplaced items.
+
+    Parameters
+    ----------
+    pool : np.ndarray
+        Sorted unplaced items.
+    max_pool : int
+        Largest pool for which pairs are indexed, since the index is quadratic.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The sorted pair sums and, for each sum, the positions of its two items.
+    """
+    if len(pool) < 2 or len(pool) > max_pool:
+        return np.array([], dtype=int), np.empty((0, 2), dtype=int)
+
+    first, second = np.triu_indices(len(pool), 1)
+    sums = pool[first] + pool[second]
+    order = np.argsort(sums, kind="stable")
+    return sums[order], np.stack((first[order], second[order]), axis=1)
 
 
+def __bin_pairs(owner: np.ndarray, max_size: int) -> np.ndarray:
+    """
+    Finds every pair of packed items that share a bin.
+
+    Parameters
+    ----------
+    owner : np.ndarray
+        Bin of each packed item, in the bin-major order of the packing.
+    max_size : int
+        Number of items of the largest bin.
+
+    Returns
+    -------
+    np.ndarray
+        Matrix with the positions of the two items of each pair.
+    """
+    pairs = [np.empty((0, 2), dtype=int)]
+    for gap in range(1, max_size):
+        first = np.flatnonzero(owner[:-gap] == owner[gap:])
+        pairs.append(np.stack((first, first + gap), axis=1))
+    return np.concatenate(pairs)
+
+
+def __tabu_attributes(
+    items: Union[int, np.ndarray], bins: Union[int, np.ndarray], weights: np.ndarray
+) -> Union[int, np.ndarray]:
+    """
+    Tabu attribute of keeping an item in a bin: the stable identifier of the
+    bin times the number of distinct weights plus the rank of the weight of the
+    item. Identifiers, unlike positions, survive the reordering of the bins
+    between the phases of the search.
+
+    Parameters
+    ----------
+    items : Union[int, np.ndarray]
+        Weight of the item, or array of weights.
+    bins : Union[int, np.ndarray]
+        Identifier of the bin of the item, or array of identifiers.
+    weights : np.ndarray
+        Sorted distinct weights of the instance.
+
+    Returns
+    -------
+    Union[int, np.ndarray]
+        The attribute, or array of attributes.
+    """
+    return bins * len(weights) + np.searchsorted(weights, items)
+
+
+@profiled("move")
 def __find_best_move(
     solution: List[np.ndarray],
-    containers: List[int],
-    tabu: TabuStructure,
-    n: int,
-    m: int,
-) -> Tuple[None, Tuple[Tuple[int, int], Tuple[int, int]], Tuple[int, int]]:
+    containers: np.ndarray,
+    pool: np.ndarray,
+    tabu: ReactiveTabu,
+    weights: np.ndarray,
+    ids: np.ndarray,
+    max_pool: int,
+    candidates: int = 8,
+) -> Tuple[int, np.ndarray, np.ndarray]:
     """
     Find the best move that is not tabu and respects bin constraints.
 
+    A move swaps one or two items of a packed bin with one or two unplaced
+    items (single/single, single/pair, pair/single and pair/pair). For each
+    packed item and each pair of packed items of the same bin, the best
+    feasible partner is the largest unplaced item (or pair sum) that fits in
+    the slack of the bin, found with one `np.searchsorted` over the sorted
+    pool for all of them at once. Moves are ranked by the weight they remove
+    from the pool and then by the number of unplaced items they leave, which
+    breaks unplaced items into smaller pieces on plateaus. Moves that take a
+    tabu item out of its bin are dropped with one check of the whole array of
+    packed items, and ties between the best remaining moves go to the least
+    frequent one, using the diversification penalty of the reactive memory.
+
     Parameters
     ----------
     solution : List[np.ndarray]
-        The current solution of bins with items.
-    containers : List[int]
-        List of capacities left in each bin.
-    tabu : TabuStructure
-        The tabu list to prevent cycling back to previous states.
-    n : int
-        Number of filled bins.
-    m : int
-        Total number of bins (including unplaced items).
+        The packed bins.
+    containers : np.ndarray
+        Capacity left in each packed bin.
+    pool : np.ndarray
+        Sorted unplaced items.
+    tabu : ReactiveTabu
+        Reactive memory of (item, bin) pairs that may not leave that bin.
+    weights : np.ndarray
+        Sorted distinct weights of the instance, which index the attributes.
+    ids : np.ndarray
+        Stable identifier of each packed bin.
+    max_pool : int
+        Largest pool for which pair moves are evaluated.
+    candidates : int, optional
+        Number of tied moves compared by their penalty, by default 8.
 
     Returns
     -------
-    Tuple[None, Tuple[Tuple[int, int], Tuple[int, int]], Tuple[int, int]]
-        The best move and corresponding indices for the swap operation.
+    Tuple[int, np.ndarray, np.ndarray]
+        The bin, the positions inside that bin of the items to remove and the
+        positions in the pool of the items to insert, or None if no move exists.
+    """
+    lengths = np.array([len(bin_) for bin_ in solution])
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    items = np.concatenate(solution)
+    owner = np.repeat(np.arange(len(solution)), lengths)
+    attributes = __tabu_attributes(items, ids[owner], weights)
+    blocked = tabu.is_tabu_many(attributes)
+
+    bin_pairs = __bin_pairs(owner, lengths.max())
+    pool_sums, pool_pairs = __pool_pairs(pool, max_pool)
+    sources = (
+        (np.arange(len(items))[:, np.newaxis], items, owner),
+        (bin_pairs, items[bin_pairs].sum(axis=1), owner[bin_pairs[:, 0]]),
+    )
+    targets = (
+        (pool, np.arange(len(pool))[:, np.newaxis]),
+        (pool_sums, pool_pairs),
+    )
+    sources_blocked = [blocked[idx].any(axis=1) for idx, _, _ in sources]
+
+    gains, pieces, kinds, sources_idx, targets_idx = [], [], [], [], []
+    for kind, ((_, weight, bins), (values, _)) in enumerate(product(sources, targets)):
+        if values.size == 0 or weight.size == 0:
+            continue
+        idx = np.searchsorted(values, weight + containers[bins], side="right") - 1
+        gain = values[np.maximum(idx, 0)] - weight
+        extra = sources[kind // 2][0].shape[1] - targets[kind % 2][1].shape[1]
+        valid = np.flatnonzero(
+            (idx >= 0)
+            & ((gain > 0) | ((gain == 0) & (extra > 0)))
+            & ~sources_blocked[kind // 2]
+        )
+        gains.append(gain[valid])
+        pieces.append(np.full(len(valid), extra))
+        kinds.append(np.full(len(valid), kind))
+        sources_idx.append(valid)
+        targets_idx.append(idx[valid])
+
+    if not gains:
+        return None
+
+    gains = np.concatenate(gains)
+    kinds = np.concatenate(kinds)
+    sources_idx = np.concatenate(sources_idx)
+    targets_idx = np.concatenate(targets_idx)
+    pieces = np.concatenate(pieces)
+    best, best_penalty = None, 0.0
+    for move in np.lexsort((-pieces, -gains)):
+        if best is not None and (
+            candidates == 0
+            or gains[move] != gains[best]
+            or pieces[move] != pieces[best]
+        ):
+            break
+        removed = sources[kinds[move] // 2][0][sources_idx[move]]
+        penalty = tabu.penalty(attributes[removed]).sum()
+        if best is None or penalty < best_penalty:
+            best, best_penalty = move, penalty
+        candidates -= 1
+
+    if best is None:
+        return None
+
+    removed = sources[kinds[best] // 2][0][sources_idx[best]]
+    bin_ = int(owner[removed[0]])
+    inserted = targets[kinds[best] % 2][1][targets_idx[best]]
+    return bin_, removed - starts[bin_], inserted
+
+
+def __pack_fitting(
+    solution: List[np.ndarray], containers: np.ndarray, pool: np.ndarray
+) -> np.ndarray:
     """
-    best_move = None
-    indexes_chage = ((0, 0), (0, 0))
-    indexes_save = (0, 0)
+    Packs every unplaced item that fits in some bin, largest item first, into
+    the bin with the smallest slack that can take it.
 
-    for a in range(n):
-        for i, bin_ in enumerate(solution[a]):
-            if not tabu.find((bin_, a)):
-                for b in range(n, m):
-                    for j, bin_unplaced in enumerate(solution[b]):
-                        if containers[a] - bin_unplaced + bin_ >= 0 and (
-                            not best_move or bin_unplaced > best_move
-                        ):
-                            best_move = bin_unplaced
-                            indexes_save = (bin_, a)
-                            indexes_chage = ((i, a), (j, b))
+    Parameters
+    ----------
+    solution : List[np.ndarray]
+        The packed bins, updated in place.
+    containers : np.ndarray
+        Capacity left in each packed bin, updated in place.
+    pool : np.ndarray
+        Sorted unplaced items.
 
-    return best_move, indexes_chage, indexes_save
+    Returns
+    -------
+    np.ndarray
+        The sorted items that are still unplaced.
+    """
+    left = []
+    for item in pool[::-1]:
+        fits = np.flatnonzero(containers >= item)
+        if not fits.size:
+            left.append(item)
+            continue
+        b = fits[np.argmin(containers[fits])]
+        solution[b] = np.append(solution[b], item)
+        containers[b] -= item
+    return np.array(left[::-1], dtype=pool.dtype)
 
 
 def __tabucns(
     current_solution: List[np.ndarray],
     unplaced_items: List[np.ndarray],
     c: int,
+    tabu: ReactiveTabu,
+    weights: np.ndarray,
+    ids: np.ndarray,
     max_attempts: int = 100000,
     max_attempts_time: int = 1,
+    max_pool: int = 512,
+    max_stall: int = 200,
 ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
     """
     Main function to run the Tabu CNS algorithm.
 
+    Unplaced items are kept in a sorted pool and the slack of each packed bin
+    is cached, so the best move is found with bisect queries instead of
+    comparing every packed item with every unplaced item. After each move the
+    unplaced items that fit in some bin are packed and the search goes on, so
+    the phase only ends when the pool is empty, no move is left, its budget is
+    spent or `max_stall` moves in a row did not reduce the weight of the pool.
+
+    The tabu memory is reactive: the state is hashed by the sorted pool and the
+    hashes of the bins, and the tenure grows when a state is revisited and
+    shrinks when the pool reaches a new minimum weight. The memory is shared by
+    all the calls of a run, so the tenure learned in one phase carries over.
+
     Parameters
     ----------
     current_solution : List[np.ndarray]
@@ -175,47 +539,108 @@ def __tabucns(
         Items that have not yet been placed in bins.
     c : int
         Bin capacity.
+    tabu : ReactiveTabu
+        Tabu memory of the run.
+    weights : np.ndarray
+        Sorted distinct weights of the instance.
+    ids : np.ndarray
+        Stable identifier of each bin of the solution.
     max_attempts : int, optional
         Maximum number of iterations, by default 100000.
     max_attempts_time : int, optional
         Maximum time in seconds for each iteration, by default 1.
+    max_pool : int, optional
+        Largest pool for which pair moves are evaluated, by default 512.
+    max_stall : int, optional
+        Number of moves without improvement that ends the phase, by default 200.
 
     Returns
     -------
     Tuple[List[np.ndarray], List[np.ndarray]]
         The updated solution and remaining unplaced items.
     """
+    if not unplaced_items or not current_solution:
+        return current_solution, unplaced_items
+
     it = 0
-    tabu: TabuStructure = TabuStructure(len(current_solution) // 2)
-    solution = current_solution.copy()
-    solution.extend(unplaced_items)
-    n, m, containers, sum_container = __initialize_containers(
-        current_solution, solution, c
-    )
+    stall = 0
+    solution = list(current_solution)
+    containers = c - np.array([bin_.sum() for bin_ in solution])
+    pool = __pack_fitting(solution, containers, np.sort(np.concatenate(unplaced_items)))
+    hashes = [ReactiveTabu.bin_hash(bin_) for bin_ in solution]
+    packing_hash = sum(hashes)
+    best_weight = pool.sum()
     time_start = time.time()
-    while check_end(0, 1, max_attempts_time, time_start, time.time(), max_attempts, it):
-        it += 1
-        best_move, indexes_chage, indexes_save = __find_best_move(
-            solution, containers, tabu, n, m
-        )
-
-        if not best_move:
+    while pool.size and stall < max_stall:
+        if not check_end(
+            0, 1, max_attempts_time, time_start, time.time(), max_attempts, it
+        ):
             break
 
-        i, a = indexes_chage[0]
-        item_a = solution[a][i]
-        j, b = indexes_chage[1]
-        item_b = solution[b][j]
+        it += 1
+        move = __find_best_move(
+            solution, containers, pool, tabu, weights, ids, max_pool
+        )
 
-        if sum_container + item_a - item_b < sum_container:
-            sum_container += item_a - item_b
-            containers[a] += item_a - item_b
-            solution[b][j], solution[a][i] = solution[a][i], solution[b][j]
-            tabu = TabuStructure(len(current_solution) // 2)
+        if move is None:
+            # Plateau: move items between bins, which keeps the pool unchanged
+            owner = np.repeat(
+                np.arange(len(solution)), [len(bin_) for bin_ in solution]
+            )
+            movable = ~tabu.is_tabu_many(
+                __tabu_attributes(np.concatenate(solution), ids[owner], weights)
+            )
+            _, moved = __best_shift(solution, c, movable)
+            if not moved:
+                break
+            values = __apply_shift(solution, moved)
+            for value, (a, _, b) in zip(values, moved):
+                containers[a] += value
+                containers[b] -= value
+                tabu.make_tabu(__tabu_attributes(value, ids[b], weights))
+            if containers.max() >= pool[0]:
+                pool = __pack_fitting(solution, containers, pool)
+            hashes = [ReactiveTabu.bin_hash(bin_) for bin_ in solution]
+            packing_hash = sum(hashes)
+            if pool.sum() < best_weight:
+                best_weight = pool.sum()
+                stall = 0
+                tabu.improve()
+            else:
+                stall += 1
+                tabu.visit(packing_hash + ReactiveTabu.bin_hash(pool))
+            tabu.step()
+            continue
+
+        a, removed, inserted = move
+        leaving = solution[a][removed]
+        entering = pool[inserted]
+        gain = entering.sum() - leaving.sum()
+
+        solution[a] = np.concatenate((np.delete(solution[a], removed), entering))
+        containers[a] -= gain
+        pool = np.sort(np.concatenate((np.delete(pool, inserted), leaving)))
+        if containers.max() >= pool[0]:
+            pool = __pack_fitting(solution, containers, pool)
+            hashes = [ReactiveTabu.bin_hash(bin_) for bin_ in solution]
+            packing_hash = sum(hashes)
+        else:
+            packing_hash -= hashes[a]
+            hashes[a] = ReactiveTabu.bin_hash(solution[a])
+            packing_hash += hashes[a]
+
+        if pool.sum() < best_weight:
+            best_weight = pool.sum()
+            stall = 0
+            tabu.improve()
         else:
-            tabu.insert(indexes_save)
+            stall += 1
+            tabu.visit(packing_hash + ReactiveTabu.bin_hash(pool))
+        for item in entering:
+            tabu.make_tabu(__tabu_attributes(item, ids[a], weights))
+        tabu.step()
 
-    return solution[:n], solution[n:]
+    return solution, [pool] if pool.size else []
 
 
 def __operations(
@@ -224,9 +649,12 @@ def __operations(
     c: int,
     current_sum: int,
     partial_sum: int,
+    tabu: ReactiveTabu,
+    weights: np.ndarray,
+    ids: np.ndarray,
     max_attempts: int = 10,
     max_attempts_time: int = 1,
-) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]:
     """
     Perform a series of operations combining Tabu CNS and Descent algorithms.
 
@@ -242,6 +670,12 @@ def __operations(
         Sum of the weights of all items.
     partial_sum : int
         Sum of the weights of items in the partial solution.
+    tabu : ReactiveTabu
+        Tabu memory of the run.
+    weights : np.ndarray
+        Sorted distinct weights of the instance.
+    ids : np.ndarray
+        Stable identifier of each bin of the partial solution.
     max_attempts : int, optional
         Maximum number of attempts, by default 10.
     max_attempts_time : int, optional
@@ -249,8 +683,9 @@ def __operations(
 
     Returns
     -------
-    Tuple[List[np.ndarray], List[np.ndarray]]
-        Updated solution and remaining unplaced items after applying operations.
+    Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]
+        Updated solution, remaining unplaced items after applying operations and
+        the identifiers of the bins of the solution.
     """
     it = 0
     start = time.time()
@@ -265,13 +700,26 @@ def __operations(
     ):
         it += 1
         partial_solution, unplaced_items = __tabucns(
-            partial_solution, unplaced_items, c, max_attempts, max_attempts_time
+            partial_solution,
+            unplaced_items,
+            c,
+            tabu,
+            weights,
+            ids,
+            max_attempts,
+            max_attempts_time - (time.time() - start),
         )
-        partial_sum = sum(box.sum() for box in partial_solution)
+        partial_sum = current_sum - sum(items.sum() for items in unplaced_items)
+        if not unplaced_items:
+            break
+        partial_solution = __concentrate(partial_solution, c)
         partial_solution, unplaced_items = __descent(
             partial_solution, unplaced_items, c, max_attempts=min(max_attempts, 100)
         )
-    return partial_solution, unplaced_items
+        if not unplaced_items:
+            break
+    kept = [i for i, bin_ in enumerate(partial_solution) if len(bin_)]
+    return [partial_solution[i] for i in kept], unplaced_items, ids[kept]
 
 
 def consistent_neighborhood_search(
@@ -281,6 +729,7 @@ def consistent_neighborhood_search(
     max_it: int = None,
     max_attempts: int = 100000,
     max_attempts_time: int = 1,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Performs consistent neighborhood search for bin packing optimization.
@@ -299,6 +748,9 @@ def consistent_neighborhood_search(
         Maximum number of attempts for each operation, by default 10.
     max_attempts_time : int, optional
         Maximum time in seconds for each operation, by default 1.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -312,32 +764,55 @@ def consistent_neighborhood_search(
     to fully explore the neighborhood and improve the solution. It's recommended to
     provide a reasonable iteration limit or use a time-based stopping criterion.
     """
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     current_solution, _ = generate_solution(array_base, c, BFD=False)
     current_sum = array_base.sum()
     num_bins = len(current_solution)
+    weights = np.unique(array_base)
+    ids = np.arange(num_bins)
+    tabu = ReactiveTabu(
+        max(num_bins // 2, 1), max_tenure=4 * num_bins, size=len(weights) * num_bins
+    )
+    failed = False
     start = time.time()
     while check_end(
         th, len(current_solution), time_max, start, time.time(), max_it, it
     ):
+        increment("iterations")
         it += 1
         num_bins -= 1
+        order = np.argsort([-bin_.sum() for bin_ in current_solution], kind="stable")
+        if it > 1 and num_bins == len(current_solution) - 1 and failed:
+            k = random.randrange(len(current_solution))
+            order[k], order[-1] = order[-1], order[k]
+        current_solution = [current_solution[i] for i in order]
+        ids = ids[order]
         unplaced_items = current_solution[num_bins:]
         partial_solution = current_solution[:num_bins]
         partial_sum = sum(box.sum() for box in partial_solution)
-        aux_solution, unplaced_items = __operations(
+        aux_solution, unplaced_items, aux_ids = __operations(
             partial_solution,
             unplaced_items,
             c,
             current_sum,
             partial_sum,
+            tabu,
+            weights,
+            ids[:num_bins],
             max_attempts,
-            max_attempts_time,
+            (
+                min(max_attempts_time, time_max - (time.time() - start))
+                if time_max
+                else max_attempts_time
+            ),
         )
         if len(unplaced_items) == 0 and len(current_solution) > len(aux_solution):
-            current_solution = aux_solution
+            current_solution, ids = aux_solution, aux_ids
+            num_bins = len(current_solution)
+            failed = False
         else:
             num_bins += 1
+            failed = True
 
     return current_solution, len(current_solution)
@@ -8,46 +8,97 @@ from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def update_dragonfly_position(
-    dragonfly: np.ndarray,
+def neighborhood(positions: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Computes the neighborhood of every dragonfly from one distance matrix.
+
+    The radius is relative to the largest distance in the swarm, so it keeps
+    its meaning regardless of the number of items.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Positions of the dragonflies, one per row.
+    radius : float
+        Fraction of the largest pairwise distance inside which two dragonflies
+        are neighbors.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean matrix where entry (i, j) is True if j is a neighbor of i.
+    """
+    squared = np.einsum("ij,ij->i", positions, positions)
+    distances = squared[:, np.newaxis] + squared[np.newaxis, :]
+    distances -= 2 * positions @ positions.T
+    np.maximum(distances, 0, out=distances)
+    neighbors = distances <= (radius**2) * distances.max()
+    np.fill_diagonal(neighbors, False)
+    return neighbors
+
+
+def update_swarm(
+    positions: np.ndarray,
+    steps: np.ndarray,
     neighbors: np.ndarray,
     food: np.ndarray,
     enemy: np.ndarray,
-    r: float,
-) -> np.ndarray:
+    weights: Tuple[float, float, float, float, float],
+    inertia: float,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Updates the position of a dragonfly based on neighbors,
-    food (best solution), and enemy (worst solution).
+    Updates the positions and steps of all dragonflies with the separation,
+    alignment, cohesion, food and enemy terms computed as matrix operations.
 
     Parameters
     ----------
-    dragonfly : np.ndarray
-        The current solution of the dragonfly.
+    positions : np.ndarray
+        Positions of the dragonflies, one per row.
+    steps : np.ndarray
+        Steps of the dragonflies in the previous iteration.
     neighbors : np.ndarray
-        The neighbors of the dragonfly (influencing forces).
+        Boolean neighborhood matrix, see `neighborhood`.
     food : np.ndarray
         The best solution found so far.
     enemy : np.ndarray
-        The worst solution found so far.
-    r : float
-        A random factor for updating the position.
+        The worst solution of the current swarm.
+    weights : Tuple[float, float, float, float, float]
+        Separation, alignment, cohesion, food and enemy weights.
+    inertia : float
+        Weight of the previous step.
 
     Returns
     -------
-    np.ndarray
-        The updated position of the dragonfly.
+    Tuple[np.ndarray, np.ndarray]
+        The new positions and steps of the dragonflies.
     """
-    new_position = np.copy(dragonfly)
-    alignment = np.mean(neighbors - dragonfly, axis=0)
-    for i in range(len(dragonfly)):
-        new_position[i] += r * (food[i] - enemy[i]) + r * alignment[i]
-    return new_position.astype(int)
+    separation_w, alignment_w, cohesion_w, food_w, enemy_w = weights
+    adjacency = neighbors.astype(float)
+    counts = adjacency.sum(axis=1)[:, np.newaxis]
+    safe_counts = np.maximum(counts, 1)
+
+    neighbor_sum = adjacency @ positions
+    separation = neighbor_sum - counts * positions
+    alignment = (adjacency @ steps) / safe_counts
+    cohesion = np.where(counts > 0, neighbor_sum / safe_counts - positions, 0)
+    attraction = food - positions
+    distraction = positions - enemy
+
+    r = np.random.random((positions.shape[0], 1))
+    steps = inertia * steps + r * (
+        separation_w * separation
+        + alignment_w * alignment
+        + cohesion_w * cohesion
+        + food_w * attraction
+        + enemy_w * distraction
+    )
+    return positions + steps, steps
 
 
 def dragonfly_algorithm(
@@ -56,6 +107,10 @@ def dragonfly_algorithm(
     time_max: float = 60,
     max_it: int = None,
     population_size: int = 7,
+    weights: Tuple[float, float, float, float, float] = (0.1, 0.1, 0.7, 1.0, 1.0),
+    w_max: float = 0.9,
+    w_min: float = 0.4,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Dragonfly Algorithm (DA) applied to the Bin Packing Problem (BPP).
@@ -72,6 +127,16 @@ def dragonfly_algorithm(
         Maximum number of iterations, by default None (unlimited).
     population_size : int, optional
         Population size of dragonflies, by default 7.
+    weights : Tuple[float, float, float, float, float], optional
+        Separation, alignment, cohesion, food and enemy weights,
+        by default (0.1, 0.1, 0.7, 1.0, 1.0).
+    w_max : float, optional
+        Initial inertia weight of the steps, by default 0.9.
+    w_min : float, optional
+        Final inertia weight of the steps, by default 0.4.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -80,10 +145,12 @@ def dragonfly_algorithm(
     """
     min_value = array_base.min()
     max_value = array_base.max()
+    max_step = max_value - min_value
 
     population_matrix = generate_initial_matrix_population(
         array_base, c, population_size, VALID=True
     )
+    steps = np.zeros((population_size, array_base.shape[0]))
 
     # Initialize the best solution and its fitness
     best_idx = np.argmin(population_matrix[:, -1])
@@ -91,11 +158,12 @@ def dragonfly_algorithm(
     best_fitness = population_matrix[best_idx, -1]
 
     # Control variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         fitness_values = population_matrix[:, -1]
         current_best_idx = np.argmin(fitness_values)
 
@@ -106,18 +174,33 @@ def dragonfly_algorithm(
         food = best_solution
         enemy = population_matrix[np.argmax(fitness_values), :-1]
 
-        for i in range(population_size):
-            neighbors = population_matrix[:, :-1]
-            r = np.random.random()
-            new_position = update_dragonfly_position(
-                population_matrix[i, :-1], neighbors, food, enemy, r
-            )
-
-            new_position = np.clip(new_position, min_value, max_value).astype(int)
-            population_matrix[i, :-1] = repair_solution(
-                population_matrix[i, :-1], new_position, c
-            )
-            population_matrix[i, -1] = fitness(population_matrix[i, :-1], c)
+        # Neighborhood radius and inertia follow the progress of the search,
+        # which stays at the start when neither limit gives it a horizon
+        if max_it:
+            progress = min(it / max_it, 1)
+        elif time_max:
+            progress = min((time.time() - start) / time_max, 1)
+        else:
+            progress = 0.0
+        positions = population_matrix[:, :-1].astype(float)
+        neighbors = neighborhood(positions, 0.25 + 0.75 * progress)
+
+        new_positions, steps = update_swarm(
+            positions,
+            steps,
+            neighbors,
+            food,
+            enemy,
+            weights,
+            w_max - (w_max - w_min) * progress,
+        )
+        steps = np.clip(steps, -max_step, max_step)
+
+        new_positions = np.clip(new_positions, min_value, max_value).astype(int)
+        population_matrix[:, :-1] = repair_population(
+            population_matrix[:, :-1], new_positions, c
+        )
+        population_matrix[:, -1] = fitness_population(population_matrix[:, :-1], c)
 
         it += 1
 
@@ -3,54 +3,56 @@ Elephant Herding Optimization (EHO) algorithm for solving the Bin Packing
 Problem (BPP), utilizing clan updates and isolation to evolve solutions.
 """
 
-import random
 import time
 from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def clan_update(elephant: np.ndarray, leader: np.ndarray, alpha: float) -> np.ndarray:
+def clan_update(elephants: np.ndarray, leader: np.ndarray, alpha: float) -> np.ndarray:
     """
-    Updates the elephant's position based on the clan leader's position.
+    Updates the positions of the elephants of a clan based on the clan leader's
+    position.
 
     Parameters
     ----------
-    elephant : np.ndarray
-        The current solution of the elephant.
+    elephants : np.ndarray
+        2D matrix with the current solutions of the clan elephants.
     leader : np.ndarray
         The solution of the clan leader.
     alpha : float
-        The factor controlling how much the elephant moves towards the leader.
+        The factor controlling how much the elephants move towards the leader.
 
     Returns
     -------
     np.ndarray
-        The updated position of the elephant.
+        The updated positions of the elephants.
     """
-    return elephant + alpha * (leader - elephant)
+    factor = np.random.uniform(0, 1, (elephants.shape[0], 1))
+    return elephants + alpha * factor * (leader - elephants)
 
 
-def isolation(elephant: np.ndarray) -> np.ndarray:
+def isolation(elephants: np.ndarray) -> np.ndarray:
     """
-    Applies mutation (isolation) to the elephant by randomly.
+    Applies mutation (isolation) to the elephants by randomly shuffling each of
+    them.
 
     Parameters
     ----------
-    elephant : np.ndarray
-        The current solution of the elephant.
+    elephants : np.ndarray
+        2D matrix with the current solutions of the elephants.
     Returns
     -------
     np.ndarray
-        The mutated elephant solution.
+        The mutated elephant solutions.
     """
-    isolated_elephant = np.copy(elephant)
-    return np.random.permutation(isolated_elephant)[: len(isolated_elephant)]
+    order = np.random.rand(*elephants.shape).argsort(axis=1)
+    return np.take_along_axis(elephants, order, axis=1)
 
 
 def elephant_herding_optimization(
@@ -60,6 +62,8 @@ def elephant_herding_optimization(
     max_it: int = None,
     population_size: int = 3,
     alpha: float = 0.5,
+    num_clans: int = 1,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Elephant Herding Optimization (EHO) algorithm applied to the Bin Packing Problem (BPP).
@@ -78,47 +82,58 @@ def elephant_herding_optimization(
         Population size, by default 7.
     alpha : float, optional
         Control factor for the clan update, by default 0.5.
+    num_clans : int, optional
+        Number of clans the herd is split into, by default 1.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
     Tuple[np.ndarray, float]
         The best solution found and its fitness score.
     """
-    num_bins = array_base.shape[0]
+    min_value = array_base.min()
+    max_value = array_base.max()
     elephant_matrix = generate_initial_matrix_population(
         array_base, c, population_size, VALID=True
     )
 
+    num_clans = min(max(num_clans, 1), population_size)
+    clan = np.arange(population_size) % num_clans
+
     # Initialize the best solution and its fitness
     best_idx = np.argmin(elephant_matrix[:, -1])
     best_solution = elephant_matrix[best_idx, :-1].copy()
     best_fitness = elephant_matrix[best_idx, -1]
 
     # Control variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
-        for clan_idx in range(elephant_matrix.shape[0]):
-            leader = elephant_matrix[clan_idx, :-1].copy()
-
-            for i in range(elephant_matrix.shape[0]):
-                if random.random() < 0.5:
-                    new_elephant = clan_update(elephant_matrix[i, :-1], leader, alpha)
-                    new_elephant = np.clip(new_elephant, 0, num_bins - 1).astype(int)
-                    elephant_matrix[i, :-1] = repair_solution(
-                        elephant_matrix[i, :-1], new_elephant, c
-                    )
-
-            if fitness(elephant_matrix[clan_idx, :-1], c) > best_fitness:
-                new_elephant = isolation(elephant_matrix[clan_idx, :-1])
-                elephant_matrix[clan_idx, :-1] = repair_solution(
-                    elephant_matrix[clan_idx, :-1], new_elephant, c
-                )
-
-        for i in range(elephant_matrix.shape[0]):
-            elephant_matrix[i, -1] = fitness(elephant_matrix[i, :-1], c)
+        increment("iterations")
+        current = elephant_matrix[:, :-1]
+        new_elephants = current.copy()
+
+        for clan_idx in range(num_clans):
+            members = np.flatnonzero(clan == clan_idx)
+            order = members[np.argsort(elephant_matrix[members, -1])]
+            leader, followers = order[0], order[1:]
+
+            # Followers move towards the leader, which stays in place
+            new_elephants[followers] = np.round(
+                clan_update(current[followers], current[leader], alpha)
+            )
+
+            # Separating operator: the worst elephant of the clan is isolated
+            if order.size > 1 and elephant_matrix[order[-1], -1] > best_fitness:
+                new_elephants[order[-1]] = isolation(current[order[-1:]])[0]
+
+        new_elephants = np.clip(new_elephants, min_value, max_value).astype(int)
+        elephant_matrix[:, :-1] = repair_population(current, new_elephants, c)
+        elephant_matrix[:, -1] = fitness_population(elephant_matrix[:, :-1], c)
 
         best_idx = np.argmin(elephant_matrix[:, -1])
         if elephant_matrix[best_idx, -1] < best_fitness:
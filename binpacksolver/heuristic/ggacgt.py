@@ -5,13 +5,89 @@ Module for implementing the GGA-CGT algorithm for the Bin Packing Problem (BPP).
 import heapq
 import random
 import time
+from itertools import zip_longest
 from typing import List, Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (best_fit_decreasing, check_end,
-                                 find_best_solution, first_fit, fitness,
-                                 has_common_elements, theoretical_minimum)
+from binpacksolver.utils import (check_end, fitness, increment, profiled,
+                                 theoretical_minimum)
+
+
+def __first_fit(
+    ids: np.ndarray, items: np.ndarray, c: int, bins: List[np.ndarray]
+) -> List[np.ndarray]:
+    """
+    Places items, given by their IDs, into the first bin where they fit.
+
+    Parameters
+    ----------
+    ids : np.ndarray
+        IDs of the items to be placed, in insertion order.
+    items : np.ndarray
+        Size of each item, indexed by item ID.
+    c : int
+        Capacity of each bin.
+    bins : List[np.ndarray]
+        Existing bins, as arrays of item IDs, where items will be placed.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The bins with the new items.
+    """
+    loads = np.array([items[bin_p].sum() for bin_p in bins], dtype=int)
+    for item_id in ids:
+        available_bins = np.flatnonzero(loads <= c - items[item_id])
+        if available_bins.size > 0:
+            idx = available_bins[0]
+            bins[idx] = np.append(bins[idx], item_id)
+            loads[idx] += items[item_id]
+        else:
+            bins.append(np.array([item_id], dtype=int))
+            loads = np.append(loads, items[item_id])
+    return bins
+
+
+def __best_fit(
+    ids: np.ndarray, items: np.ndarray, c: int, bins: List[np.ndarray]
+) -> List[np.ndarray]:
+    """
+    Places items, given by their IDs, into the bin where they leave the least
+    free space.
+
+    Parameters
+    ----------
+    ids : np.ndarray
+        IDs of the items to be placed, in insertion order.
+    items : np.ndarray
+        Size of each item, indexed by item ID.
+    c : int
+        Capacity of each bin.
+    bins : List[np.ndarray]
+        Existing bins, as arrays of item IDs, where items will be placed.
+
+    Returns
+    -------
+    List[np.ndarray]
+        The bins with the new items.
+    """
+    space_left = np.array([c - items[bin_p].sum() for bin_p in bins], dtype=int)
+    for item_id in ids:
+        valid_bins = np.flatnonzero(space_left >= items[item_id])
+        if valid_bins.size > 0:
+            idx = valid_bins[np.argmin(space_left[valid_bins])]
+            bins[idx] = np.append(bins[idx], item_id)
+            space_left[idx] -= items[item_id]
+        else:
+            bins.append(np.array([item_id], dtype=int))
+            space_left = np.append(space_left, c - items[item_id])
+    return bins
+
+
+def __sort_by_fill(individual: List[np.ndarray], items: np.ndarray) -> List[np.ndarray]:
+    """Returns the bins of an individual ordered by decreasing fill."""
+    return sorted(individual, key=lambda bin_p: items[bin_p].sum(), reverse=True)
 
 
 def __initialize_population(
@@ -33,28 +109,35 @@ def __initialize_population(
     Returns
     -------
     List[List[np.ndarray]]
-        A list of individuals representing the initial population.
+        A list of individuals representing the initial population, where each
+        bin holds the IDs of its items.
     """
-    population = []
-    for _ in range(n_pop):
-        random.shuffle(items)
-        individual = first_fit(items, c, [])
-        population.append(individual)
-    return population
+    return [
+        __first_fit(np.random.permutation(len(items)), items, c, [])
+        for _ in range(n_pop)
+    ]
 
 
+@profiled("move")
 def __gene_level_crossover(
-    parent1: List[np.ndarray], parent2: List[np.ndarray], c: int
+    parent1: List[np.ndarray], parent2: List[np.ndarray], items: np.ndarray, c: int
 ) -> List[np.ndarray]:
     """
     Performs gene-level crossover between two parent individuals to produce a child individual.
 
+    Bins of both parents are compared in decreasing order of fill and the fuller
+    one is inherited first. A bin is only inherited when none of its items has
+    been placed yet, which is checked with a bitmap indexed by item ID. Items
+    left out are reinserted with first fit decreasing.
+
     Parameters
     ----------
     parent1 : List[np.ndarray]
         The first parent individual.
     parent2 : List[np.ndarray]
         The second parent individual.
+    items : np.ndarray
+        Size of each item, indexed by item ID.
     c : int
         Capacity of each bin.
 
@@ -64,23 +147,102 @@ def __gene_level_crossover(
         A new child individual created from the parents.
     """
     child: List[np.ndarray] = []
-    trash: np.ndarray = np.array([], dtype=int)
-
-    for x, y in zip(parent1, parent2):
-        if x.sum() >= y.sum():
-            if has_common_elements(x, child, trash):
-                child.append(x.copy())
-        else:
-            if has_common_elements(y, child, trash):
-                child.append(y.copy())
-
-    child = first_fit(trash, c, child)
-    return child
+    placed = np.zeros(len(items), dtype=bool)
+
+    pairs = zip_longest(__sort_by_fill(parent1, items), __sort_by_fill(parent2, items))
+    for x, y in pairs:
+        genes = [bin_p for bin_p in (x, y) if bin_p is not None]
+        genes.sort(key=lambda bin_p: items[bin_p].sum(), reverse=True)
+        for bin_p in genes:
+            if not placed[bin_p].any():
+                child.append(bin_p.copy())
+                placed[bin_p] = True
+
+    trash = np.flatnonzero(~placed)
+    trash = trash[np.argsort(-items[trash], kind="stable")]
+    return __first_fit(trash, items, c, child)
+
+
+@profiled("move")
+def __rearrangement_by_pairs(
+    bins: List[np.ndarray],
+    free: np.ndarray,
+    items: np.ndarray,
+    c: int,
+    max_pool: int = 64,
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Improves the fill of each bin by exchanging up to two of its items with up
+    to two free items of larger total size, then returns the free items left.
 
+    Parameters
+    ----------
+    bins : List[np.ndarray]
+        Bins of item IDs to be rearranged.
+    free : np.ndarray
+        IDs of the free items.
+    items : np.ndarray
+        Size of each item, indexed by item ID.
+    c : int
+        Capacity of each bin.
+    max_pool : int, optional
+        Number of largest free items considered for pairs, by default 64.
 
-def __adaptive_mutation(individual: List[np.ndarray], delta: float, c: int):
+    Returns
+    -------
+    Tuple[List[np.ndarray], np.ndarray]
+        The rearranged bins and the IDs of the items that are still free.
+    """
+    free = free[np.argsort(items[free], kind="stable")]
+
+    for k in np.random.permutation(len(bins)):
+        while free.size:
+            # Free singles and pairs of the largest free items, by total size
+            pool = min(free.size, max_pool)
+            first, second = np.triu_indices(pool, k=1)
+            first, second = first + free.size - pool, second + free.size - pool
+            in_sums = np.concatenate(
+                (items[free], items[free[first]] + items[free[second]])
+            )
+            in_first = np.concatenate((np.arange(free.size), first))
+            in_second = np.concatenate((np.full(free.size, -1), second))
+            in_order = np.argsort(in_sums, kind="stable")
+
+            # Bin singles and pairs that may leave, including leaving nothing
+            sizes = items[bins[k]]
+            pair_a, pair_b = np.triu_indices(sizes.size, k=1)
+            out_sums = np.concatenate(([0], sizes, sizes[pair_a] + sizes[pair_b]))
+            out_first = np.concatenate(([-1], np.arange(sizes.size), pair_a))
+            out_second = np.concatenate(([-1], np.full(sizes.size, -1), pair_b))
+
+            limits = out_sums + c - sizes.sum()
+            slots = np.searchsorted(in_sums[in_order], limits, side="right") - 1
+            gains = np.where(slots >= 0, in_sums[in_order[slots]] - out_sums, 0)
+            move = np.argmax(gains)
+            if gains[move] <= 0:
+                break
+
+            chosen = in_order[slots[move]]
+            entering = [i for i in (in_first[chosen], in_second[chosen]) if i >= 0]
+            leaving = [i for i in (out_first[move], out_second[move]) if i >= 0]
+
+            keep = np.ones(sizes.size, dtype=bool)
+            keep[leaving] = False
+            free_left = np.concatenate((np.delete(free, entering), bins[k][leaving]))
+            bins[k] = np.concatenate((bins[k][keep], free[entering]))
+            free = free_left[np.argsort(items[free_left], kind="stable")]
+
+    return bins, free
+
+
+@profiled("move")
+def __adaptive_mutation(
+    individual: List[np.ndarray], delta: float, items: np.ndarray, c: int
+):
     """
-    Applies adaptive mutation to an individual.
+    Applies adaptive mutation to an individual. The least filled bins are
+    emptied, their items are rearranged by pairs with the remaining bins and
+    the items still free are reinserted with first fit decreasing.
 
     Parameters
     ----------
@@ -88,6 +250,8 @@ def __adaptive_mutation(individual: List[np.ndarray], delta: float, c: int):
         The individual to mutate.
     delta : float
         Factor for adaptive mutation.
+    items : np.ndarray
+        Size of each item, indexed by item ID.
     c : int
         Capacity of each bin.
 
@@ -96,49 +260,72 @@ def __adaptive_mutation(individual: List[np.ndarray], delta: float, c: int):
     List[np.ndarray]
         The mutated individual.
     """
-    individual = sorted(individual, key=np.sum, reverse=True)
-    num_bins = int(len(individual) * delta)
+    individual = __sort_by_fill(individual, items)[::-1]
+    num_bins = max(int(len(individual) * delta), 1)
     bins = individual[:num_bins]
     individual = individual[num_bins:]
-    trash = np.concatenate(bins)
-    return best_fit_decreasing(trash, c, individual)
 
+    free = np.concatenate(bins)
+    individual, free = __rearrangement_by_pairs(individual, free, items, c)
+    free = free[np.argsort(-items[free], kind="stable")]
+    return __first_fit(free, items, c, individual)
+
+
+@profiled("fitness")
+def __score(
+    individual: List[np.ndarray], items: np.ndarray, c: int
+) -> Tuple[int, float]:
+    """
+    Cached sort key of an individual, smaller is better: the number of bins and
+    then the negated average squared fill of the bins.
+    """
+    loads = np.array([items[bin_p].sum() for bin_p in individual]) / c
+    return len(individual), -float(np.mean(loads**2))
 
+
+@profiled("selection")
 def __controlled_selection(
-    population: List[List[np.ndarray]], limit: int
-) -> List[List[np.ndarray]]:
+    population: List[Tuple[Tuple[int, float], List[np.ndarray]]], limit: int
+) -> List[Tuple[List[np.ndarray], List[np.ndarray]]]:
     """
-    Selects a controlled number of individuals from the population for crossover.
+    Selects pairs of parents for crossover, each pairing one of the best
+    individuals with a random individual from the rest of the population.
 
     Parameters
     ----------
-    population : List[List[np.ndarray]]
-        The current population of individuals.
+    population : List[Tuple[Tuple[int, float], List[np.ndarray]]]
+        The current population as (cached score, individual) entries.
     limit : int
         The number of individuals to select.
 
     Returns
     -------
-    List[List[np.ndarray]]
-        Selected individuals for crossover.
+    List[Tuple[List[np.ndarray], List[np.ndarray]]]
+        Pairs of parents for crossover.
     """
-    bests = heapq.nlargest(limit // 2, population, key=fitness)
-    wosts = heapq.nsmallest(limit // 2, population, key=fitness)
-    return bests + random.sample(wosts, limit // 2)
+    ranked = sorted(population, key=lambda entry: entry[0])
+    num_pairs = min(max(limit // 2, 1), len(ranked) // 2)
+    bests = ranked[:num_pairs]
+    others = random.sample(ranked[num_pairs:], num_pairs)
+    return [(best[1], other[1]) for best, other in zip(bests, others)]
 
 
+@profiled("selection")
 def __controlled_replacement(
-    population: List[List[np.ndarray]], offspring: List[List[np.ndarray]], n_pop: int
-) -> List[List[np.ndarray]]:
+    population: List[Tuple[Tuple[int, float], List[np.ndarray]]],
+    offspring: List[Tuple[Tuple[int, float], List[np.ndarray]]],
+    n_pop: int,
+) -> List[Tuple[Tuple[int, float], List[np.ndarray]]]:
     """
     Replaces the current population with offspring, maintaining the best individuals.
+    Individuals with a duplicated score are replaced first.
 
     Parameters
     ----------
     population : list
-        The current population of individuals.
+        The current population as (cached score, individual) entries.
     offspring : list
-        The offspring individuals to be added.
+        The offspring entries to be added.
     n_pop : int
         Number of individuals in the population.
 
@@ -147,8 +334,18 @@ def __controlled_replacement(
     list
         The new population after replacement.
     """
-    population.extend(offspring)
-    return heapq.nlargest(n_pop, population, key=fitness)
+    population = sorted(population + offspring, key=lambda entry: entry[0])
+    unique = [
+        entry
+        for i, entry in enumerate(population)
+        if not i or entry[0] != population[i - 1][0]
+    ]
+    duplicated = [
+        entry
+        for i, entry in enumerate(population)
+        if i and entry[0] == population[i - 1][0]
+    ]
+    return (unique + duplicated)[:n_pop]
 
 
 def genetic_algorithm_cgt(
@@ -160,6 +357,7 @@ def genetic_algorithm_cgt(
     nm: int = 1,
     delta: float = 0.7,
     time_max: float = 60,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Executes the Genetic Algorithm with Coarse-Grained Tabu Search (GGA-CGT) for
@@ -183,6 +381,9 @@ def genetic_algorithm_cgt(
         The factor for adaptive mutation control; default is 0.7.
     time_max : float, optional
         The maximum execution time for the algorithm in seconds; default is 60.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -190,38 +391,41 @@ def genetic_algorithm_cgt(
         A tuple containing the best solution found (as a list of np.ndarrays)
         and its associated fitness value.
     """
-    th_min: int = theoretical_minimum(items, c)
-    population = __initialize_population(items, n_pop, c)
-    best_solution: List[np.ndarray] = find_best_solution(population)
+    th_min: int = max(theoretical_minimum(items, c), target or 0)
+    population = [
+        (__score(individual, items, c), individual)
+        for individual in __initialize_population(items, n_pop, c)
+    ]
+    best_score, best_solution = min(population, key=lambda entry: entry[0])
     it: int = 0
     time_start: float = time.time()
 
     while check_end(
-        th_min, fitness(best_solution), time_max, time_start, time.time(), max_it, it
+        th_min, best_score[0], time_max, time_start, time.time(), max_it, it
     ):
-        selected_individuals = __controlled_selection(population, nc)
-
+        increment("iterations")
         offspring = []
-        for i in range(0, len(selected_individuals), 2):
-            child1 = __gene_level_crossover(
-                selected_individuals[i], selected_individuals[i + 1], c
-            )
-            offspring.append(child1)
-            child2 = __gene_level_crossover(
-                selected_individuals[i + 1], selected_individuals[i], c
-            )
-            offspring.append(child2)
+        for best, other in __controlled_selection(population, nc):
+            for child in (
+                __gene_level_crossover(best, other, items, c),
+                __gene_level_crossover(other, best, items, c),
+            ):
+                offspring.append((__score(child, items, c), child))
 
         population = __controlled_replacement(population, offspring, n_pop)
 
-        elite_individuals = __controlled_selection(population, nm)
-        cloned_individuals = [ind.copy() for ind in elite_individuals]
+        elite_individuals = heapq.nsmallest(nm, population, key=lambda entry: entry[0])
         cloned_individuals = [
-            __adaptive_mutation(ind, delta, c) for ind in cloned_individuals
+            __adaptive_mutation(list(ind), delta, items, c)
+            for _, ind in elite_individuals
         ]
-        population = __controlled_replacement(population, cloned_individuals, n_pop)
+        population = __controlled_replacement(
+            population,
+            [(__score(ind, items, c), ind) for ind in cloned_individuals],
+            n_pop,
+        )
 
-        best_solution = find_best_solution(population)
+        best_score, best_solution = min(population, key=lambda entry: entry[0])
         it += 1
 
-    return best_solution, fitness(best_solution)
+    return [items[bin_p] for bin_p in best_solution], fitness(best_solution)
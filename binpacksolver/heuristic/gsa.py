@@ -10,7 +10,7 @@ import numpy as np
 
 from binpacksolver.utils import (check_end, fitness,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
+                                 generate_solution, increment, repair_solution,
                                  theoretical_minimum)
 
 
@@ -82,6 +82,7 @@ def gravitational_search_algorithm(
     max_it: int = None,
     population_size: float = 7,
     grav_decay: float = 0.99,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """_summary_
 
@@ -97,6 +98,9 @@ def gravitational_search_algorithm(
         _description_, by default None
     population_size : float, optional
         _description_, by default 7
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -119,11 +123,12 @@ def gravitational_search_algorithm(
     best_solution = gravitational_matrix[best_idx, :-1]
 
     # Initial variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fit, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         # Calculate the masses based on the fitness values
         fitness_values = gravitational_matrix[:, -1]
         worst_fitness = np.max(fitness_values)
@@ -1,29 +1,33 @@
 """
 Imperialist Competitive Algorithm (ICA) for solving the Bin Packing Problem (BPP), 
 using assimilation, revolution, and competition between empires to evolve solutions.
+
+All colonies live in a single preallocated matrix and an `empire` array holds the
+empire of each colony, so moving a colony between empires is only a label change.
 """
 
 import time
-from typing import List, Tuple
+from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, local_search,
-                                 repair_solution, theoretical_minimum)
+                                 generate_solution, increment,
+                                 local_search_population, repair_population,
+                                 theoretical_minimum)
 
 
 def assimilate(
-    colony: np.ndarray, imperialist: np.ndarray, assimilation_coefficient: float
+    colonies: np.ndarray, imperialist: np.ndarray, assimilation_coefficient: float
 ) -> np.ndarray:
     """
-    Moves the colony towards the imperialist.
+    Moves the colonies of an empire towards its imperialist.
 
     Parameters
     ----------
-    colony : np.ndarray
-        The current colony solution.
+    colonies : np.ndarray
+        2D matrix with the colonies of the empire, without the fitness column.
     imperialist : np.ndarray
         The imperialist solution.
     assimilation_coefficient : float
@@ -32,70 +36,75 @@ def assimilate(
     Returns
     -------
     np.ndarray
-        The assimilated colony.
+        The assimilated colonies.
     """
-    new_position = colony + assimilation_coefficient * np.random.uniform(0, 1) * (
-        imperialist - colony
+    factor = np.random.uniform(0, 1, (colonies.shape[0], 1))
+    new_positions = colonies + assimilation_coefficient * factor * (
+        imperialist - colonies
     )
-    new_position = np.clip(new_position, 0, np.max(imperialist))
-    return new_position
+    return np.clip(new_positions, 0, np.max(imperialist))
 
 
-def revolution(colony: np.ndarray, revolution_rate: float, c: int) -> np.ndarray:
+def revolution(colonies: np.ndarray, revolution_rate: float, c: int) -> np.ndarray:
     """
-    Applies revolution to a colony with a certain probability.
+    Applies revolution to each colony with a certain probability.
 
     Parameters
     ----------
-    colony : np.ndarray
-        The current colony solution.
+    colonies : np.ndarray
+        2D matrix of colonies, without the fitness column.
     revolution_rate : float
         The probability of applying revolution.
     c : int
-        Minimum allowable value for any dimension.
+        Maximum capacity of each bin.
 
     Returns
     -------
     np.ndarray
-        The potentially modified colony.
+        The potentially modified colonies.
     """
-    if np.random.rand() < revolution_rate:
-        new_colony = np.random.choice(colony.copy(), size=len(colony), replace=True)
-        new_colony = np.random.permutation(new_colony)
-        colony = repair_solution(colony, new_colony, c)
-    return colony
+    rows = np.flatnonzero(np.random.rand(colonies.shape[0]) < revolution_rate)
+    if rows.size:
+        dim = colonies.shape[1]
+        samples = np.random.randint(dim, size=(rows.size, dim))
+        new_colonies = np.take_along_axis(colonies[rows], samples, axis=1)
+        colonies[rows] = repair_population(colonies[rows], new_colonies, c)
+    return colonies
 
 
-def compete(empires: List[np.ndarray], empire_fitness: np.ndarray) -> List[np.ndarray]:
+def __imperialists(
+    colonies: np.ndarray, empire: np.ndarray, num_empires: int
+) -> np.ndarray:
+    """Returns the row of the best colony of each empire."""
+    order = np.lexsort((colonies[:, -1], empire))
+    return order[np.searchsorted(empire[order], np.arange(num_empires))]
+
+
+def compete(empire: np.ndarray, empire_fitness: np.ndarray) -> np.ndarray:
     """
-    Handles competition between empires by transferring colonies from the weakest
+    Handles competition between empires by transferring a colony from the weakest
     to the strongest empire.
 
     Parameters
     ----------
-    empires_matrix : np.ndarray
-        The matrix representing all empires and their colonies.
+    empire : np.ndarray
+        Empire of each colony, updated in place.
     empire_fitness : np.ndarray
         Array of fitness values for each empire.
 
     Returns
     -------
-    List[np.ndarray]
-        Updated empires matrix after competition.
+    np.ndarray
+        Updated empire of each colony after competition.
     """
     weakest_empire_idx = np.argmax(empire_fitness)
     strongest_empire_idx = np.argmin(empire_fitness)
 
-    if len(empires[weakest_empire_idx]) > 1:
-        col_idx = np.random.randint(empires[weakest_empire_idx].shape[0])
-        empires[strongest_empire_idx] = np.vstack(
-            [empires[strongest_empire_idx], empires[weakest_empire_idx][col_idx, :]]
-        )
-        empires[weakest_empire_idx] = np.delete(
-            empires[weakest_empire_idx], col_idx, axis=0
-        )
+    members = np.flatnonzero(empire == weakest_empire_idx)
+    if members.size > 1:
+        empire[np.random.choice(members)] = strongest_empire_idx
 
-    return empires
+    return empire
 
 
 def imperialist_competitive_algorithm(
@@ -107,6 +116,7 @@ def imperialist_competitive_algorithm(
     num_colonies: int = 5,
     assimilation_coefficient: float = 0.7,
     revolution_rate: float = 0.9,
+    target: int = None,
 ) -> Tuple[np.ndarray, int]:
     """
     Imperialist Competitive Algorithm (ICA) applied to the Bin Packing Problem (BPP).
@@ -129,6 +139,9 @@ def imperialist_competitive_algorithm(
         Assimilation coefficient, by default 0.1.
     revolution_rate : float, optional
         Revolution rate, by default 0.1.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -138,65 +151,58 @@ def imperialist_competitive_algorithm(
     min_value = solution.min()
     max_value = solution.max()
 
-    # Initialize empires (a list of matrices where each matrix represents an empire with colonies)
-    empires = [
-        generate_initial_matrix_population(solution, c, num_colonies, VALID=True)
-        for _ in range(num_empires)
-    ]
+    # All colonies in one matrix, with the empire of each colony as a label
+    colonies = generate_initial_matrix_population(
+        solution, c, num_empires * num_colonies, VALID=True
+    )
+    empire = np.repeat(np.arange(num_empires), num_colonies)
 
     # Track the best solution globally
-    imperialists = [empire[np.argmin(empire[:, -1])] for empire in empires]
-    empire_fitness = np.array([fitness(imperialist, c) for imperialist in imperialists])
+    imperialists = __imperialists(colonies, empire, num_empires)
+    empire_fitness = colonies[imperialists, -1]
     best_idx = np.argmin(empire_fitness)
     best_fitness = empire_fitness[best_idx]
-    best_solution = imperialists[best_idx][:-1].copy()
+    best_solution = colonies[imperialists[best_idx], :-1].copy()
 
     # Initialize variables for loop
-    th_min = theoretical_minimum(solution, c)
+    th_min = max(theoretical_minimum(solution, c), target or 0)
     it = 0
     time_start = time.time()
 
     while check_end(
         th_min, best_fitness, time_max, time_start, time.time(), max_it, it
     ):
+        increment("iterations")
         # Assimilation Phase: Move colonies towards imperialist
-        for i in range(num_empires):
-            # Get the imperialist solution (without fitness)
-            imperialist = imperialists[i][:-1]
-            for j in range(empires[i].shape[0]):
-                colony = empires[i][j, :-1]
-                if np.array_equal(colony, imperialist):
-                    continue
-
-                # Assimilate
-                assimilated_colony = assimilate(
-                    colony.copy(), imperialist, assimilation_coefficient
-                )
-                assimilated_colony = np.round(assimilated_colony).astype(int)
-                assimilated_colony = repair_solution(colony, assimilated_colony, c)
-
-                # Revolution
-                assimilated_colony = revolution(assimilated_colony, revolution_rate, c)
-                assimilated_colony = local_search(
-                    assimilated_colony, c, min_value, max_value
-                )
-
-                # Update the colony in the matrix and calculate its fitness
-                empires[i][j, :-1] = assimilated_colony
-                empires[i][j, -1] = fitness(assimilated_colony, c)
-
-        imperialists = [empire[np.argmin(empire[:, -1])] for empire in empires]
-        empire_fitness = np.array(
-            [fitness(imperialist, c) for imperialist in imperialists]
-        )
-        empires = compete(empires, empire_fitness)
+        for i, imperialist_idx in enumerate(imperialists):
+            imperialist = colonies[imperialist_idx, :-1].copy()
+            rows = np.flatnonzero(empire == i)
+            rows = rows[np.any(colonies[rows, :-1] != imperialist, axis=1)]
+            if not rows.size:
+                continue
+
+            current = colonies[rows, :-1]
+            assimilated = assimilate(current, imperialist, assimilation_coefficient)
+            colonies[rows, :-1] = repair_population(
+                current, np.round(assimilated).astype(int), c
+            )
+
+        # Revolution and local search over every colony except the imperialists
+        rows = np.setdiff1d(np.arange(colonies.shape[0]), imperialists)
+        if rows.size:
+            updated = revolution(colonies[rows, :-1], revolution_rate, c)
+            updated = local_search_population(updated, c, min_value, max_value)
+            colonies[rows, :-1] = updated
+            colonies[rows, -1] = fitness_population(updated, c)
+
+        imperialists = __imperialists(colonies, empire, num_empires)
+        empire_fitness = colonies[imperialists, -1]
+        empire = compete(empire, empire_fitness)
         best_idx = np.argmin(empire_fitness)
-        current_best_fitness = empire_fitness[best_idx]
-        current_best_solution = imperialists[best_idx][:-1].copy()
 
-        if current_best_fitness < best_fitness:
-            best_fitness = current_best_fitness
-            best_solution = current_best_solution.copy()
+        if empire_fitness[best_idx] < best_fitness:
+            best_fitness = empire_fitness[best_idx]
+            best_solution = colonies[imperialists[best_idx], :-1].copy()
 
         it += 1
 
@@ -9,14 +9,14 @@ from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def update_whale_position(
-    whale: np.ndarray,
+def update_whale_positions(
+    whales: np.ndarray,
     leader: np.ndarray,
     b: float,
     l: float,
@@ -24,13 +24,13 @@ def update_whale_position(
     adjust_c: float,
 ) -> np.ndarray:
     """
-    Updates the position of a whale based on linear or spiral motion,
-    depending on a probabilistic condition.
+    Updates the positions of all whales based on linear or spiral motion,
+    chosen for each whale by a probabilistic condition.
 
     Parameters
     ----------
-    whale : np.ndarray
-        The current whale solution.
+    whales : np.ndarray
+        2D matrix with the current whale solutions.
     leader : np.ndarray
         The leader solution (best current solution).
     b : float
@@ -45,15 +45,14 @@ def update_whale_position(
     Returns
     -------
     np.ndarray
-        The updated position of the whale.
+        The updated positions of the whales.
     """
-    if random.random() < 0.5:
-        adjust_d = abs(adjust_c * leader - whale)
-        whale = leader - adjust_a * adjust_d
-    else:
-        distance_to_leader = abs(leader - whale)
-        whale = distance_to_leader * np.exp(b * l) * np.cos(2 * np.pi * l) + leader
-    return whale
+    encircling = np.random.random((whales.shape[0], 1)) < 0.5
+    return np.where(
+        encircling,
+        leader - adjust_a * np.abs(adjust_c * leader - whales),
+        np.abs(leader - whales) * np.exp(b * l) * np.cos(2 * np.pi * l) + leader,
+    )
 
 
 def improved_whale_optimization_algorithm(
@@ -63,6 +62,7 @@ def improved_whale_optimization_algorithm(
     max_it: int = None,
     population_size: int = 7,
     spiral_constant: float = 1,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Improved Whale Optimization Algorithm (IWOA) applied to the Bin Packing Problem (BPP).
@@ -79,6 +79,11 @@ def improved_whale_optimization_algorithm(
         Maximum number of iterations, by default None (unlimited).
     population_size : int, optional
         Population size of whales, by default 7.
+    spiral_constant : float, optional
+        Spiral constant of the bubble-net motion, by default 1.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -99,39 +104,35 @@ def improved_whale_optimization_algorithm(
     global_best_score = personal_best_scores[global_best_idx]
 
     # Control variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, global_best_score, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         a = 2 - it * (
             2 / (max_it if max_it else max((time_max * 1e8) // population_size, 100))
         )
         adjust_a = 2 * a * random.random() - a
         adjust_c = 2 * random.random()
-        spiral_constant = 1
         l = (2 * random.random()) - 1
 
-        for i in range(population_size):
-            new_position = update_whale_position(
-                population_matrix[i, :-1],
-                global_best_position,
-                spiral_constant,
-                l,
-                adjust_a,
-                adjust_c,
-            )
-
-            population_matrix[i, :-1] = repair_solution(
-                population_matrix[i, :-1].copy(), np.abs(new_position).astype(int), c
-            )
-
-            current_fitness = fitness(population_matrix[i, :-1], c)
-            population_matrix[i, -1] = current_fitness
-
-            if current_fitness < personal_best_scores[i]:
-                personal_best_scores[i] = current_fitness
-                personal_best_positions[i] = population_matrix[i, :-1].copy()
+        new_positions = update_whale_positions(
+            population_matrix[:, :-1],
+            global_best_position,
+            spiral_constant,
+            l,
+            adjust_a,
+            adjust_c,
+        )
+        population_matrix[:, :-1] = repair_population(
+            population_matrix[:, :-1], np.abs(new_positions).astype(int), c
+        )
+        population_matrix[:, -1] = fitness_population(population_matrix[:, :-1], c)
+
+        improved = population_matrix[:, -1] < personal_best_scores
+        personal_best_scores[improved] = population_matrix[improved, -1]
+        personal_best_positions[improved] = population_matrix[improved, :-1]
 
         best_particle_idx = np.argmin(personal_best_scores)
         if personal_best_scores[best_particle_idx] < global_best_score:
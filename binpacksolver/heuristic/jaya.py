@@ -13,7 +13,7 @@ import numpy as np
 
 from binpacksolver.utils import (check_end, fitness,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
+                                 generate_solution, increment, repair_solution,
                                  theoretical_minimum)
 
 
@@ -23,6 +23,7 @@ def jaya_optimization(
     time_max: float = 60,
     max_it: int = None,
     population_size: float = 7,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Executes the Jaya optimization algorithm to solve the bin packing problem.
@@ -43,6 +44,9 @@ def jaya_optimization(
         Maximum number of iterations for the algorithm, by default None (unlimited).
     population_size : int, optional
         The size of the population of solutions, by default 30.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -59,11 +63,12 @@ def jaya_optimization(
     best_fit = pop_matrix[best_idx, -1]
 
     # Initial variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fit, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         it += 1
 
         best_idx = np.argmin(pop_matrix[:, -1])
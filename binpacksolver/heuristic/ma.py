@@ -1,53 +1,53 @@
 """
 Memetic algorithm with elitism for solving the Bin Packing Problem (BPP),
 using crossover, mutation, and local search to evolve solutions.
+
+Offspring are written into a preallocated double buffer and the parents of a
+generation are gathered into a preallocated buffer as well. Crossover, mutation
+and local search only edit the raw child, which is then repaired and evaluated
+once per generation for all children together.
 """
 
-import random
 import time
 from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, local_search,
-                                 repair_solution, theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def crossover(parent1: np.ndarray, parent2: np.ndarray, c: int) -> np.ndarray:
+def crossover(parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
     """
-    Performs crossover between two parents to generate a child solution.
+    Performs one point crossover between each pair of parents.
 
     Parameters
     ----------
-    parent1 : np.ndarray
-        The first parent solution.
-    parent2 : np.ndarray
-        The second parent solution.
-    c : int
-        Maximum container capacity.
+    parents1 : np.ndarray
+        2D matrix with the first parent of each child.
+    parents2 : np.ndarray
+        2D matrix with the second parent of each child.
 
     Returns
     -------
     np.ndarray
-        The generated child solution.
+        The raw children, not yet repaired.
     """
-    cross_point = random.randint(1, len(parent1) - 2)
-    child = np.concatenate([parent1[:cross_point], parent2[cross_point:]])
-    return repair_solution(parent1, child, c)
+    rows, dim = parents1.shape
+    cross_points = np.random.randint(1, max(dim - 1, 2), size=(rows, 1))
+    return np.where(np.arange(dim) < cross_points, parents1, parents2)
 
 
-def mutate(solution: np.ndarray, c: int, min_value: int, max_value: int) -> np.ndarray:
+def mutate(children: np.ndarray, min_value: int, max_value: int) -> np.ndarray:
     """
-    Mutates the solution by changing one dimension.
+    Mutates each child by changing one dimension, in place.
 
     Parameters
     ----------
-    solution : np.ndarray
-        The solution to mutate.
-    c : int
-        Maximum container capacity.
+    children : np.ndarray
+        2D matrix of raw children.
     min_value : int
         Minimum allowable value for mutation.
     max_value : int
@@ -56,12 +56,85 @@ def mutate(solution: np.ndarray, c: int, min_value: int, max_value: int) -> np.n
     Returns
     -------
     np.ndarray
-        The mutated solution.
+        The mutated children.
     """
-    mutation_point = random.randint(0, len(solution) - 1)
-    new_solution = solution.copy()
-    new_solution[mutation_point] = random.randint(min_value, max_value)
-    return repair_solution(solution, new_solution, c)
+    rows = np.arange(children.shape[0])
+    mutation_points = np.random.randint(children.shape[1], size=rows.size)
+    children[rows, mutation_points] = np.random.randint(
+        min_value, max_value + 1, size=rows.size
+    )
+    return children
+
+
+def local_move(children: np.ndarray, min_value: int, max_value: int) -> np.ndarray:
+    """
+    Perturbs a random dimension of each child towards or away from another
+    dimension, as `local_search` does, in place and without repairing.
+
+    Parameters
+    ----------
+    children : np.ndarray
+        2D matrix of raw children.
+    min_value : int
+        Minimum allowable value for any dimension.
+    max_value : int
+        Maximum allowable value for any dimension.
+
+    Returns
+    -------
+    np.ndarray
+        The perturbed children.
+    """
+    rows = np.arange(children.shape[0])
+    index_to_modify = np.random.randint(children.shape[1], size=rows.size)
+    comparison_index = np.random.randint(children.shape[1], size=rows.size)
+    random_factor = np.random.uniform(-1, 1, rows.size)
+
+    current = children[rows, index_to_modify]
+    new_values = current + random_factor * (current - children[rows, comparison_index])
+    children[rows, index_to_modify] = np.clip(new_values, min_value, max_value)
+    return children
+
+
+def breed(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    c: int,
+    min_value: int,
+    max_value: int,
+    out: np.ndarray,
+) -> np.ndarray:
+    """
+    Generates one child per pair of parents with crossover, mutation and local
+    search, followed by a single repair and evaluation of all children.
+
+    Parameters
+    ----------
+    parents1 : np.ndarray
+        2D matrix with the first parent of each child, the one used as reference
+        by the repair.
+    parents2 : np.ndarray
+        2D matrix with the second parent of each child.
+    c : int
+        Maximum container capacity.
+    min_value : int
+        Minimum allowable value for any dimension.
+    max_value : int
+        Maximum allowable value for any dimension.
+    out : np.ndarray
+        Matrix where the children and their fitness (last column) are written.
+
+    Returns
+    -------
+    np.ndarray
+        The `out` matrix.
+    """
+    children = crossover(parents1, parents2)
+    children = mutate(children, min_value, max_value)
+    children = local_move(children, min_value, max_value)
+    out[:, :-1] = repair_population(parents1, children, c)
+    out[:, -1] = fitness_population(out[:, :-1], c)
+    return out
 
 
 def memetic_algorithm(
@@ -70,6 +143,7 @@ def memetic_algorithm(
     time_max: float = 60,
     max_it: int = None,
     population_size: int = 8,
+    target: int = None,
 ) -> Tuple[np.ndarray, int]:
     """
     Memetic algorithm with elitism for solving the bin packing problem.
@@ -86,6 +160,9 @@ def memetic_algorithm(
         Maximum number of iterations, by default None.
     population_size : int, optional
         Size of the population, by default 8.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -98,59 +175,54 @@ def memetic_algorithm(
     min_value = array_base.min()
     max_value = array_base.max()
 
-    # Generate initial population
-    memetic_matrix = generate_initial_matrix_population(
+    # Generate initial population, plus one row kept for the elite
+    initial = generate_initial_matrix_population(
         array_base.copy(), c, population_size, VALID=True
     )
+    memetic_matrix = np.vstack([initial, initial[np.argmin(initial[:, -1])]])
+    offspring_matrix = np.empty_like(memetic_matrix)
+    parents = np.empty(
+        (2, population_size, memetic_matrix.shape[1] - 1), dtype=memetic_matrix.dtype
+    )
 
     # Identify the best solution in the initial population
-    best_idx = np.argmin(memetic_matrix[:, -1])
-    best_fit = memetic_matrix[best_idx, -1]
-    best_solution = memetic_matrix[best_idx, :-1]
+    best_fit = memetic_matrix[-1, -1]
 
     # Initial variables
-    th_min = theoretical_minimum(array_base, c)
+    th_min = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     time_start = time.time()
 
     while check_end(th_min, best_fit, time_max, time_start, time.time(), max_it, it):
-        fitness_values = memetic_matrix[:, -1]
-        sorted_indices = np.argsort(fitness_values)
-
-        current_best_idx = sorted_indices[0]
-        current_best_solution = memetic_matrix[current_best_idx, :-1]
-        current_best_fitness = fitness_values[current_best_idx]
-
-        new_population = []
-
-        for i in range(0, population_size - 1, 2):
-            parent1 = memetic_matrix[sorted_indices[i], :-1]
-            parent2 = memetic_matrix[sorted_indices[i + 1], :-1]
-
-            child1 = crossover(parent1=parent1, parent2=parent2, c=c)
-            child2 = crossover(parent1=parent2, parent2=parent1, c=c)
-
-            child1 = mutate(child1, c, min_value, max_value)
-            child2 = mutate(child2, c, min_value, max_value)
-
-            child1 = local_search(child1, c, min_value, max_value)
-            child2 = local_search(child2, c, min_value, max_value)
-
-            new_population.append(np.concatenate([child1, [fitness(child1, c)]]))
-            new_population.append(np.concatenate([child2, [fitness(child2, c)]]))
-
-        new_population.append(np.concatenate([best_solution, [best_fit]]))
-
-        memetic_matrix = np.array(new_population)
-
-        current_best_idx = np.argmin(memetic_matrix[:, -1])
-        current_best_fitness = memetic_matrix[current_best_idx, -1]
-        current_best_solution = memetic_matrix[current_best_idx, :-1]
-
-        if current_best_fitness < best_fit:
-            best_fit = current_best_fitness
-            best_solution = current_best_solution
-
+        increment("iterations")
+        sorted_indices = np.argsort(memetic_matrix[:, -1])[:population_size]
+
+        # Each pair of parents produces two children, one per crossover order
+        order = np.concatenate((sorted_indices[0::2], sorted_indices[1::2]))
+        np.take(memetic_matrix[:, :-1], order, axis=0, out=parents[0])
+        np.take(
+            memetic_matrix[:, :-1],
+            np.roll(order, population_size // 2),
+            axis=0,
+            out=parents[1],
+        )
+        breed(
+            parents[0],
+            parents[1],
+            c,
+            min_value,
+            max_value,
+            offspring_matrix[:population_size],
+        )
+
+        # Elitism: the best solution so far takes the last row
+        offspring_matrix[-1] = memetic_matrix[-1]
+        current_best_idx = np.argmin(offspring_matrix[:-1, -1])
+        if offspring_matrix[current_best_idx, -1] < best_fit:
+            best_fit = offspring_matrix[current_best_idx, -1]
+            offspring_matrix[-1] = offspring_matrix[current_best_idx]
+
+        memetic_matrix, offspring_matrix = offspring_matrix, memetic_matrix
         it += 1
 
-    return generate_solution(best_solution, c, VALID=True)[0], best_fit
+    return generate_solution(memetic_matrix[-1, :-1], c, VALID=True)[0], best_fit
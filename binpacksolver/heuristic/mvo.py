@@ -14,7 +14,7 @@ import numpy as np
 
 from binpacksolver.utils import (check_end, fitness,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
+                                 generate_solution, increment, repair_solution,
                                  theoretical_minimum)
 
 
@@ -114,6 +114,7 @@ def multi_verse_optimizer(
     population_size: int = 7,
     wep_max=1.0,
     wep_min=0.2,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Executes the Multi-Verse Optimizer algorithm for the bin packing problem.
@@ -134,6 +135,9 @@ def multi_verse_optimizer(
         Maximum number of iterations for the algorithm, by default None.
     population_size : int, optional
         The size of the population of solutions, by default 7.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -158,7 +162,7 @@ def multi_verse_optimizer(
     best_idx = np.argmin(uni_matrix[:, -1])
     best_universe = np.copy(uni_matrix[best_idx, :-1])
     best_fitness = uni_matrix[best_idx, -1]
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
@@ -167,6 +171,7 @@ def multi_verse_optimizer(
     )
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         it += 1
         wep = wep_min + it * ((wep_max - wep_min) / max_iterations)
         tdr = 1 - (it ** (1 / 6) / max_iterations ** (1 / 6))
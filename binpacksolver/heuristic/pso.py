@@ -10,7 +10,7 @@ import numpy as np
 
 from binpacksolver.utils import (check_end, fitness,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
+                                 generate_solution, increment, repair_solution,
                                  theoretical_minimum)
 
 
@@ -23,6 +23,7 @@ def particle_swarm_optimization(
     w: float = 0.5,
     c1: float = 1.5,
     c2: float = 1.5,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Particle Swarm Optimization (PSO) where particles are stored in a matrix form.
@@ -45,6 +46,9 @@ def particle_swarm_optimization(
         Cognitive (personal) learning factor, by default 1.5.
     c2 : float, optional
         Social (global) learning factor, by default 1.5.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -68,11 +72,12 @@ def particle_swarm_optimization(
     global_best_score = personal_best_scores[global_best_idx]
 
     # Initial variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, global_best_score, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         for i in range(population_size):
             velocities[i] = (
                 w * velocities[i]
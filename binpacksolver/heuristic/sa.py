@@ -4,146 +4,111 @@ The algorithm tries to optimize the packing of items into bins by simulating the
 annealing in metals, where temperature is gradually reduced.
 """
 
+import math
 import random
 import time
 from typing import List, Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, evaluate_solution, fitness,
-                                 generate_solution, theoretical_minimum)
+from binpacksolver.utils import (BinState, check_end, generate_solution,
+                                 increment, profiled, theoretical_minimum)
 
 
-def __perturb_solution(
-    best_fit: int, solution: List[np.ndarray], containers: List[int], c: int
-) -> Tuple[List[np.ndarray], List[int]]:
+@profiled("move")
+def __perturb_solution(state: BinState) -> bool:
     """
-    Perturbs the current solution by randomly moving an item from one bin to another.
+    Perturbs the current solution in place, either moving a random item into
+    another bin or swapping it with an item of that bin when it does not fit.
 
     Parameters
     ----------
-    best_fit : int
-        Current best fitness value.
-    solution : List[np.ndarray]
-        List of bins containing items.
-    containers : List[int]
-        List of current capacities of the bins.
-    c : int
-        Capacity of the bins.
+    state : BinState
+        The current packing. Changes are written to its undo log.
 
     Returns
     -------
-    Tuple[List[np.ndarray], List[int]]
-        The perturbed solution and updated container capacities.
+    bool
+        True if a feasible move was applied, False otherwise.
     """
-    if best_fit < 2:
-        return solution
-
-    new_solution = solution.copy()
-    new_containers = containers.copy()
-    source_bin_idx = random.randint(0, best_fit - 1)
-    item_to_move = random.randint(
-        0,
-        fitness(new_solution[source_bin_idx], c) - 1,
-    )
-    item = new_solution[source_bin_idx][item_to_move]
-    new_containers[source_bin_idx] += item
-
-    if new_containers[source_bin_idx] == c:
-        del new_solution[source_bin_idx]
-        del new_containers[source_bin_idx]
-    else:
-        new_solution[source_bin_idx] = np.delete(
-            new_solution[source_bin_idx], item_to_move
-        )
-
-    destination_bin_idx = random.randint(0, fitness(new_solution, c))
-    if destination_bin_idx == len(new_solution):
-        new_solution.append(np.array([item], dtype=int))
-        new_containers.append(c - item)
-    else:
-        new_solution[destination_bin_idx] = np.append(
-            new_solution[destination_bin_idx], item
-        )
-        new_containers[destination_bin_idx] -= item
-        if new_containers[destination_bin_idx] < 0:
-            new_bin, new_container = generate_solution(
-                new_solution[destination_bin_idx], c, BFD=True
-            )
-            del new_containers[destination_bin_idx]
-            del new_solution[destination_bin_idx]
-            new_solution.extend(new_bin)
-            new_containers.extend(new_container)
-
-    return new_solution, new_containers
-
-
-def __accept_solution(new_fitness: int, best_fit: int, temperature: float):
-    return (
-        True
-        if new_fitness < best_fit
-        else np.random.random() < np.exp((best_fit - new_fitness) / temperature)
-    )
-
-
-def __operations(
-    best_fit: int,
-    solution: List[np.ndarray],
-    containers: List[int],
-    c: int,
-    temperature: float,
-    iterations_temperature: int,
-) -> Tuple[List[np.ndarray], List[int], int]:
+    if len(state) < 2:
+        return False
+
+    a = random.randrange(len(state))
+    i = random.randrange(len(state.bins[a]))
+    item = state.bins[a][i]
+    b = random.randrange(len(state) - 1)
+    b += b >= a
+
+    if state.fits(b, item):
+        state.relocate(a, i, b)
+        return True
+
+    j = random.randrange(len(state.bins[b]))
+    other = state.bins[b][j]
+    if (
+        other != item
+        and state.loads[a] - item + other <= state.capacity
+        and state.loads[b] - other + item <= state.capacity
+    ):
+        state.swap(a, i, b, j)
+        return True
+
+    return False
+
+
+def __accept_solution(delta: float, temperature: float) -> bool:
+    return delta <= 0 or random.random() < math.exp(-delta / temperature)
+
+
+def __operations(state: BinState, temperature: float, iterations_temperature: int):
     """
     Perform operations for one temperature level.
 
+    The energy of a packing is minus the sum of its squared bin loads
+    (relative to the capacity), which rewards full bins and is updated in
+    O(1) by the state. Rejected moves are rolled back from the undo log.
+    Moves never open bins, so the current state is also the best one found.
+
     Parameters
     ----------
-    best_fit : int
-        Fitness of the current best solution.
-    solution : List[np.ndarray]
-        Current solution being optimized.
-    containers : List[int]
-        List of containers for the items.
-    c : int
-        Bin capacity.
+    state : BinState
+        Current solution being optimized, modified in place.
     temperature : float
         Current temperature of simulated annealing.
     iterations_temperature : int
         Number of iterations to perform at the current temperature.
-
-    Returns
-    -------
-    Tuple[List[np.ndarray], List[int], int]
-        The updated solution, containers, and best fitness.
     """
+    scale = state.capacity**2
+
     for _ in range(iterations_temperature):
-        new_solution, new_containers = __perturb_solution(
-            best_fit, solution, containers, c
-        )
-        new_fitness = fitness(new_solution, c)
-        if evaluate_solution(new_containers) and __accept_solution(
-            new_fitness, best_fit, temperature
-        ):
-            solution = new_solution
-            containers = new_containers
-            best_fit = new_fitness
+        square_sum = state.square_sum
+        if not __perturb_solution(state):
+            continue
 
-    return solution, containers, best_fit
+        if __accept_solution((square_sum - state.square_sum) / scale, temperature):
+            state.commit()
+        else:
+            state.rollback()
 
 
 def simulated_annealing(
     array_base: np.ndarray,
     c: int,
     time_max: float = 60,
-    min_temperature: float = 1e-9,
+    min_temperature: float = 1e-4,
     alpha: float = 0.9,
     iterations_per_temperature: int = 100,
-    initial_temperature: float = 1e9,
+    initial_temperature: float = 1.0,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Execute the Simulated Annealing algorithm for the Bin Packing Problem.
 
+    When `time_max` is set the temperature decays exponentially with the
+    elapsed time, reaching `min_temperature` at the end of the budget;
+    otherwise it is multiplied by `alpha` after each temperature level.
+
     Parameters
     ----------
     array_base : np.ndarray
@@ -153,42 +118,46 @@ def simulated_annealing(
     time_max : float, optional
         Maximum allowable time for the search, by default 60.
     min_temperature : float, optional
-        Minimum temperature before stopping, by default 1e-9.
+        Minimum temperature before stopping, by default 1e-4.
     alpha : float, optional
-        Cooling rate, by default 0.9.
+        Cooling rate used without a time budget, by default 0.9.
     iterations_per_temperature : int, optional
         Number of iterations per temperature level, by default 100.
     initial_temperature : float, optional
-        Starting temperature, by default 1e9.
+        Starting temperature, by default 1.0.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
     Tuple[List[np.ndarray], int]
         The best solution found and its fitness value.
     """
-    solution: np.ndarray = array_base.copy()
-    solution, containers = generate_solution(solution, c)
-    th_min: int = theoretical_minimum(array_base, c)
-    best_solution = solution
-    best_fit: int = fitness(solution, c)
+    solution, _ = generate_solution(array_base.copy(), c)
+    state = BinState(solution, c)
+    th_min: int = max(theoretical_minimum(array_base, c), target or 0)
     temperature: float = initial_temperature
     time_start: float = time.time()
 
     while check_end(
         th_min,
-        best_fit,
+        len(state),
         time_max,
         time_start,
         time.time(),
         temperature,
         min_temperature,
     ):
-        solution, containers, best_fit = __operations(
-            best_fit, solution, containers, c, temperature, iterations_per_temperature
-        )
-
-        if best_fit < fitness(best_solution, c):
-            best_solution = solution.copy()
-        temperature *= alpha
-
-    return best_solution, fitness(best_solution, c)
+        increment("iterations")
+        __operations(state, temperature, iterations_per_temperature)
+
+        if time_max:
+            progress = (time.time() - time_start) / time_max
+            temperature = initial_temperature * (
+                min_temperature / initial_temperature
+            ) ** min(progress, 1)
+        else:
+            temperature *= alpha
+
+    return state.to_solution(), len(state)
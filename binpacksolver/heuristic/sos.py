@@ -3,83 +3,123 @@ Symbiotic Organisms Search (SOS) algorithm for solving the Bin Packing
 Problem (BPP) through mutualism, commensalism, and parasitism phases.
 """
 
-import random
 import time
 from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
-def mutualism(org1: np.ndarray, org2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+def partners(population_size: int) -> np.ndarray:
     """
-    Executes the mutualism phase between two organisms.
+    Draws a random partner for every organism, different from the organism
+    itself whenever the ecosystem has more than one organism.
 
     Parameters
     ----------
-    org1 : np.ndarray
-        The first organism.
-    org2 : np.ndarray
-        The second organism.
+    population_size : int
+        Number of organisms in the ecosystem.
+
+    Returns
+    -------
+    np.ndarray
+        Index of the partner of each organism.
+    """
+    if population_size < 2:
+        return np.zeros(population_size, dtype=int)
+    shift = np.random.randint(1, population_size, size=population_size)
+    return (np.arange(population_size) + shift) % population_size
+
+
+def mutualism(
+    organisms: np.ndarray, partner: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Executes the mutualism phase between every organism and its partner.
+
+    Parameters
+    ----------
+    organisms : np.ndarray
+        2D matrix of organisms, without the fitness column.
+    partner : np.ndarray
+        Index of the partner of each organism.
 
     Returns
     -------
     Tuple[np.ndarray, np.ndarray]
-        The new positions of the two organisms after the mutualism phase.
+        The new positions of the organisms and of their partners after the
+        mutualism phase.
     """
-    mutual_vector = (org1 + org2) / 2
-    org1_new = org1 + random.random() * (mutual_vector - org1)
-    org2_new = org2 + random.random() * (mutual_vector - org2)
-    return org1_new, org2_new
+    others = organisms[partner]
+    mutual_vector = (organisms + others) / 2
+    factors = np.random.random((2, organisms.shape[0], 1))
+    organisms_new = organisms + factors[0] * (mutual_vector - organisms)
+    others_new = others + factors[1] * (mutual_vector - others)
+    return organisms_new, others_new
 
 
-def commensalism(org: np.ndarray, other_org: np.ndarray) -> np.ndarray:
+def commensalism(organisms: np.ndarray, partner: np.ndarray) -> np.ndarray:
     """
-    Executes the commensalism phase where an organism interacts with another organism.
+    Executes the commensalism phase where every organism interacts with its
+    partner.
 
     Parameters
     ----------
-    org : np.ndarray
-        The current organism.
-    other_org : np.ndarray
-        Another organism from the organisms_matrix.
+    organisms : np.ndarray
+        2D matrix of organisms, without the fitness column.
+    partner : np.ndarray
+        Index of the partner of each organism.
 
     Returns
     -------
     np.ndarray
-        The new position of the organism after the commensalism phase.
+        The new positions of the organisms after the commensalism phase.
     """
-    return org + (random.random() * (other_org - org))
+    factors = np.random.random((organisms.shape[0], 1))
+    return organisms + factors * (organisms[partner] - organisms)
 
 
-def parasitism(
-    org: np.ndarray, organisms_matrix: np.ndarray, bin_capacity: int
-) -> np.ndarray:
+def parasitism(organisms: np.ndarray, bin_capacity: int) -> np.ndarray:
     """
-    Executes the parasitism phase where an organism generates a parasite.
+    Executes the parasitism phase where every organism generates a parasite by
+    changing one of its items.
 
     Parameters
     ----------
-    org : np.ndarray
-        The current organism.
-    organisms_matrix : np.ndarray
-        The organisms_matrix matrix.
+    organisms : np.ndarray
+        2D matrix of organisms, without the fitness column.
     bin_capacity : int
         The bin capacity constraint.
 
     Returns
     -------
     np.ndarray
-        The new position of the organism after the parasitism phase.
+        The parasite of each organism.
     """
-    parasite = np.copy(org)
-    random_index = random.randint(0, len(organisms_matrix) - 1)
-    parasite[random_index] = random.randint(0, bin_capacity - 1)
-    return parasite
+    rows = np.arange(organisms.shape[0])
+    parasites = organisms.copy()
+    random_index = np.random.randint(organisms.shape[1], size=rows.size)
+    parasites[rows, random_index] = np.random.randint(bin_capacity, size=rows.size)
+    return parasites
+
+
+def __select(
+    organisms_matrix: np.ndarray, candidates: np.ndarray, c: int
+) -> np.ndarray:
+    """
+    Repairs and evaluates the candidates of all organisms at once, keeping each
+    candidate only where it improves the organism.
+    """
+    repaired = repair_population(organisms_matrix[:, :-1], candidates, c)
+    candidates_fitness = fitness_population(repaired, c)
+    better = candidates_fitness < organisms_matrix[:, -1]
+    organisms_matrix[better, :-1] = repaired[better]
+    organisms_matrix[better, -1] = candidates_fitness[better]
+    return organisms_matrix
 
 
 def symbiotic_organisms_search(
@@ -88,6 +128,7 @@ def symbiotic_organisms_search(
     time_max: float = 60,
     max_it: int = None,
     population_size: int = 7,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Symbiotic Organisms Search (SOS) algorithm applied to the Bin Packing Problem (BPP).
@@ -102,6 +143,9 @@ def symbiotic_organisms_search(
         Size of the organisms_matrix, by default 30.
     max_iterations : int, optional
         Maximum number of iterations, by default 100.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -116,54 +160,42 @@ def symbiotic_organisms_search(
     # Find the initial best solution
     best_idx = np.argmin(organisms_matrix[:, -1])
     best_fit = organisms_matrix[best_idx, -1]
-    best_solution = organisms_matrix[best_idx, :-1]
+    best_solution = organisms_matrix[best_idx, :-1].copy()
 
     # Initial variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fit, time_max, start, time.time(), max_it, it):
-        for i in range(population_size):
-            org1 = organisms_matrix[i, :-1]
-            org2 = organisms_matrix[random.randint(0, population_size - 1), :-1]
-            org1_new, org2_new = mutualism(org1, org2)
-
-            organisms_matrix[i, :-1] = repair_solution(
-                org1.copy(), np.abs(org1_new).astype(int), c
-            )
-            organisms_matrix[i, -1] = fitness(organisms_matrix[i, :-1], c)
-
-            other_idx = random.randint(0, population_size - 1)
-            organisms_matrix[other_idx, :-1] = repair_solution(
-                org2.copy(), np.abs(org2_new).astype(int), c
-            )
-            organisms_matrix[other_idx, -1] = fitness(
-                organisms_matrix[other_idx, :-1], c
-            )
-
-            other_org = organisms_matrix[random.randint(0, population_size - 1), :-1]
-            org_new = commensalism(organisms_matrix[i, :-1], other_org)
-            repaired_org = repair_solution(
-                organisms_matrix[i, :-1].copy(), np.abs(org_new).astype(int), c
-            )
-            current_fitness = fitness(repaired_org, c)
-
-            if current_fitness < organisms_matrix[i, -1]:
-                organisms_matrix[i, :-1] = repaired_org
-                organisms_matrix[i, -1] = current_fitness
-
-            parasite = parasitism(organisms_matrix[i, :-1], organisms_matrix[:, :-1], c)
-            repaired_parasite = repair_solution(organisms_matrix[i, :-1], parasite, c)
-            parasite_fitness = fitness(repaired_parasite, c)
-
-            if parasite_fitness < organisms_matrix[i, -1]:
-                organisms_matrix[i, :-1] = repaired_parasite
-                organisms_matrix[i, -1] = parasite_fitness
+        increment("iterations")
+        # Mutualism: organisms and their partners move towards each other
+        partner = partners(population_size)
+        organisms = organisms_matrix[:, :-1]
+        organisms_new, others_new = mutualism(organisms, partner)
+        candidates = np.abs(organisms_new).astype(int)
+        _, first = np.unique(partner, return_index=True)
+        candidates[partner[first]] = np.abs(others_new[first]).astype(int)
+        organisms_matrix[:, :-1] = repair_population(organisms, candidates, c)
+        organisms_matrix[:, -1] = fitness_population(organisms_matrix[:, :-1], c)
+
+        # Commensalism: organisms benefit from a partner, kept if better
+        organisms_new = commensalism(
+            organisms_matrix[:, :-1], partners(population_size)
+        )
+        organisms_matrix = __select(
+            organisms_matrix, np.abs(organisms_new).astype(int), c
+        )
+
+        # Parasitism: organisms are replaced by their parasite if it is better
+        parasites = parasitism(organisms_matrix[:, :-1], c)
+        organisms_matrix = __select(organisms_matrix, parasites, c)
 
         best_idx = np.argmin(organisms_matrix[:, -1])
         if organisms_matrix[best_idx, -1] < best_fit:
             best_fit = organisms_matrix[best_idx, -1]
             best_solution = organisms_matrix[best_idx, :-1].copy()
 
+        it += 1
+
     return generate_solution(best_solution, c, VALID=True)[0], best_fit
@@ -14,7 +14,7 @@ import numpy as np
 
 from binpacksolver.utils import (check_end, fitness,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
+                                 generate_solution, increment, repair_solution,
                                  theoretical_minimum)
 
 
@@ -71,6 +71,7 @@ def student_psychology_based_optimization(
     max_it=None,
     self_learning_factor=0.3,
     interaction_factor=0.7,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Student Psychology Based Optimization (SPBO) algorithm for Bin Packing Problem (BPP).
@@ -92,6 +93,9 @@ def student_psychology_based_optimization(
     interaction_factor : float, optional
         Probability that a student (solution) learns by interacting with the best solution,
         by default 0.7.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -111,11 +115,12 @@ def student_psychology_based_optimization(
     best_fitness = students_matrix[best_idx, -1]
 
     # Initial variables for stopping criteria
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         for i in range(population_size):
             if i != best_idx:
                 new_solution = update_student(
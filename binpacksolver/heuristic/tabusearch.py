@@ -4,35 +4,120 @@ Module for implementing the Tabu Search algorithm for optimization problems.
 
 import random
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (TabuStructure, check_end, container_insert,
-                                 fitness, generate_solution,
+from binpacksolver.utils import (ReactiveTabu, check_end, container_insert,
+                                 fitness, generate_solution, increment,
                                  theoretical_minimum)
 
 
+def __tabu_key(id_a: int, id_b: int) -> Tuple[int, int]:
+    """Tabu attribute of a pair of bins, independent of their order."""
+    return (id_a, id_b) if id_a < id_b else (id_b, id_a)
+
+
+def __best_partner(
+    a: int, partners: List[int], ids: List[int], tabu: ReactiveTabu
+) -> Optional[int]:
+    """
+    Finds the partner of bin `a` whose move is not tabu and has the lowest
+    diversification penalty, or None if every move is tabu.
+    """
+    best, best_penalty = None, float("inf")
+    for b in partners:
+        key = __tabu_key(ids[a], ids[b])
+        if tabu.is_tabu(key):
+            continue
+        penalty = tabu.penalty(key)
+        if penalty == 0:
+            return b
+        if penalty < best_penalty:
+            best, best_penalty = b, penalty
+    return best
+
+
+def __sample_pair(
+    ids: List[int], tabu: ReactiveTabu, candidates: int
+) -> Tuple[int, int]:
+    """
+    Samples a pair of distinct bins whose move is not tabu.
+
+    A bin `a` is drawn first and then at most `candidates` distinct partners are
+    checked. Among the partners whose move is not tabu, the one with the lowest
+    diversification penalty is taken, so pairs that were moved often are left
+    alone. If every sampled partner is tabu, all the partners of `a` and then
+    of at most `candidates` other random bins are scanned, so a move costs
+    O(candidates * n) at worst, and a tabu move is only taken, the least
+    penalized sampled one (aspiration), when all of them are tabu.
+
+    Parameters
+    ----------
+    ids : List[int]
+        Stable identifiers of the bins.
+    tabu : ReactiveTabu
+        The reactive memory used to manage taboo moves.
+    candidates : int
+        Number of partners checked for the first bin.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Positions of the two bins.
+    """
+    n = len(ids)
+    a = random.randrange(n)
+    partners = random.sample(range(n - 1), min(n - 1, candidates))
+    partners = [b + (b >= a) for b in partners]
+
+    best = __best_partner(a, partners, ids, tabu)
+    if best is not None:
+        return a, best
+
+    for first in [a] + random.sample(range(n), min(n, candidates)):
+        best = __best_partner(first, [b for b in range(n) if b != first], ids, tabu)
+        if best is not None:
+            return first, best
+
+    best = min(partners, key=lambda b: tabu.penalty(__tabu_key(ids[a], ids[b])))
+    return a, best
+
+
 def __operations(
     best_fit: int,
     solution: List[np.ndarray],
-    tabu: TabuStructure,
+    tabu: ReactiveTabu,
+    candidates: int,
     containers: List[int],
+    ids: List[int],
+    hashes: List[int],
     c: int,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Performs operations for the Tabu Search algorithm.
 
+    The hash of every bin is kept in `hashes`, aligned with `solution`, so the
+    hash of the packing is updated with the two bins touched by the move and
+    revisited packings are reported to the reactive memory.
+
     Parameters
     ----------
     best_fit : int
         The best fitness value found so far.
     solution : np.ndarray
         The current solution represented as an array.
-    tabu : TabuStructure
-        The structure used to manage taboo moves.
+    tabu : ReactiveTabu
+        The reactive memory used to manage taboo moves.
+    candidates : int
+        Number of partners checked for the first bin of the move.
     containers : List[int]
         List of container capacities.
+    ids : List[int]
+        Stable identifiers of the bins, used as tabu attributes so they keep
+        referring to the same bins after other bins are removed.
+    hashes : List[int]
+        Hash of each bin followed by the hash of the packing.
     c : int
         A parameter representing a constraint or capacity.
 
@@ -41,18 +126,29 @@ def __operations(
     Tuple[List[np.ndarray], int]
         The new solution and its fitness value.
     """
-    a = random.randint(0, best_fit - 2)
-    b = random.randint(a, best_fit - 1)
-
-    while a == b or tabu.find((a, b)):
-        a = random.randint(0, best_fit - 2)
-        b = random.randint(a, best_fit - 1)
+    a, b = __sample_pair(ids, tabu, candidates)
 
-    tabu.insert((a, b))
+    tabu.make_tabu(__tabu_key(ids[a], ids[b]))
+    total = hashes.pop() - hashes[a] - hashes[b]
     new_solution, new_fit, containers = container_insert(
-        (a, b), containers, solution, best_fit, c
+        (a, b), containers, solution, best_fit, c, ids
     )
 
+    if new_fit < best_fit:
+        hashes[b] = hashes[-1]
+        hashes.pop()
+        a = a if a < len(new_solution) else b
+        hashes[a] = ReactiveTabu.bin_hash(new_solution[a])
+        total += hashes[a]
+        tabu.improve()
+    else:
+        hashes[a] = ReactiveTabu.bin_hash(new_solution[a])
+        hashes[b] = ReactiveTabu.bin_hash(new_solution[b])
+        total += hashes[a] + hashes[b]
+        tabu.visit(total)
+    hashes.append(total)
+    tabu.step()
+
     return new_solution, new_fit
 
 
@@ -62,10 +158,15 @@ def tabu_search(
     time_max: float = 60,
     max_it: int = None,
     alpha: int = 4,
+    candidates: int = 4,
+    target: int = None,
 ) -> Tuple[List[np.ndarray], int]:
     """
     Executes the Tabu Search algorithm for bin packing.
 
+    The tabu tenure is reactive: it grows when the search revisits a packing and
+    shrinks when a bin is emptied.
+
     Parameters
     ----------
     array_base : np.ndarray
@@ -77,7 +178,12 @@ def tabu_search(
     max_it : int, optional
         Maximum number of iterations allowed, by default None.
     alpha : int, optional
-        Parameter affecting tabu structure size, by default 4.
+        Divisor of the number of bins giving the initial tabu tenure, by default 4.
+    candidates : int, optional
+        Number of partners checked for each move, by default 4.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -87,14 +193,20 @@ def tabu_search(
     solution: np.ndarray = array_base.copy()
     solution, containers = generate_solution(solution, c)
 
-    th_min: int = theoretical_minimum(array_base, c)
+    th_min: int = max(theoretical_minimum(array_base, c), target or 0)
     best_fit: int = fitness(solution)
-    tabu = TabuStructure(best_fit // max(alpha, best_fit - 1))
+    tabu = ReactiveTabu(max(best_fit // alpha, 1), max_tenure=max(best_fit, 1))
+    ids: List[int] = list(range(best_fit))
+    hashes: List[int] = [ReactiveTabu.bin_hash(bin_) for bin_ in solution]
+    hashes.append(sum(hashes))
     it: int = 0
     time_start: float = time.time()
 
     while check_end(th_min, best_fit, time_max, time_start, time.time(), max_it, it):
-        solution, best_fit = __operations(best_fit, solution, tabu, containers, c)
+        increment("iterations")
+        solution, best_fit = __operations(
+            best_fit, solution, tabu, candidates, containers, ids, hashes, c
+        )
         it += 1
 
     return solution, best_fit
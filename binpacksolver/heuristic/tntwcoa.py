@@ -4,16 +4,15 @@ for the Bin Packing Problem (BPP), using chaotic initialization and
 adaptive T-distribution for enhanced exploration and exploitation.
 """
 
-import random
 import time
 from typing import Tuple
 
 import numpy as np
 
-from binpacksolver.utils import (check_end, fitness,
+from binpacksolver.utils import (check_end, fitness_population,
                                  generate_initial_matrix_population,
-                                 generate_solution, repair_solution,
-                                 theoretical_minimum)
+                                 generate_solution, increment,
+                                 repair_population, theoretical_minimum)
 
 
 def nonlinear_inertia_weight(
@@ -74,6 +73,7 @@ def improved_coati_optimization_algorithm(
     w_min: float = 0.4,
     scale: float = 1.0,
     inertia_factor: float = 0.5,
+    target: int = None,
 ) -> Tuple[np.ndarray, float]:
     """
     Improved Coati Optimization Algorithm (TNTWCOA) applied to the Bin Packing Problem (BPP).
@@ -98,6 +98,9 @@ def improved_coati_optimization_algorithm(
         Scale factor for adaptive T-distribution variation, by default 1.0.
     inertia_factor : float, optional
         Factor controlling the balance between exploration and exploitation, by default 0.5.
+    target : int, optional
+        Number of bins at which the search stops, such as a known optimum, by
+        default the theoretical minimum.
 
     Returns
     -------
@@ -120,11 +123,12 @@ def improved_coati_optimization_algorithm(
     best_fitness = coati_matrix[best_idx, -1]
 
     # Control variables
-    th = theoretical_minimum(array_base, c)
+    th = max(theoretical_minimum(array_base, c), target or 0)
     it = 0
     start = time.time()
 
     while check_end(th, best_fitness, time_max, start, time.time(), max_it, it):
+        increment("iterations")
         inertia_weight = nonlinear_inertia_weight(
             it,
             (
@@ -136,29 +140,26 @@ def improved_coati_optimization_algorithm(
             w_min,
         )
 
-        for i in range(coati_matrix.shape[0]):
-            if random.random() < 0.5:
-                new_coati = best_solution + inertia_weight * np.random.uniform(-1, 1, n)
-            else:
-                new_coati = coati_matrix[i, :-1] + inertia_weight * np.random.uniform(
-                    -1, 1, n
-                )
-
-            new_coati = np.clip(new_coati, min_value, max_value).astype(int)
-            coati_matrix[i, :-1] = repair_solution(coati_matrix[i, :-1], new_coati, c)
+        # Exploration phase: each coati moves around the best or its own position
+        towards_best = np.random.random((population_size, 1)) < 0.5
+        new_coatis = np.where(towards_best, best_solution, coati_matrix[:, :-1])
+        new_coatis = new_coatis + inertia_weight * np.random.uniform(
+            -1, 1, (population_size, n)
+        )
+        new_coatis = np.clip(new_coatis, min_value, max_value).astype(int)
+        coati_matrix[:, :-1] = repair_population(coati_matrix[:, :-1], new_coatis, c)
 
         # Exploitation phase with adaptive T-distribution
-        for i in range(coati_matrix.shape[0]):
-            if random.random() < 0.5:
-                t_variation = adaptive_t_distribution(1, n, scale).flatten()
-                new_coati = coati_matrix[i, :-1] + t_variation
-                new_coati = np.clip(new_coati, min_value, max_value).astype(int)
-                coati_matrix[i, :-1] = repair_solution(
-                    coati_matrix[i, :-1], new_coati, c
-                )
-
-        for i in range(coati_matrix.shape[0]):
-            coati_matrix[i, -1] = fitness(coati_matrix[i, :-1], c)
+        t_variation = adaptive_t_distribution(population_size, n, scale)
+        rows = np.flatnonzero(np.random.random(population_size) < 0.5)
+        if rows.size:
+            new_coatis = coati_matrix[rows, :-1] + t_variation[rows]
+            new_coatis = np.clip(new_coatis, min_value, max_value).astype(int)
+            coati_matrix[rows, :-1] = repair_population(
+                coati_matrix[rows, :-1], new_coatis, c
+            )
+
+        coati_matrix[:, -1] = fitness_population(coati_matrix[:, :-1], c)
 
         best_idx = np.argmin(coati_matrix[:, -1])
         if coati_matrix[best_idx, -1] < best_fitness:
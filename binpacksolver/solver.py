@@ -9,7 +9,7 @@ near-optimal solution for packing itemsinto containers with a given capacity.
 
 import concurrent.futures
 import time
-from typing import Callable, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 import numpy as np
 from tabulate import tabulate
@@ -21,7 +21,7 @@ from binpacksolver.heuristic import (artificial_bee_colony,
                                      jaya_optimization,
                                      particle_swarm_optimization,
                                      student_psychology_based_optimization)
-from binpacksolver.utils import theoretical_minimum
+from binpacksolver.utils import Profile, profile, theoretical_minimum
 
 
 class Solver:
@@ -61,6 +61,16 @@ class Solver:
         If set to True, the solver will ignore the time allocation across heuristics
         and will only execute the first heuristic in `priority_func` using the total
         `time_max` value. Default is False.
+    best_known : int, optional
+        Best-known number of bins of the instance, see
+        `binpacksolver.utils.BestKnown`. Used to report the gap of the solution.
+    target : bool, optional
+        If set to True and `best_known` is given, every heuristic stops as soon as
+        it reaches the best-known solution and no further heuristic is started.
+        Default is False.
+    collect_stats : bool, optional
+        If set to True, the hot paths of each heuristic are counted and timed, see
+        `binpacksolver.utils.Profile`, and summarized in `stats`. Default is False.
 
     Attributes
     ----------
@@ -82,6 +92,19 @@ class Solver:
         A list of time allocations for each heuristic based on `time_max`.
     disable_allocation : bool
         Controls whether the solver uses time allocation or runs only the first heuristic.
+    best_known : int
+        Best-known number of bins of the instance, or None.
+    target : bool
+        Whether the solver stops at the best-known solution.
+    gap : float
+        Relative gap of the last solution found by `run` to the best-known one,
+        or None.
+    collect_stats : bool
+        Whether the heuristics are profiled.
+    stats : Dict[str, Dict[str, float]]
+        Summary of the profile of each heuristic of the last call to `run`, by
+        function name: iterations completed, evaluations/s, repairs/s and the
+        percentage of time in repair, fitness, decode, move and selection.
     """
 
     def __init__(self, capacity, weights, **kwargs):
@@ -109,6 +132,12 @@ class Solver:
         disable_allocation : bool, optional
             If set to True, disables the time allocation across heuristics and runs only the
             first heuristic with the full `time_max`. Default is False.
+        best_known : int, optional
+            Best-known number of bins of the instance, used to report the gap.
+        target : bool, optional
+            If set to True, stops at the best-known solution. Default is False.
+        collect_stats : bool, optional
+            If set to True, profiles the heuristics into `stats`. Default is False.
         """
         self.capacity = capacity
         self.weights = weights
@@ -131,6 +160,12 @@ class Solver:
         self.time_max = kwargs.get("time_max", 60)
         self.verbose = kwargs.get("verbose", 0)
         self.disable_allocation = kwargs.get("disable_allocation", False)
+        self.best_known = kwargs.get("best_known", None)
+        self.target = kwargs.get("target", False) and self.best_known is not None
+        self.gap = None
+        self.collect_stats = kwargs.get("collect_stats", False)
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.__profiles: Dict[str, Profile] = {}
 
         if not self.disable_allocation:
             self.time_allocation = self.__allocate_time()
@@ -164,6 +199,15 @@ class Solver:
 
         return time_allocations
 
+    def __reached_target(self, best_fit: int) -> bool:
+        """Checks if the solver is in target mode and reached the best-known solution."""
+        return self.target and best_fit is not None and best_fit <= self.best_known
+
+    def __update_gap(self, best_fit: int):
+        """Stores the gap of the best fit to the best-known solution, if any."""
+        if self.best_known is not None and best_fit is not None:
+            self.gap = (best_fit - self.best_known) / self.best_known
+
     def __print_information(
         self, heuristic_name: str, best_solution: int, real_time: float
     ):
@@ -189,6 +233,10 @@ class Solver:
                 ],
                 ["Execution Time (s)", f"{real_time:.4f}"],
             ]
+            if self.best_known is not None:
+                gap = (best_solution - self.best_known) / self.best_known
+                table_data.insert(4, ["Best Known Solution", self.best_known])
+                table_data.insert(5, ["Gap to Best Known", f"{gap:.2%}"])
 
             print(f"=== Heuristic: {heuristic_name} ===")
             print(
@@ -198,6 +246,16 @@ class Solver:
             )
             print("\n" + "=" * 50 + "\n")
 
+    def __print_stats(self):
+        """Prints the profile summary of each heuristic, if it was collected."""
+        if self.stats:
+            names = list(self.stats)
+            rows = [
+                [field] + [self.stats[name][field] for name in names]
+                for field in self.stats[names[0]]
+            ]
+            print(tabulate(rows, headers=["Stat"] + names, floatfmt=".2f"))
+
     def run_heuristic(
         self,
         heuristic_func: Callable,
@@ -218,13 +276,29 @@ class Solver:
         time_max : float
             Maximum time to allocate for this heuristic.
 
+        In target mode the best-known solution is passed to the heuristic as its
+        `target`, so it stops as soon as it is reached. When `collect_stats` is
+        set, the run is profiled and its summary is added to `stats`.
+
         Returns
         -------
         Tuple[List[np.ndarray], int, float]
             The solution, the best fit (minimum containers used), and the execution time.
         """
+        kwargs = {"target": self.best_known} if self.target else {}
         start_time = time.perf_counter()
-        best_solution, best_fit = heuristic_func(weights, capacity, time_max=time_max)
+        if not self.collect_stats:
+            best_solution, best_fit = heuristic_func(
+                weights, capacity, time_max=time_max, **kwargs
+            )
+        else:
+            with profile() as current:
+                best_solution, best_fit = heuristic_func(
+                    weights, capacity, time_max=time_max, **kwargs
+                )
+            name = heuristic_func.__name__
+            self.__profiles.setdefault(name, Profile()).merge(current)
+            self.stats[name] = self.__profiles[name].summary()
         execution_time = time.perf_counter() - start_time
         return best_solution, best_fit, execution_time
 
@@ -239,6 +313,8 @@ class Solver:
         Tuple[List[np.ndarray], int]
             The best solution found and its corresponding fit (minimum containers used).
         """
+        self.stats = {}
+        self.__profiles = {}
         if self.disable_allocation:
             heuristic_name = self.priority_func[0].__name__.replace("_", " ").title()
             if self.verbose >= 1:
@@ -251,6 +327,7 @@ class Solver:
                 self.priority_func[0], self.weights, self.capacity, self.time_max
             )
             self.__print_information(heuristic_name, fit, execution_time)
+            self.__update_gap(fit)
 
             if self.verbose >= 1:
                 print(f"Best solution fit: {fit}")
@@ -258,6 +335,9 @@ class Solver:
             if self.verbose >= 2:
                 print(f"Best solution {solution}")
 
+            if self.verbose >= 3:
+                self.__print_stats()
+
             return solution, fit
 
         remaining_time = self.time_max
@@ -270,7 +350,7 @@ class Solver:
         with tqdm(total=total_allocated_time, desc="Running Heuristics") as pbar:
             if self.max_workers == 1:
                 for i, heuristic in enumerate(self.priority_func):
-                    if remaining_time <= 0:
+                    if remaining_time <= 0 or self.__reached_target(best_fit):
                         break
 
                     heuristic_name = heuristic.__name__.replace("_", " ").title()
@@ -298,7 +378,11 @@ class Solver:
                     max_workers=self.max_workers
                 ) as executor:
                     i = 0
-                    while remaining_time > 0 and i < len(self.priority_func):
+                    while (
+                        remaining_time > 0
+                        and i < len(self.priority_func)
+                        and not self.__reached_target(best_fit)
+                    ):
                         futures = []
                         future_to_heuristic = {}
                         heuristics_to_run = self.priority_func[i : i + self.max_workers]
@@ -337,6 +421,7 @@ class Solver:
                         i += self.max_workers
 
         total_time = time.perf_counter() - start_time
+        self.__update_gap(best_fit)
         if self.verbose >= 1:
             print(f"Best solution fit: {best_fit}")
 
@@ -345,5 +430,6 @@ class Solver:
 
         if self.verbose >= 3:
             print(f"Total execution time: {total_time:.4f} seconds")
+            self.__print_stats()
 
         return best_solution, best_fit
@@ -1,33 +1,46 @@
-from tabu_structure import TabuStructure
-
+from .best_known import (BestKnown, convert_solutions, instance_key,
+                         load_best_known)
+from .bin_state import BinState
+from .instances import (InstanceCache, load_instances, parse_instance,
+                        read_zip_instances)
 from .online_algorithms import (best_fit_decreasing, first_fit,
                                 first_fit_decreasing)
 from .operations import (container_change, container_concatenate,
                          container_insert)
+from .profiling import Profile, increment, profile, profiled
+from .reactive_tabu import ReactiveTabu
 from .support_functions import (bestfit_population, bw_population,
                                 evaluate_solution, find_best_solution, fitness,
-                                generate_container,
+                                fitness_population, generate_container,
                                 generate_initial_matrix_population,
                                 generate_initial_population, generate_solution,
-                                local_search, repair_solution,
+                                local_search, local_search_population,
+                                repair_population, repair_solution,
                                 theoretical_minimum, tournament_roulette,
                                 valid_solution)
+from .tabu_backend import TABU_BACKEND, TabuMatrix, TabuStructure
 from .tabu_cns import TabuCNS
 from .utils import check_end, has_common_elements, merge_np
 
 __all__ = [
+    "TABU_BACKEND",
+    "TabuMatrix",
     "TabuStructure",
     "TabuCNS",
+    "ReactiveTabu",
+    "BinState",
     "bestfit_population",
     "bw_population",
     "evaluate_solution",
     "generate_initial_population",
     "generate_initial_matrix_population",
     "repair_solution",
+    "repair_population",
     "valid_solution",
     "generate_container",
     "generate_solution",
     "fitness",
+    "fitness_population",
     "theoretical_minimum",
     "evaluate_solution",
     "find_best_solution",
@@ -50,4 +63,17 @@ __all__ = [
     "enrichment",
     "core_refurbishment",
     "local_search",
+    "local_search_population",
+    "BestKnown",
+    "convert_solutions",
+    "instance_key",
+    "load_best_known",
+    "InstanceCache",
+    "load_instances",
+    "parse_instance",
+    "read_zip_instances",
+    "Profile",
+    "profile",
+    "profiled",
+    "increment",
 ]
@@ -0,0 +1,232 @@
+"""
+Best Known Module
+
+This module gives access to the best-known solutions of the instances of
+`data/dados.zip`. The reference values come from the `Solutions.xlsx`
+spreadsheet of the zip file, which is converted once into a small CSV file with
+the best lower and upper bound of each instance, indexed by instance name.
+
+Key Features:
+- Conversion of the spreadsheet with the standard library only.
+- Lookup of the best-known number of bins by instance name, independent of the
+  `.BPP`/`.txt` extension used by the different instance sets.
+- Gap of a solution to the best-known one.
+"""
+
+import csv
+import io
+import os
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+SPREADSHEET_NS = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def __column(reference: str) -> int:
+    """Index of the column of a cell reference such as "C12"."""
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord("A") + 1
+    return index - 1
+
+
+def __read_rows(workbook: zipfile.ZipFile) -> Iterator[List[str]]:
+    """Yields the rows of every sheet of an xlsx workbook as lists of strings."""
+    shared = []
+    if "xl/sharedStrings.xml" in workbook.namelist():
+        root = ElementTree.fromstring(workbook.read("xl/sharedStrings.xml"))
+        shared = [
+            "".join(text.text or "" for text in item.iterfind(".//m:t", SPREADSHEET_NS))
+            for item in root.findall("m:si", SPREADSHEET_NS)
+        ]
+
+    sheets = sorted(
+        name
+        for name in workbook.namelist()
+        if name.startswith("xl/worksheets/sheet") and name.endswith(".xml")
+    )
+    for sheet in sheets:
+        root = ElementTree.fromstring(workbook.read(sheet))
+        for row in root.iterfind("m:sheetData/m:row", SPREADSHEET_NS):
+            values: Dict[int, str] = {}
+            for cell in row.findall("m:c", SPREADSHEET_NS):
+                value = cell.find("m:v", SPREADSHEET_NS)
+                if value is None or value.text is None:
+                    continue
+                text = value.text
+                if cell.get("t") == "s":
+                    text = shared[int(text)]
+                values[__column(cell.get("r", "A"))] = text
+            if values:
+                yield [values.get(i, "") for i in range(max(values) + 1)]
+
+
+def instance_key(name: str) -> str:
+    """
+    Key of an instance in the index: its file name without folder and extension.
+
+    Parameters
+    ----------
+    name : str
+        File name or path of the instance.
+
+    Returns
+    -------
+    str
+        The key of the instance.
+    """
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def convert_solutions(source: str, path: str) -> int:
+    """
+    Converts the `Solutions.xlsx` spreadsheet into the CSV index.
+
+    Parameters
+    ----------
+    source : str
+        Path of the spreadsheet, or of a zip file that contains it.
+    path : str
+        Path of the CSV file to write.
+
+    Returns
+    -------
+    int
+        Number of instances written.
+    """
+    with zipfile.ZipFile(source) as archive:
+        names = [name for name in archive.namelist() if name.endswith(".xlsx")]
+        data = io.BytesIO(archive.read(names[0])) if names else source
+
+    solutions: Dict[str, Tuple[int, int]] = {}
+    with zipfile.ZipFile(data) as workbook:
+        header = None
+        for row in __read_rows(workbook):
+            if row[0] == "Name":
+                header = {title: i for i, title in enumerate(row)}
+                continue
+            if header is None or not row[0]:
+                continue
+            try:
+                lower = int(float(row[header["Best LB"]]))
+                upper = int(float(row[header["Best UB"]]))
+            except (IndexError, ValueError):
+                continue
+            solutions[instance_key(row[0])] = (lower, upper)
+
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["instance", "best_lb", "best_ub"])
+        for key in sorted(solutions):
+            writer.writerow([key, *solutions[key]])
+    return len(solutions)
+
+
+class BestKnown:
+    """
+    Index of the best-known solutions by instance name.
+
+    Parameters
+    ----------
+    path : str
+        Path of the CSV index written by `convert_solutions`.
+
+    Attributes
+    ----------
+    bounds : Dict[str, Tuple[int, int]]
+        Best lower and upper bound of each instance, by instance key.
+    """
+
+    def __init__(self, path: str):
+        with open(path, newline="", encoding="utf-8") as file:
+            self.bounds: Dict[str, Tuple[int, int]] = {
+                row["instance"]: (int(row["best_lb"]), int(row["best_ub"]))
+                for row in csv.DictReader(file)
+            }
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def __contains__(self, name: str) -> bool:
+        return instance_key(name) in self.bounds
+
+    def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """
+        Best-known number of bins of an instance.
+
+        Parameters
+        ----------
+        name : str
+            File name of the instance, with or without extension.
+        default : int, optional
+            Value returned for unknown instances, by default None.
+
+        Returns
+        -------
+        Optional[int]
+            The best upper bound of the instance, or `default`.
+        """
+        bounds = self.bounds.get(instance_key(name))
+        return bounds[1] if bounds else default
+
+    def is_optimal(self, name: str) -> bool:
+        """
+        Checks if the best-known solution of an instance is proven optimal.
+
+        Parameters
+        ----------
+        name : str
+            File name of the instance, with or without extension.
+
+        Returns
+        -------
+        bool
+            True if the best lower and upper bounds are equal.
+        """
+        bounds = self.bounds.get(instance_key(name))
+        return bool(bounds) and bounds[0] == bounds[1]
+
+    def gap(self, name: str, fit: int) -> Optional[float]:
+        """
+        Relative gap of a solution to the best-known one.
+
+        Parameters
+        ----------
+        name : str
+            File name of the instance, with or without extension.
+        fit : int
+            Number of bins of the solution.
+
+        Returns
+        -------
+        Optional[float]
+            `(fit - best) / best`, or None for unknown instances.
+        """
+        best = self.get(name)
+        return None if best is None else (fit - best) / best
+
+
+def load_best_known(zip_path: str, path: Optional[str] = None) -> BestKnown:
+    """
+    Loads the best-known index, converting the spreadsheet of the zip file on
+    the first use.
+
+    Parameters
+    ----------
+    zip_path : str
+        Path of the zip file with `Solutions.xlsx`.
+    path : str, optional
+        Path of the CSV index, by default `best_known.csv` next to the zip file.
+
+    Returns
+    -------
+    BestKnown
+        The best-known solutions.
+    """
+    path = path or os.path.join(os.path.dirname(zip_path), "best_known.csv")
+    if not os.path.exists(path):
+        convert_solutions(zip_path, path)
+    return BestKnown(path)
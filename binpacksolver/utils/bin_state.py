@@ -0,0 +1,219 @@
+"""
+Bin State Module
+
+This module implements the BinState class, a mutable packing where items are
+moved in place. Each bin keeps its items in a Python list together with a
+cached load and a stable identifier, so moves and their effect on the
+objective are evaluated in O(1). Every primitive change is written to an undo
+log, which allows a rejected move to be rolled back without copying the
+solution.
+
+Key Features:
+- Cached bin loads and sum of squared loads, updated in O(1) per move.
+- Stable bin identifiers that survive the removal of other bins.
+- Undo log to roll back moves since the last commit.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class BinState:
+    """
+    Packing of items into bins that is modified in place.
+
+    Parameters
+    ----------
+    solution : List[np.ndarray]
+        Initial packing, a list of bins with the items of each bin.
+    capacity : int
+        The capacity of each bin.
+
+    Attributes
+    ----------
+    capacity : int
+        The capacity of each bin.
+    bins : List[List[int]]
+        Items of each bin.
+    loads : List[int]
+        Sum of the items of each bin.
+    ids : List[int]
+        Stable identifier of each bin.
+    position : Dict[int, int]
+        Index of each bin identifier in `bins`.
+    square_sum : int
+        Sum of the squared loads of all bins.
+    undo_log : List[Tuple]
+        Primitive changes applied since the last commit.
+    """
+
+    def __init__(self, solution: List[np.ndarray], capacity: int):
+        self.capacity: int = capacity
+        self.bins: List[List[int]] = [list(map(int, bin_)) for bin_ in solution]
+        self.loads: List[int] = [sum(bin_) for bin_ in self.bins]
+        self.ids: List[int] = list(range(len(self.bins)))
+        self.position: Dict[int, int] = {id_: id_ for id_ in self.ids}
+        self.next_id: int = len(self.bins)
+        self.square_sum: int = sum(load * load for load in self.loads)
+        self.undo_log: List[Tuple] = []
+
+    def __len__(self) -> int:
+        return len(self.bins)
+
+    def __take(self, a: int, i: int) -> int:
+        """Removes the item at position i of bin a, filling the gap with the last item."""
+        bin_ = self.bins[a]
+        item = bin_[i]
+        bin_[i] = bin_[-1]
+        bin_.pop()
+        self.__add_load(a, -item)
+        self.undo_log.append(("take", a, i, item))
+        return item
+
+    def __put(self, b: int, item: int):
+        """Appends an item to bin b."""
+        self.bins[b].append(item)
+        self.__add_load(b, item)
+        self.undo_log.append(("put", b))
+
+    def __open(self) -> int:
+        """Opens a new empty bin and returns its index."""
+        self.bins.append([])
+        self.loads.append(0)
+        self.ids.append(self.next_id)
+        self.position[self.next_id] = len(self.bins) - 1
+        self.next_id += 1
+        self.undo_log.append(("open",))
+        return len(self.bins) - 1
+
+    def __drop(self, a: int):
+        """Removes bin a if it is empty, moving the last bin into its place."""
+        if self.bins[a]:
+            return
+
+        id_ = self.ids[a]
+        self.bins[a] = self.bins[-1]
+        self.loads[a] = self.loads[-1]
+        self.ids[a] = self.ids[-1]
+        self.position[self.ids[a]] = a
+        self.bins.pop()
+        self.loads.pop()
+        self.ids.pop()
+        del self.position[id_]
+        self.undo_log.append(("drop", a, id_))
+
+    def __add_load(self, a: int, value: int):
+        """Adds value to the load of bin a, keeping the square sum up to date."""
+        load = self.loads[a]
+        self.square_sum += value * (2 * load + value)
+        self.loads[a] = load + value
+
+    def fits(self, b: int, item: int) -> bool:
+        """
+        Checks if an item fits into bin b.
+
+        Parameters
+        ----------
+        b : int
+            Index of the bin.
+        item : int
+            Size of the item.
+
+        Returns
+        -------
+        bool
+            True if the item fits, False otherwise.
+        """
+        return self.loads[b] + item <= self.capacity
+
+    def relocate(self, a: int, i: int, b: int):
+        """
+        Moves the item at position i of bin a into bin b. If b is equal to the
+        number of bins a new bin is opened. Bin a is removed if it becomes empty.
+
+        Parameters
+        ----------
+        a : int
+            Index of the source bin.
+        i : int
+            Position of the item in the source bin.
+        b : int
+            Index of the destination bin.
+        """
+        if b == len(self.bins):
+            b = self.__open()
+        self.__put(b, self.__take(a, i))
+        self.__drop(a)
+
+    def swap(self, a: int, i: int, b: int, j: int):
+        """
+        Swaps the item at position i of bin a with the item at position j of bin b.
+
+        Parameters
+        ----------
+        a : int
+            Index of the first bin.
+        i : int
+            Position of the item in the first bin.
+        b : int
+            Index of the second bin.
+        j : int
+            Position of the item in the second bin.
+        """
+        item_a = self.__take(a, i)
+        item_b = self.__take(b, j)
+        self.__put(a, item_b)
+        self.__put(b, item_a)
+
+    def commit(self):
+        """Accepts the changes applied since the last commit."""
+        self.undo_log.clear()
+
+    def rollback(self):
+        """Reverts the changes applied since the last commit."""
+        while self.undo_log:
+            entry = self.undo_log.pop()
+            if entry[0] == "take":
+                _, a, i, item = entry
+                bin_ = self.bins[a]
+                if i == len(bin_):
+                    bin_.append(item)
+                else:
+                    bin_.append(bin_[i])
+                    bin_[i] = item
+                self.__add_load(a, item)
+            elif entry[0] == "put":
+                b = entry[1]
+                self.__add_load(b, -self.bins[b].pop())
+            elif entry[0] == "open":
+                self.bins.pop()
+                self.loads.pop()
+                del self.position[self.ids.pop()]
+                self.next_id -= 1
+            else:
+                _, a, id_ = entry
+                if a < len(self.bins):
+                    self.bins.append(self.bins[a])
+                    self.loads.append(self.loads[a])
+                    self.ids.append(self.ids[a])
+                    self.position[self.ids[-1]] = len(self.bins) - 1
+                    self.bins[a] = []
+                    self.loads[a] = 0
+                    self.ids[a] = id_
+                else:
+                    self.bins.append([])
+                    self.loads.append(0)
+                    self.ids.append(id_)
+                self.position[id_] = a
+
+    def to_solution(self) -> List[np.ndarray]:
+        """
+        Converts the state back into the list of arrays used by the heuristics.
+
+        Returns
+        -------
+        List[np.ndarray]
+            A list of bins, where each bin is a numpy array of items.
+        """
+        return [np.array(bin_, dtype=int) for bin_ in self.bins]
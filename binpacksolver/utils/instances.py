@@ -0,0 +1,241 @@
+"""
+Instances Module
+
+This module reads the bin packing instances shipped in `data/dados.zip`. Every
+instance is a text file with the number of items, the capacity of the bins and
+then the weight of each item, one value per line. The instances are streamed
+straight from the zip file, without extracting it, or parsed once into a binary
+cache that is memory-mapped on load.
+
+Key Features:
+- Parsing of the `.BPP` and `.txt` instance files.
+- Lazy iteration over the instances of a zip file, filtered by group and name.
+- Binary cache with the concatenated weights of all instances in one `.npy`
+  file, plus an index with the offset and capacity of each instance.
+- Zero-copy views of the weights of each instance.
+"""
+
+import os
+import zipfile
+from fnmatch import fnmatch
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+INSTANCE_EXTENSIONS = (".bpp", ".txt")
+
+
+def parse_instance(text: str) -> Tuple[int, np.ndarray]:
+    """
+    Parses the content of an instance file.
+
+    Parameters
+    ----------
+    text : str
+        Content of the file: number of items, capacity and the item weights.
+
+    Returns
+    -------
+    Tuple[int, np.ndarray]
+        The capacity of the bins and the weights of the items.
+    """
+    values = text.split()
+    n, capacity = int(values[0]), int(values[1])
+    weights = np.array(values[2 : 2 + n], dtype=float).astype(int)
+    return capacity, weights
+
+
+def read_zip_instances(
+    path: str,
+    groups: Optional[List[str]] = None,
+    pattern: str = "*",
+) -> Iterator[Tuple[str, str, int, np.ndarray]]:
+    """
+    Iterates over the instances of a zip file without extracting it.
+
+    Instances are grouped by the folder that contains them, e.g. `bin1data` or
+    `Randomly_Generated`, and are read one at a time in the order of the zip.
+
+    Parameters
+    ----------
+    path : str
+        Path of the zip file.
+    groups : List[str], optional
+        Folders to read, by default all of them.
+    pattern : str, optional
+        Shell pattern the file names must match, by default "*".
+
+    Yields
+    ------
+    Tuple[str, str, int, np.ndarray]
+        The group, the file name, the capacity and the item weights.
+    """
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+
+            parts = info.filename.rstrip("/").split("/")
+            group = parts[-2] if len(parts) > 1 else ""
+            name = parts[-1]
+            if not name.lower().endswith(INSTANCE_EXTENSIONS):
+                continue
+            if groups and group not in groups:
+                continue
+            if not fnmatch(name, pattern):
+                continue
+
+            capacity, weights = parse_instance(archive.read(info).decode())
+            yield group, name, capacity, weights
+
+
+class InstanceCache:
+    """
+    Binary cache of the instances of a zip file.
+
+    The weights of all instances are concatenated in `<path>.npy`, which is
+    memory-mapped, and `<path>.index.npz` holds the group, name, capacity and
+    offset of each instance. The weights of an instance are a read-only view of
+    the mapped file, so loading a whole sweep costs a single mmap.
+
+    Parameters
+    ----------
+    path : str
+        Path of the cache without extension.
+
+    Attributes
+    ----------
+    groups : np.ndarray
+        Folder of each instance.
+    names : np.ndarray
+        File name of each instance.
+    capacities : np.ndarray
+        Capacity of the bins of each instance.
+    offsets : np.ndarray
+        Start of each instance in `weights`, followed by the total length.
+    weights : np.ndarray
+        Concatenated item weights of all instances.
+    source_mtime : float
+        Modification time of the zip file the cache was built from.
+    """
+
+    def __init__(self, path: str):
+        with np.load(f"{path}.index.npz") as index:
+            self.groups: np.ndarray = np.array(index["groups"])
+            self.names: np.ndarray = np.array(index["names"])
+            self.capacities: np.ndarray = np.array(index["capacities"])
+            self.offsets: np.ndarray = np.array(index["offsets"])
+            self.source_mtime: float = float(index["source_mtime"])
+        self.weights: np.ndarray = np.asarray(np.load(f"{path}.npy", mmap_mode="r"))
+        self.__position = {name: i for i, name in enumerate(self.names.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__position
+
+    def __getitem__(self, key: Union[int, str]) -> Tuple[int, np.ndarray]:
+        """
+        Returns the capacity and a view of the weights of an instance.
+
+        Parameters
+        ----------
+        key : Union[int, str]
+            Position or file name of the instance.
+
+        Returns
+        -------
+        Tuple[int, np.ndarray]
+            The capacity of the bins and the read-only weights of the items.
+        """
+        i = self.__position[key] if isinstance(key, str) else key
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return int(self.capacities[i]), self.weights[start:end]
+
+    def select(
+        self, groups: Optional[List[str]] = None, pattern: str = "*"
+    ) -> Iterator[Tuple[str, str, int, np.ndarray]]:
+        """
+        Iterates over the cached instances, like `read_zip_instances`.
+
+        Parameters
+        ----------
+        groups : List[str], optional
+            Folders to read, by default all of them.
+        pattern : str, optional
+            Shell pattern the file names must match, by default "*".
+
+        Yields
+        ------
+        Tuple[str, str, int, np.ndarray]
+            The group, the file name, the capacity and a view of the weights.
+        """
+        for i, (group, name) in enumerate(zip(self.groups, self.names)):
+            if (not groups or group in groups) and fnmatch(name, pattern):
+                yield str(group), str(name), *self[i]
+
+    @staticmethod
+    def build(zip_path: str, path: str) -> "InstanceCache":
+        """
+        Parses every instance of a zip file once and writes the cache.
+
+        Parameters
+        ----------
+        zip_path : str
+            Path of the zip file with the instances.
+        path : str
+            Path of the cache without extension.
+
+        Returns
+        -------
+        InstanceCache
+            The cache that was written.
+        """
+        groups, names, capacities, weights = [], [], [], []
+        for group, name, capacity, items in read_zip_instances(zip_path):
+            groups.append(group)
+            names.append(name)
+            capacities.append(capacity)
+            weights.append(items)
+
+        lengths = [len(items) for items in weights]
+        np.save(
+            f"{path}.npy",
+            np.concatenate(weights).astype(np.int64) if weights else np.array([]),
+        )
+        np.savez(
+            f"{path}.index.npz",
+            groups=np.array(groups, dtype=str),
+            names=np.array(names, dtype=str),
+            capacities=np.array(capacities, dtype=np.int64),
+            offsets=np.r_[0, np.cumsum(lengths)].astype(np.int64),
+            source_mtime=os.path.getmtime(zip_path),
+        )
+        return InstanceCache(path)
+
+
+def load_instances(zip_path: str, path: Optional[str] = None) -> InstanceCache:
+    """
+    Loads the binary cache of a zip file, building it when it is missing or
+    was built from another version of the zip file.
+
+    Parameters
+    ----------
+    zip_path : str
+        Path of the zip file with the instances.
+    path : str, optional
+        Path of the cache without extension, by default the path of the zip
+        file without its extension.
+
+    Returns
+    -------
+    InstanceCache
+        The memory-mapped instances.
+    """
+    path = path or os.path.splitext(zip_path)[0]
+    if os.path.exists(f"{path}.npy") and os.path.exists(f"{path}.index.npz"):
+        cache = InstanceCache(path)
+        if cache.source_mtime == os.path.getmtime(zip_path):
+            return cache
+    return InstanceCache.build(zip_path, path)
@@ -7,15 +7,23 @@ efficient insertion and lookup of elements while maintaining a maximum
 capacity. When the maximum size is exceeded, the oldest elements are 
 removed to make room for new entries.
 
+TabuStructure is the pure Python counterpart of the `tabu_structure` Rust
+extension. The module also implements the TabuMatrix class, a dense numpy tabu
+memory that stores for each integer attribute the iteration until which it is
+tabu.
+
 Key Features:
 - Efficiently checks for the existence of elements in the tabu list.
 - Supports the insertion of new elements, ensuring uniqueness.
 - Automatically manages the maximum size of the tabu list.
+- O(1) array-indexed tabu checks, also for whole arrays of attributes.
 """
 
 from collections import deque
 from typing import Set, Tuple
 
+import numpy as np
+
 
 class TabuStructure:
     """Tabu structure to store a set of forbidden moves, with limited capacity."""
@@ -93,3 +101,138 @@ class TabuStructure:
             self.tabu.discard(element)
 
         return True
+
+
+class TabuMatrix:
+    """Dense tabu memory with the iteration until which each attribute is tabu."""
+
+    def __init__(self, size: int):
+        """
+        Initializes the tabu memory with every attribute free.
+
+        Parameters
+        ----------
+        size : int
+            Number of attributes, which are the integers in [0, size).
+        """
+        self.until: np.ndarray = np.zeros(size, dtype=np.int64)
+        self.iteration: int = 0
+
+    def __len__(self) -> int:
+        return len(self.until)
+
+    def __slot(self, attribute: int) -> int:
+        """
+        Checks that a single attribute is an index of the dense array.
+
+        Parameters
+        ----------
+        attribute : int
+            Attribute to be checked.
+
+        Returns
+        -------
+        int
+            The attribute.
+
+        Raises
+        ------
+        IndexError
+            If the attribute is out of range.
+        """
+        if not 0 <= attribute < len(self.until):
+            raise IndexError("attribute out of range")
+        return attribute
+
+    def __slots(self, attributes: np.ndarray) -> np.ndarray:
+        """
+        Converts attributes into indexes of the dense array.
+
+        Parameters
+        ----------
+        attributes : np.ndarray
+            Attributes to be converted.
+
+        Returns
+        -------
+        np.ndarray
+            The attributes as an int64 array.
+
+        Raises
+        ------
+        IndexError
+            If an attribute is out of range.
+        """
+        attributes = np.asarray(attributes, dtype=np.int64)
+        if attributes.size and (
+            attributes.min() < 0 or attributes.max() >= len(self.until)
+        ):
+            raise IndexError("attribute out of range")
+        return attributes
+
+    def find(self, attribute: int) -> bool:
+        """
+        Checks if the given attribute is tabu at the current iteration.
+
+        Parameters
+        ----------
+        attribute : int
+            Attribute to be checked.
+
+        Returns
+        -------
+        bool
+            True if the attribute is tabu, False otherwise.
+        """
+        return bool(self.until[self.__slot(attribute)] > self.iteration)
+
+    def insert(self, attribute: int, tenure: int):
+        """
+        Makes an attribute tabu for the next `tenure` iterations.
+
+        Parameters
+        ----------
+        attribute : int
+            Attribute to be made tabu.
+        tenure : int
+            Number of iterations the attribute stays tabu.
+        """
+        self.until[self.__slot(attribute)] = self.iteration + tenure
+
+    def find_many(self, attributes: np.ndarray) -> np.ndarray:
+        """
+        Checks a whole array of attributes in a single call.
+
+        Parameters
+        ----------
+        attributes : np.ndarray
+            One dimensional array of attributes.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with True where the attribute is tabu.
+        """
+        return self.until[self.__slots(attributes)] > self.iteration
+
+    def insert_many(self, attributes: np.ndarray, tenure: int):
+        """
+        Makes a whole array of attributes tabu for the next `tenure` iterations.
+
+        Parameters
+        ----------
+        attributes : np.ndarray
+            One dimensional array of attributes.
+        tenure : int
+            Number of iterations the attributes stay tabu.
+        """
+        self.until[self.__slots(attributes)] = self.iteration + tenure
+
+    def step(self):
+        """Advances the current iteration, releasing the attributes whose tenure ended."""
+        self.iteration += 1
+
+    def clear(self):
+        """Releases every attribute."""
+        self.until.fill(0)
+        self.iteration = 0
@@ -2,10 +2,11 @@
 Module for operations in the Bin Packing Problem (BPP).
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 
+from .profiling import profiled
 from .utils import merge_np
 
 
@@ -101,16 +102,21 @@ def container_change(
     return solution
 
 
+@profiled("move")
 def container_insert(
     indexs: Tuple[int, int],
     containers: List[int],
     solution: List[np.ndarray],
     best_fit: int,
     c: int,
+    ids: Optional[List[int]] = None,
 ) -> Tuple[List[np.ndarray], int, List[int]]:
     """
     Inserts items between two containers using the best fit strategy.
 
+    When container b is emptied it is replaced by the last container, so
+    only one container changes position.
+
     Parameters
     ----------
     indexs : Tuple[int, int]
@@ -123,6 +129,8 @@ def container_insert(
         Current best-fit solution count.
     c : int
         Maximum capacity for containers.
+    ids : List[int], optional
+        Stable identifiers of the containers, kept aligned with `solution`.
 
     Returns
     -------
@@ -133,8 +141,13 @@ def container_insert(
     if containers[a] >= c - containers[b]:
         containers[a] -= c - containers[b]
         solution[a] = merge_np(solution[a], solution[b])
-        del solution[b]
-        del containers[b]
+        solution[b] = solution[-1]
+        containers[b] = containers[-1]
+        solution.pop()
+        containers.pop()
+        if ids is not None:
+            ids[b] = ids[-1]
+            ids.pop()
         return solution, best_fit - 1, containers
 
     solution = container_concatenate(a, b, containers, solution)
@@ -0,0 +1,206 @@
+"""
+Profiling Module
+
+This module implements lightweight instrumentation of the hot paths of the
+heuristics. The kernels of `binpacksolver.utils` are decorated with the phase
+they belong to (repair, fitness, decode, move or selection) and the main loop of
+each heuristic counts its iterations. Nothing is recorded unless a `Profile` is
+active in the current thread, so the cost of a disabled probe is a single
+thread-local attribute read.
+
+Key Features:
+- Call counters and monotonic timers per phase.
+- Exclusive timing: time spent in a nested phase, such as the repair done by a
+  local search, is only attributed to the innermost phase.
+- One active profile per thread, so heuristics run in parallel threads are
+  measured separately.
+- Summary with evaluations/s, repairs/s, iterations and the share of time of
+  each phase.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+PHASES = ("repair", "fitness", "decode", "move", "selection")
+
+
+class Profile:
+    """
+    Counters and timers of the phases of a heuristic run.
+
+    Attributes
+    ----------
+    counts : Dict[str, int]
+        Number of items processed by each phase, e.g. repaired rows, and of each
+        counted event, e.g. iterations.
+    times : Dict[str, float]
+        Exclusive time spent in each phase, in seconds.
+    elapsed : float
+        Total time of the profiled runs, in seconds.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.times: Dict[str, float] = {}
+        self.elapsed: float = 0.0
+        self.__stack: List[str] = []
+        self.__mark: float = 0.0
+
+    def enter(self, phase: str):
+        """
+        Starts timing a phase, pausing the phase it is nested in.
+
+        Parameters
+        ----------
+        phase : str
+            Name of the phase.
+        """
+        now = time.perf_counter()
+        if self.__stack:
+            outer = self.__stack[-1]
+            self.times[outer] = self.times.get(outer, 0.0) + now - self.__mark
+        self.__stack.append(phase)
+        self.__mark = now
+
+    def leave(self, size: int = 1):
+        """
+        Stops timing the current phase and counts the items it processed.
+
+        Parameters
+        ----------
+        size : int, optional
+            Number of items processed by the call, by default 1.
+        """
+        now = time.perf_counter()
+        phase = self.__stack.pop()
+        self.times[phase] = self.times.get(phase, 0.0) + now - self.__mark
+        self.counts[phase] = self.counts.get(phase, 0) + size
+        self.__mark = now
+
+    def merge(self, other: "Profile"):
+        """
+        Adds the counters and timers of another profile to this one.
+
+        Parameters
+        ----------
+        other : Profile
+            The profile to add.
+        """
+        for name, value in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+        for name, value in other.times.items():
+            self.times[name] = self.times.get(name, 0.0) + value
+        self.elapsed += other.elapsed
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the profile.
+
+        Returns
+        -------
+        Dict[str, float]
+            Iterations completed, evaluations and repairs with their rates, total
+            time and the percentage of the time spent in each phase.
+        """
+        elapsed = self.elapsed or float("inf")
+        evaluations = self.counts.get("fitness", 0)
+        repairs = self.counts.get("repair", 0)
+        stats = {
+            "iterations": self.counts.get("iterations", 0),
+            "evaluations": evaluations,
+            "evaluations/s": evaluations / elapsed,
+            "repairs": repairs,
+            "repairs/s": repairs / elapsed,
+            "time (s)": self.elapsed,
+        }
+        for phase in PHASES:
+            stats[f"% time in {phase}"] = 100 * self.times.get(phase, 0.0) / elapsed
+        return stats
+
+
+class ActiveProfile(threading.local):  # pylint: disable=R0903
+    """Profile active in each thread, None by default in every thread."""
+
+    profile: Optional[Profile] = None
+
+
+__ACTIVE = ActiveProfile()
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """
+    Activates a new profile in the current thread for the duration of the block.
+
+    Yields
+    ------
+    Profile
+        The active profile, whose `elapsed` time is set when the block ends.
+    """
+    previous = __ACTIVE.profile
+    current = Profile()
+    __ACTIVE.profile = current
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.elapsed = time.perf_counter() - start
+        __ACTIVE.profile = previous
+
+
+def profiled(phase: str, batch: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Decorates a function so its calls are timed and counted as a phase of the
+    active profile.
+
+    Parameters
+    ----------
+    phase : str
+        Name of the phase, see `PHASES`.
+    batch : bool, optional
+        If set to True, each call counts the rows of its first argument, as in
+        `repair_population`, instead of one, by default False.
+
+    Returns
+    -------
+    Callable[[Callable], Callable]
+        The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = __ACTIVE.profile
+            if current is None:
+                return func(*args, **kwargs)
+
+            current.enter(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current.leave(np.atleast_2d(args[0]).shape[0] if batch else 1)
+
+        return wrapper
+
+    return decorator
+
+
+def increment(name: str, value: int = 1):
+    """
+    Increments a counter of the active profile, if any.
+
+    Parameters
+    ----------
+    name : str
+        Name of the counter, e.g. "iterations".
+    value : int, optional
+        Amount to add, by default 1.
+    """
+    current = __ACTIVE.profile
+    if current is not None:
+        current.counts[name] = current.counts.get(name, 0) + value
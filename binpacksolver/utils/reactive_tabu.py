@@ -0,0 +1,250 @@
+"""
+Reactive Tabu Module
+
+This module implements the ReactiveTabu class, a tabu memory whose tenure adapts
+to the search. Moves are described by integer attributes that stay tabu until
+an expiry iteration, and visited solutions are remembered by their hash. When a
+solution is visited again the search is cycling and the tenure grows; when the
+search improves the tenure shrinks back.
+
+Key Features:
+- Tabu attributes stored with their expiry iteration, so no decrement sweep.
+  A small attribute space is kept in a dense `TabuMatrix`, which checks whole
+  arrays of moves in one call, and a large one in a map of the live entries.
+- Cycle detection with hashes of the visited solutions.
+- Long-term move frequencies with a diversification penalty.
+- Order independent hashes of bins and packings.
+"""
+
+from typing import Dict, Hashable, List, Optional, Union
+
+import numpy as np
+
+from .tabu_backend import TabuMatrix
+
+
+class ReactiveTabu:
+    """
+    Tabu memory with reactive tenure and long-term frequency memory.
+
+    Parameters
+    ----------
+    tenure : float
+        Initial number of iterations a move stays tabu.
+    min_tenure : float, optional
+        Smallest tenure, by default 1.
+    max_tenure : float, optional
+        Largest tenure, by default no limit.
+    increase : float, optional
+        Factor applied to the tenure when a cycle is detected, by default 1.2.
+    decrease : float, optional
+        Factor applied to the tenure on improvements, by default 0.9.
+    penalty_weight : float, optional
+        Weight of the diversification penalty, by default 1.
+    size : int, optional
+        Number of move attributes, which are then the integers in [0, size)
+        and are kept in a dense `TabuMatrix`. By default the attributes are
+        any hashable values kept in a map of the live entries, whose memory
+        does not grow with the attribute space.
+
+    Attributes
+    ----------
+    tenure : float
+        Current number of iterations a move stays tabu.
+    iteration : int
+        Current iteration of the search.
+    memory : Optional[TabuMatrix]
+        Iteration at which each attribute stops being tabu, if `size` is given.
+    until : Dict[Hashable, int]
+        Iteration at which each live attribute stops being tabu, if `size` is
+        not given.
+    frequency : Union[np.ndarray, Dict[Hashable, int]]
+        Number of times each attribute was made tabu.
+    visited : Dict[int, int]
+        Last iteration at which each solution hash was visited.
+    cycles : int
+        Number of revisited solutions detected.
+    """
+
+    # pylint: disable=R0913,R0902
+    def __init__(
+        self,
+        tenure: float,
+        min_tenure: float = 1,
+        max_tenure: float = float("inf"),
+        increase: float = 1.2,
+        decrease: float = 0.9,
+        penalty_weight: float = 1,
+        size: Optional[int] = None,
+    ):
+        self.min_tenure: float = min_tenure
+        self.max_tenure: float = max_tenure
+        self.tenure: float = min(max(tenure, min_tenure), max_tenure)
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.penalty_weight: float = penalty_weight
+        self.iteration: int = 0
+        self.memory: Optional[TabuMatrix] = None if size is None else TabuMatrix(size)
+        self.until: Dict[Hashable, int] = {}
+        self.frequency: Union[np.ndarray, Dict[Hashable, int]] = (
+            {} if size is None else np.zeros(size, dtype=np.int64)
+        )
+        self.visited: Dict[int, int] = {}
+        self.cycles: int = 0
+
+    def is_tabu(self, attribute: Hashable) -> bool:
+        """
+        Checks if a move attribute is tabu at the current iteration.
+
+        Parameters
+        ----------
+        attribute : Hashable
+            Attribute of the move.
+
+        Returns
+        -------
+        bool
+            True if the attribute is tabu, False otherwise.
+        """
+        if self.memory is None:
+            return self.until.get(attribute, -1) > self.iteration
+        return self.memory.find(int(attribute))
+
+    def is_tabu_many(self, attributes: np.ndarray) -> np.ndarray:
+        """
+        Checks a whole array of move attributes in a single call.
+
+        Parameters
+        ----------
+        attributes : np.ndarray
+            One dimensional array of attributes.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with True where the attribute is tabu.
+        """
+        if self.memory is None:
+            return np.array([self.is_tabu(key) for key in attributes], dtype=bool)
+        return self.memory.find_many(np.asarray(attributes, dtype=np.int64))
+
+    def make_tabu(self, attribute: Hashable):
+        """
+        Makes a move attribute tabu for the next `tenure` iterations and counts
+        it in the long-term frequency memory.
+
+        Parameters
+        ----------
+        attribute : Hashable
+            Attribute of the move.
+        """
+        # The move is made before `step`, so the tenure counts from the next one
+        tenure = round(self.tenure) + 1
+        if self.memory is None:
+            self.until[attribute] = self.iteration + tenure
+            self.frequency[attribute] = self.frequency.get(attribute, 0) + 1
+        else:
+            self.memory.insert(int(attribute), tenure)
+            self.frequency[attribute] += 1
+
+    def penalty(
+        self, attribute: Union[Hashable, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """
+        Diversification penalty of a move attribute, proportional to how often
+        it was used during the search.
+
+        Parameters
+        ----------
+        attribute : Union[Hashable, np.ndarray]
+            Attribute of the move, or an array of attributes if `size` is given.
+
+        Returns
+        -------
+        Union[float, np.ndarray]
+            The penalty of the attribute, or of each attribute.
+        """
+        frequency = (
+            self.frequency.get(attribute, 0)
+            if self.memory is None
+            else self.frequency[attribute]
+        )
+        return self.penalty_weight * frequency / max(self.iteration, 1)
+
+    def visit(self, solution_hash: int) -> bool:
+        """
+        Registers a visited solution. If it was visited before, the search is
+        cycling and the tenure grows.
+
+        Parameters
+        ----------
+        solution_hash : int
+            Hash of the solution, see `packing_hash`.
+
+        Returns
+        -------
+        bool
+            True if the solution was already visited, False otherwise.
+        """
+        repeated = solution_hash in self.visited
+        self.visited[solution_hash] = self.iteration
+        if repeated:
+            self.cycles += 1
+            self.tenure = min(self.tenure * self.increase + 1, self.max_tenure)
+        return repeated
+
+    def improve(self):
+        """
+        Registers an improvement of the best solution: the tenure shrinks and
+        the visited solutions, which can no longer be reached, are forgotten.
+        """
+        self.tenure = max(self.tenure * self.decrease, self.min_tenure)
+        self.visited.clear()
+
+    def step(self):
+        """Advances the current iteration, dropping expired attributes when needed."""
+        self.iteration += 1
+        if self.memory is not None:
+            self.memory.step()
+        elif len(self.until) > 4 * self.tenure + 64:
+            self.until = {
+                attribute: expiry
+                for attribute, expiry in self.until.items()
+                if expiry > self.iteration
+            }
+
+    @staticmethod
+    def bin_hash(bin_: np.ndarray) -> int:
+        """
+        Hash of a bin, independent of the order of its items.
+
+        Parameters
+        ----------
+        bin_ : np.ndarray
+            Items of the bin.
+
+        Returns
+        -------
+        int
+            The hash of the bin.
+        """
+        return hash(tuple(sorted(bin_.tolist())))
+
+    @staticmethod
+    def packing_hash(solution: List[np.ndarray]) -> int:
+        """
+        Hash of a packing, independent of the order of its bins and items. It is
+        the sum of the bin hashes, so it can also be updated incrementally when
+        only a few bins change.
+
+        Parameters
+        ----------
+        solution : List[np.ndarray]
+            Bins of the packing.
+
+        Returns
+        -------
+        int
+            The hash of the packing.
+        """
+        return sum(ReactiveTabu.bin_hash(bin_) for bin_ in solution)
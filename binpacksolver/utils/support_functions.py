@@ -7,12 +7,14 @@ fitness based on a given array of values.
 
 import math
 import random
+from bisect import bisect_left, insort
 from typing import Any, List, Tuple, Union
 
 import numpy as np
 
 from .online_algorithms import (best_fit_decreasing, first_fit,
                                 first_fit_decreasing)
+from .profiling import profiled
 
 
 def generate_container(solution: List[np.ndarray], c: int) -> List[int]:
@@ -39,6 +41,7 @@ def generate_container(solution: List[np.ndarray], c: int) -> List[int]:
     return containers
 
 
+@profiled("decode")
 def generate_solution(
     solution: np.ndarray, c: int, **kwargs
 ) -> Tuple[List[np.ndarray], List[int]]:
@@ -119,6 +122,8 @@ def generate_initial_population(
     valid = kwargs.get("VALID", False)
     pop_bins = [None] * population
     pop_containers = [None] * population
+    if valid:
+        solution = solution.copy()
 
     for i in range(population):
         if valid:
@@ -165,6 +170,7 @@ def generate_initial_matrix_population(
     return np.hstack((pop_bins, fitness_values[:, np.newaxis]))
 
 
+@profiled("fitness")
 def fitness(solution: Union[List[np.ndarray], np.ndarray], c: int = -1) -> int:
     """
     Calculates the fitness of the given solution.
@@ -225,6 +231,7 @@ def theoretical_minimum(solution: np.ndarray, c: int) -> int:
     return math.ceil(solution.sum() / c)
 
 
+@profiled("selection")
 def tournament_roulette(
     population: Union[List[int], np.ndarray], gama: float = 1.8, tour_size: int = 3
 ) -> int:
@@ -261,6 +268,7 @@ def tournament_roulette(
     return tour_idxs[tournament.index(winner_value)]
 
 
+@profiled("selection")
 def find_best_solution(solutions):
     """
     Updates the best solution found in the current solutions.
@@ -275,8 +283,7 @@ def find_best_solution(solutions):
     list
         The best solution found.
     """
-    solutions = sorted(solutions, key=fitness, reverse=True)
-    return solutions[0]
+    return min(solutions, key=fitness)
 
 
 def evaluate_solution(containers: List[int]) -> bool:
@@ -438,6 +445,7 @@ def tent_chaos(items: np.ndarray, c: int) -> List[np.ndarray]:
     return valid_solution(items[indices], c)
 
 
+@profiled("decode")
 def valid_solution(solution: np.ndarray, c: int) -> List[np.ndarray]:
     """
     Validates a bin packing solution by organizing items into bins without
@@ -473,6 +481,7 @@ def valid_solution(solution: np.ndarray, c: int) -> List[np.ndarray]:
     return remaining_items
 
 
+@profiled("repair")
 def repair_solution(
     solution: np.ndarray, new_solution: np.ndarray, c: int
 ) -> np.ndarray:
@@ -523,6 +532,189 @@ def repair_solution(
     return np.array(solution)
 
 
+def __next_fit_starts(cum_sum: np.ndarray, c: int) -> np.ndarray:
+    """
+    Finds the index where each bin starts when a row is packed with next fit.
+
+    Parameters
+    ----------
+    cum_sum : np.ndarray
+        Cumulative sum of the items of the row.
+    c : int
+        Capacity of each bin.
+
+    Returns
+    -------
+    np.ndarray
+        Start index of every bin, in packing order.
+    """
+    starts = [0]
+    base = 0
+    pos = 0
+    while True:
+        pos = max(int(np.searchsorted(cum_sum, base + c, side="right")), pos + 1)
+        if pos >= len(cum_sum):
+            return np.array(starts, dtype=int)
+        starts.append(pos)
+        base = cum_sum[pos - 1]
+
+
+def __pack_row(kept: np.ndarray, leftovers: np.ndarray, c: int) -> np.ndarray:
+    """
+    Packs the kept items with next fit and then inserts the leftovers with best
+    fit decreasing, the same packing used by `repair_solution`.
+
+    Parameters
+    ----------
+    kept : np.ndarray
+        Items kept from the candidate solution, in their original order.
+    leftovers : np.ndarray
+        Items missing from the candidate solution, sorted in ascending order.
+    c : int
+        Capacity of each bin.
+
+    Returns
+    -------
+    np.ndarray
+        The repaired row, bin after bin.
+    """
+    starts = __next_fit_starts(np.cumsum(kept), c)
+    kept_bins = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(kept)]))
+    loads = np.add.reduceat(kept, starts)
+
+    free = sorted(zip((c - loads).tolist(), range(len(starts))))
+    items = leftovers[::-1]
+    item_bins = np.empty(len(items), dtype=int)
+    num_bins = len(starts)
+
+    for k, item in enumerate(items.tolist()):
+        idx = bisect_left(free, (item, -1))
+        if idx < len(free):
+            space, bin_id = free.pop(idx)
+        else:
+            space, bin_id = c, num_bins
+            num_bins += 1
+        insort(free, (space - item, bin_id))
+        item_bins[k] = bin_id
+
+    order = np.lexsort(
+        (
+            np.arange(len(kept) + len(items)),
+            np.r_[np.zeros(len(kept), dtype=int), np.ones(len(items), dtype=int)],
+            np.r_[kept_bins, item_bins],
+        )
+    )
+    return np.concatenate((kept, items))[order]
+
+
+@profiled("repair", batch=True)
+def repair_population(
+    population: np.ndarray, new_population: np.ndarray, c: int
+) -> np.ndarray:
+    """
+    Repairs a whole population at once, row by row equivalent to
+    `repair_solution`.
+
+    Items of each candidate row are kept in order while they are still
+    available in the multiset of the matching original row, and the missing
+    items are inserted with best fit decreasing. Matching is done for all rows
+    with a single sort instead of a Python loop per item.
+
+    Parameters
+    ----------
+    population : np.ndarray
+        2D matrix with the original (valid) rows, without the fitness column.
+    new_population : np.ndarray
+        2D matrix with the candidate rows, same shape as `population`.
+    c : int
+        Capacity of each bin.
+
+    Returns
+    -------
+    np.ndarray
+        2D integer matrix with the repaired rows.
+    """
+    population = np.atleast_2d(population)
+    new_population = np.atleast_2d(new_population)
+    rows, n = population.shape
+    repaired = np.empty((rows, n), dtype=int)
+    if not n:
+        return repaired
+
+    span = int(population.max()) + 1
+    row_offsets = np.arange(rows, dtype=np.int64)[:, np.newaxis] * span
+    keys, ref_counts = np.unique(
+        population.astype(np.int64) + row_offsets, return_counts=True
+    )
+
+    candidates = np.clip(np.nan_to_num(new_population), -1, span)
+    usable = (
+        (candidates == np.round(candidates)) & (candidates >= 0) & (candidates < span)
+    )
+    new_keys = np.where(usable, candidates.astype(np.int64) + row_offsets, -1).ravel()
+
+    slots = np.minimum(np.searchsorted(keys, new_keys), len(keys) - 1)
+    order = np.argsort(new_keys, kind="stable")
+    sorted_keys = new_keys[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.repeat(
+        group_start, np.diff(np.r_[group_start, len(order)])
+    )
+
+    keep = (keys[slots] == new_keys) & (ranks < ref_counts[slots])
+    leftovers = np.repeat(
+        keys, ref_counts - np.bincount(slots[keep], minlength=len(keys))
+    )
+    bounds = np.searchsorted(leftovers // span, np.arange(rows + 1))
+    leftovers = (leftovers % span).astype(int)
+    keep = keep.reshape(rows, n)
+
+    for i in range(rows):
+        kept = candidates[i, keep[i]].astype(int)
+        if not kept.size:
+            repaired[i] = np.random.permutation(population[i])
+        else:
+            repaired[i] = __pack_row(kept, leftovers[bounds[i] : bounds[i + 1]], c)
+
+    return repaired
+
+
+@profiled("fitness", batch=True)
+def fitness_population(population: np.ndarray, c: int) -> np.ndarray:
+    """
+    Calculates the fitness of every row of a population matrix in one call.
+
+    Equivalent to calling `fitness(row, c)` for each row, but the matrix is
+    converted to Python integers once, which avoids a NumPy scalar per item.
+
+    Parameters
+    ----------
+    population : np.ndarray
+        2D matrix of rows of items, without the fitness column.
+    c : int
+        Capacity of each bin.
+
+    Returns
+    -------
+    np.ndarray
+        Integer array with the number of bins required by each row.
+    """
+    counts = []
+    for row in np.atleast_2d(population).tolist():
+        cum_sum = 0
+        count = 0
+        for item in row:
+            if cum_sum + item > c:
+                count += 1
+                cum_sum = item
+            else:
+                cum_sum += item
+        counts.append(count + 1 if cum_sum else 0)
+    return np.array(counts, dtype=int)
+
+
+@profiled("move")
 def local_search(
     current_solution: np.ndarray, c: int, min_value: int, max_value: int
 ) -> np.ndarray:
@@ -555,3 +747,42 @@ def local_search(
     )
     perturbed_solution[index_to_modify] = np.clip(new_value, min_value, max_value)
     return repair_solution(current_solution, perturbed_solution, c)
+
+
+@profiled("move", batch=True)
+def local_search_population(
+    population: np.ndarray, c: int, min_value: int, max_value: int
+) -> np.ndarray:
+    """
+    Executes `local_search` on every row of a population, perturbing one random
+    dimension per row and repairing all rows with a single batched call.
+
+    Parameters
+    ----------
+    population : np.ndarray
+        2D matrix of solutions to be perturbed, without the fitness column.
+    c : int
+        Maximum container capacity.
+    min_value : int
+        Minimum allowable value for any dimension of the solutions.
+    max_value : int
+        Maximum allowable value for any dimension of the solutions.
+
+    Returns
+    -------
+    np.ndarray
+        2D matrix with the perturbed solutions after the local search.
+    """
+    # Same draws, in the same order, as `local_search` for a single row
+    rows = np.arange(population.shape[0])
+    index_to_modify = np.random.randint(population.shape[1], size=rows.size)
+    random_factor = np.random.uniform(-1, 1, rows.size)
+    comparison_index = np.random.randint(population.shape[1], size=rows.size)
+
+    current = population[rows, index_to_modify]
+    new_values = current + random_factor * (
+        current - population[rows, comparison_index]
+    )
+    perturbed = population.copy()
+    perturbed[rows, index_to_modify] = np.clip(new_values, min_value, max_value)
+    return repair_population(population, perturbed, c)
@@ -0,0 +1,28 @@
+"""
+Tabu Backend Module
+
+This module selects the implementation of the tabu structures. The native
+`tabu_structure` extension (built from the Rust crate in `rust/`) is used when
+it can be imported, otherwise the pure Python classes of `old_tabu_structure`
+are used, so the package also works on Python versions without a wheel.
+
+The extension only provides `TabuStructure`, so `TabuMatrix` always comes from
+`old_tabu_structure`. `TABU_BACKEND` tells which backend is active for each
+class, either "rust" or "python".
+"""
+
+from typing import Dict
+
+try:
+    from tabu_structure import TabuStructure
+except ImportError:
+    from .old_tabu_structure import TabuStructure
+
+from .old_tabu_structure import TabuMatrix
+
+TABU_BACKEND: Dict[str, str] = {
+    cls.__name__: "python" if cls.__module__.startswith(__package__) else "rust"
+    for cls in (TabuStructure, TabuMatrix)
+}
+
+__all__ = ["TABU_BACKEND", "TabuMatrix", "TabuStructure"]
@@ -3,7 +3,6 @@ Implements Tabu Search for solving the Bin Packing Problem using a
 Customized Neighborhood Search (CNS) strategy.
 """
 
-import math
 import time
 
 import numpy as np
@@ -14,6 +13,11 @@ class TabuCNS:
     Implements a Tabu Search algorithm to solve the bin packing problem using a
     customized neighborhood search (CNS) strategy.
 
+    Every item gets an ID and every bin keeps its position as a stable ID, since
+    moves only swap a packed item with an unplaced one. Packed items are stored
+    in a flat bin-major array next to the bin of each slot, so a move is an O(1)
+    swap and the load of each bin is kept up to date instead of being summed.
+
     Parameters
     ----------
     init_solution : list of np.ndarray
@@ -40,24 +44,54 @@ class TabuCNS:
     time_limit : float
         The time limit for the search process.
     tabu_list : dict
-        A dictionary representing the tabu list that keeps track of forbidden moves.
+        Iteration until which each (item id, bin id) move is forbidden.
+    frequency : dict
+        Number of times each (item id, bin id) move was made tabu.
     max_iteration : int
         The maximum number of iterations for the search process.
+    iteration : int
+        The current iteration of the search process.
+    sizes : np.ndarray
+        Size of each item, indexed by item id.
+    packed : np.ndarray
+        Item id in each slot of the packed bins, in bin-major order.
+    owner : np.ndarray
+        Bin id of each slot of the packed bins.
+    unplaced : np.ndarray
+        Ids of the unplaced items.
+    loads : np.ndarray
+        Load of each bin, indexed by bin id.
     """
 
-    # pylint: disable=R0913
+    # pylint: disable=R0913,R0902
     def __init__(
         self, init_solution, capacity, unplaced_items, max_iteration=100, time_limit=1
     ):
-        self.best_solution = init_solution
-        self.current_solution = init_solution
+        self.best_solution = [np.array(bin_) for bin_ in init_solution]
+        self.current_solution = [bin_.copy() for bin_ in self.best_solution]
         self.capacity = capacity
-        self.unplaced_items = np.array(unplaced_items)
+        self.unplaced_items = np.array(unplaced_items, dtype=int).ravel()
         self.time_limit = time_limit
         self.tabu_list = {}
+        self.frequency = {}
         self.max_iteration = max_iteration
+        self.iteration = 0
+
+        lengths = [len(bin_) for bin_ in self.current_solution]
+        packed_sizes = (
+            np.concatenate(self.current_solution).astype(int)
+            if self.current_solution
+            else np.array([], dtype=int)
+        )
+        self.sizes = np.concatenate((packed_sizes, self.unplaced_items))
+        self.packed = np.arange(len(packed_sizes))
+        self.owner = np.repeat(np.arange(len(lengths)), lengths)
+        self.unplaced = np.arange(len(packed_sizes), len(self.sizes))
+        self.loads = np.bincount(
+            self.owner, weights=packed_sizes, minlength=len(lengths)
+        ).astype(int)
+        self.__bounds = np.cumsum(lengths)[:-1]
 
-    # pylint: disable=R1702
     def run(self):
         """
         Executes the Tabu Search algorithm to find an optimized bin packing solution.
@@ -67,70 +101,89 @@ class TabuCNS:
         list of np.ndarray
             The best solution found where items are packed into bins.
         """
-        iteration = 0
+        self.iteration = 0
         start_time = time.time()
+        best_weight = self.evaluate(self.current_solution)
+        best_state = (self.packed.copy(), self.unplaced.copy())
 
         while (
-            iteration < self.max_iteration
+            self.iteration < self.max_iteration
             and (time.time() - start_time) < self.time_limit
         ):
-            best_move = None
-            best_move_value = -math.inf
-
-            for bin_ in self.current_solution:
-                for item_set_s in bin_:
-                    if not self.is_tabu(item_set_s, bin_):
-                        for item_set_t in self.unplaced_items:
-                            feasible_move, move_value = self.feasible(
-                                item_set_s, item_set_t, bin_
-                            )
-                            if feasible_move and move_value > best_move_value:
-                                best_move = (item_set_s, item_set_t, bin_)
-                                best_move_value = move_value
-
+            best_move = self.best_move()
             if best_move is None:
                 break
 
-            for idx, bin_ in enumerate(self.current_solution):
-                if best_move[0] in bin_:
-                    item_index = np.where(bin_ == best_move[0])[0][0]
-                    bin_ = np.delete(bin_, item_index)
-                    bin_ = np.append(bin_, best_move[1])
-                    self.current_solution[idx] = bin_
-                    break
-
-            lixo_index = np.where(self.unplaced_items == best_move[1])[0][0]
-            self.unplaced_items = np.delete(self.unplaced_items, lixo_index)
-            self.unplaced_items = np.append(self.unplaced_items, best_move[0])
+            slot, unplaced_slot = best_move
+            bin_id = self.owner[slot]
+            item_id = self.packed[slot]
+            self.loads[bin_id] += self.feasible(slot, unplaced_slot)[1]
+            self.packed[slot] = self.unplaced[unplaced_slot]
+            self.unplaced[unplaced_slot] = item_id
 
-            if self.evaluate(self.current_solution) < self.evaluate(self.best_solution):
-                self.best_solution = [bin_.copy() for bin_ in self.current_solution]
+            weight = int(self.loads.sum())
+            if weight > best_weight:
+                best_weight = weight
+                best_state = (self.packed.copy(), self.unplaced.copy())
                 self.tabu_list.clear()
+                self.frequency.clear()
             else:
-                self.update_tabu(best_move)
+                self.update_tabu((item_id, bin_id))
 
-            self.update_tabu_list()
-            iteration += 1
+            if len(self.tabu_list) > len(self.packed):
+                self.update_tabu_list()
+            self.iteration += 1
 
+        self.current_solution = self.__to_solution(self.packed)
+        self.best_solution = self.__to_solution(best_state[0])
+        self.unplaced_items = self.sizes[best_state[1]]
         return self.best_solution
 
-    def is_tabu(self, item_set_s, bin_):
+    def best_move(self):
+        """
+        Finds the best move that is not tabu: the swap of a packed item with the
+        largest unplaced item that still fits in its bin, evaluated for all
+        packed items at once.
+
+        Returns
+        -------
+        tuple
+            The slot of the packed item and the position of the unplaced item,
+            or None if no feasible move exists.
+        """
+        if not self.unplaced.size or not self.packed.size:
+            return None
+
+        unplaced_sizes = self.sizes[self.unplaced]
+        order = np.argsort(unplaced_sizes, kind="stable")
+        packed_sizes = self.sizes[self.packed]
+        limits = self.capacity - self.loads[self.owner] + packed_sizes
+        idx = np.searchsorted(unplaced_sizes[order], limits, side="right") - 1
+        values = unplaced_sizes[order[np.maximum(idx, 0)]] - packed_sizes
+
+        candidates = np.flatnonzero(idx >= 0)
+        for slot in candidates[np.argsort(-values[candidates], kind="stable")]:
+            if not self.is_tabu(self.packed[slot], self.owner[slot]):
+                return int(slot), int(order[idx[slot]])
+        return None
+
+    def is_tabu(self, item_id, bin_id):
         """
         Checks if a move is tabu.
 
         Parameters
         ----------
-        item_set_s : int
-            The item that is being considered for a move.
-        bin_ : np.ndarray
-            The bin where the item is currently placed.
+        item_id : int
+            The id of the item that is being considered for a move.
+        bin_id : int
+            The id of the bin where the item is currently placed.
 
         Returns
         -------
         bool
             True if the move is tabu, False otherwise.
         """
-        return (item_set_s, tuple(bin_)) in self.tabu_list
+        return self.tabu_list.get((int(item_id), int(bin_id)), -1) > self.iteration
 
     def update_tabu(self, move):
         """
@@ -139,39 +192,34 @@ class TabuCNS:
         Parameters
         ----------
         move : tuple
-            The move to be added to the tabu list. It is a tuple containing the item being moved
-            and the bin it is moved from.
+            The move to be added to the tabu list. It is a tuple containing the id of
+            the item being moved and the id of the bin it is moved from.
         """
-        move_key = (move[0], tuple(move[2]))
-        if move_key in self.tabu_list:
-            self.tabu_list[move_key]["frequency"] += 1
-        else:
-            self.tabu_list[move_key] = {"frequency": 1, "tenure": 0}
-        self.tabu_list[move_key]["tenure"] = self.tabu_list[move_key]["frequency"] // 2
+        move_key = (int(move[0]), int(move[1]))
+        self.frequency[move_key] = self.frequency.get(move_key, 0) + 1
+        self.tabu_list[move_key] = self.iteration + self.frequency[move_key] // 2
 
     def update_tabu_list(self):
         """
-        Updates the tenure of moves in the tabu list.
-        Moves with zero or negative tenure are removed.
+        Removes the expired moves from the tabu list.
         """
-        for move in list(self.tabu_list.keys()):
-            self.tabu_list[move]["tenure"] -= 1
-            if self.tabu_list[move]["tenure"] <= 0:
-                del self.tabu_list[move]
+        self.tabu_list = {
+            move: expiry
+            for move, expiry in self.tabu_list.items()
+            if expiry > self.iteration
+        }
 
-    def feasible(self, item_set_s, item_set_t, bin_):
+    def feasible(self, slot, unplaced_slot):
         """
-        Checks if swapping two items between bins is feasible, meaning the total weight
-        of the bin after the move does not exceed the bin's capacity.
+        Checks if swapping a packed item with an unplaced item is feasible, meaning
+        the total weight of the bin after the move does not exceed the bin's capacity.
 
         Parameters
         ----------
-        item_set_s : int
-            The item currently in the bin.
-        item_set_t : int
-            The item from the unplaced items being considered for swapping.
-        bin_ : np.ndarray
-            The bin where the swap is being considered.
+        slot : int
+            The slot of the packed item.
+        unplaced_slot : int
+            The position of the unplaced item being considered for swapping.
 
         Returns
         -------
@@ -179,9 +227,10 @@ class TabuCNS:
             A tuple containing a boolean indicating whether the move is feasible
             and the change in bin weight resulting from the move.
         """
-        current_bin_weight = sum(bin_)
-        new_bin_weight = current_bin_weight - item_set_s + item_set_t
-        move_value = new_bin_weight - current_bin_weight
+        move_value = int(
+            self.sizes[self.unplaced[unplaced_slot]] - self.sizes[self.packed[slot]]
+        )
+        new_bin_weight = self.loads[self.owner[slot]] + move_value
         return new_bin_weight <= self.capacity, move_value
 
     def evaluate(self, solution):
@@ -199,4 +248,10 @@ class TabuCNS:
         int
             The total weight of all bins in the current solution.
         """
-        return sum(sum(bin_) for bin_ in solution)
+        return int(sum(bin_.sum() for bin_ in solution))
+
+    def __to_solution(self, packed):
+        """Builds the list of bins with the item sizes of a packed array."""
+        if not self.current_solution:
+            return []
+        return np.split(self.sizes[packed], self.__bounds)
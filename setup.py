@@ -8,13 +8,15 @@ install_requires = [
     'wheel>=0.44.0',
 ]
 
+# The native tabu_structure wheels are only built for CPython 3.8, on other
+# versions binpacksolver.utils falls back to the pure Python implementation.
 if platform.system() == "Windows":
     install_requires.append(
-        'tabu_structure @ https://github.com/SU4NE/II-desafio-em-otimizacao-com-metaheuristica/releases/download/tabu_structure/tabu_structure-0.1.0-cp38-none-win_amd64.whl'
+        'tabu_structure @ https://github.com/SU4NE/II-desafio-em-otimizacao-com-metaheuristica/releases/download/tabu_structure/tabu_structure-0.1.0-cp38-none-win_amd64.whl ; python_version == "3.8"'
     )
 elif platform.system() == "Linux":
     install_requires.append(
-        'tabu_structure @ https://github.com/SU4NE/II-desafio-em-otimizacao-com-metaheuristica/releases/download/tabu_structure/tabu_structure-0.1.0-cp38-cp38-linux_x86_64.whl'
+        'tabu_structure @ https://github.com/SU4NE/II-desafio-em-otimizacao-com-metaheuristica/releases/download/tabu_structure/tabu_structure-0.1.0-cp38-cp38-linux_x86_64.whl ; python_version == "3.8"'
     )
 
 setup(
@@ -0,0 +1,78 @@
+"""Tests of the index of the best-known solutions."""
+
+import os
+import zipfile
+
+import pytest
+
+from binpacksolver.utils import (BestKnown, convert_solutions, instance_key,
+                                 load_best_known)
+
+NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+SHARED = ["Name", "Best LB", "Best UB", "HARD0.BPP", "N1C1W1_A.txt", "broken"]
+ROWS = [
+    [("s", 0), ("s", 1), ("s", 2)],
+    [("s", 3), ("n", 56), ("n", 56)],
+    [("s", 4), ("n", 25), ("n", 26)],
+    [("s", 5), ("n", 1)],
+]
+
+
+def cell(column: int, row: int, kind: str, value) -> str:
+    """A cell of a worksheet, shared string or number."""
+    kind = ' t="s"' if kind == "s" else ""
+    return f'<c r="{"ABC"[column]}{row}"{kind}><v>{value}</v></c>'
+
+
+@pytest.fixture(name="workbook")
+def fixture_workbook(tmp_path):
+    """A minimal Solutions.xlsx inside a zip file, as in data/dados.zip."""
+    shared = "".join(f"<si><t>{text}</t></si>" for text in SHARED)
+    rows = "".join(
+        f'<row r="{i}">'
+        + "".join(cell(j, i, *value) for j, value in enumerate(row))
+        + "</row>"
+        for i, row in enumerate(ROWS, start=1)
+    )
+    xlsx = tmp_path / "Solutions.xlsx"
+    with zipfile.ZipFile(xlsx, "w") as archive:
+        archive.writestr("xl/sharedStrings.xml", f"<sst {NS}>{shared}</sst>")
+        archive.writestr(
+            "xl/worksheets/sheet1.xml",
+            f"<worksheet {NS}><sheetData>{rows}</sheetData></worksheet>",
+        )
+    path = tmp_path / "dados.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.write(xlsx, "Solutions.xlsx")
+        archive.writestr("set/HARD0.BPP", "1\n10\n5\n")
+    return str(path)
+
+
+def test_instance_key():
+    assert instance_key("data/set/HARD0.BPP") == "HARD0"
+    assert instance_key("N1C1W1_A.txt") == "N1C1W1_A"
+
+
+def test_convert_and_lookup(workbook, tmp_path):
+    path = str(tmp_path / "best.csv")
+    assert convert_solutions(workbook, path) == 2
+    best = BestKnown(path)
+    assert len(best) == 2
+    assert "HARD0.BPP" in best and "HARD0" in best
+    assert best.get("HARD0.txt") == 56
+    assert best.get("missing") is None
+    assert best.get("missing", 0) == 0
+    assert best.is_optimal("HARD0.BPP")
+    assert not best.is_optimal("N1C1W1_A.BPP")
+    assert not best.is_optimal("missing")
+    assert best.gap("N1C1W1_A.BPP", 39) == pytest.approx(0.5)
+    assert best.gap("missing", 10) is None
+
+
+def test_load_best_known_converts_once(workbook):
+    path = os.path.join(os.path.dirname(workbook), "best_known.csv")
+    assert load_best_known(workbook).get("HARD0") == 56
+    assert os.path.exists(path)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write("extra,3,3\n")
+    assert load_best_known(workbook).get("extra") == 3
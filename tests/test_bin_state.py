@@ -0,0 +1,85 @@
+"""Tests of the in-place packing and its undo log."""
+
+import numpy as np
+
+from binpacksolver.utils import BinState
+
+
+def snapshot(state: BinState) -> tuple:
+    """Every field of the state that a rollback must restore."""
+    return (
+        [list(bin_) for bin_ in state.bins],
+        list(state.loads),
+        list(state.ids),
+        dict(state.position),
+        state.next_id,
+        state.square_sum,
+    )
+
+
+def make_state() -> BinState:
+    """Three bins of capacity 10."""
+    return BinState([np.array([5, 3]), np.array([4]), np.array([6, 2, 1])], 10)
+
+
+def test_loads_and_square_sum():
+    state = make_state()
+    assert state.loads == [8, 4, 9]
+    assert state.square_sum == 8**2 + 4**2 + 9**2
+    assert state.fits(1, 6)
+    assert not state.fits(1, 7)
+
+
+def test_relocate_rollback():
+    state = make_state()
+    before = snapshot(state)
+    state.relocate(0, 1, 1)
+    assert state.loads == [5, 7, 9]
+    assert state.square_sum == sum(load * load for load in state.loads)
+    state.rollback()
+    assert snapshot(state) == before
+    assert not state.undo_log
+
+
+def test_relocate_drops_empty_bin_and_rollback_restores_it():
+    state = make_state()
+    before = snapshot(state)
+    state.relocate(1, 0, 0)
+    assert len(state) == 2
+    assert 1 not in state.position
+    assert state.position[state.ids[1]] == 1
+    state.rollback()
+    assert snapshot(state) == before
+
+
+def test_relocate_opens_bin_and_rollback_closes_it():
+    state = make_state()
+    before = snapshot(state)
+    state.relocate(2, 0, len(state))
+    assert len(state) == 4
+    assert state.ids[-1] == 3
+    assert state.bins[-1] == [6]
+    state.rollback()
+    assert snapshot(state) == before
+
+
+def test_swap_commit_and_rollback():
+    state = make_state()
+    state.swap(0, 0, 2, 0)
+    assert sorted(state.bins[0]) == [3, 6]
+    assert sorted(state.bins[2]) == [1, 2, 5]
+    state.commit()
+    assert not state.undo_log
+    committed = snapshot(state)
+    state.swap(0, 1, 1, 0)
+    state.relocate(2, 0, 1)
+    state.rollback()
+    assert snapshot(state) == committed
+
+
+def test_to_solution():
+    state = make_state()
+    state.relocate(1, 0, 0)
+    solution = state.to_solution()
+    assert [bin_.tolist() for bin_ in solution] == [[5, 3, 4], [6, 2, 1]]
+    assert all(bin_.dtype == int for bin_ in solution)
@@ -0,0 +1,57 @@
+"""Validity tests of the heuristics on a small instance."""
+
+import random
+
+import numpy as np
+import pytest
+
+from binpacksolver.heuristic import (artificial_bee_colony, bat_algorithm,
+                                     caotic_grey_wolf_optimization,
+                                     consistent_neighborhood_search,
+                                     dragonfly_algorithm,
+                                     elephant_herding_optimization,
+                                     genetic_algorithm_cgt,
+                                     imperialist_competitive_algorithm,
+                                     improved_coati_optimization_algorithm,
+                                     improved_whale_optimization_algorithm,
+                                     memetic_algorithm, simulated_annealing,
+                                     symbiotic_organisms_search, tabu_search)
+
+CAPACITY = 100
+
+HEURISTICS = [
+    pytest.param(caotic_grey_wolf_optimization, {"max_it": 20}, id="acgwo"),
+    pytest.param(dragonfly_algorithm, {"max_it": 20}, id="da"),
+    pytest.param(simulated_annealing, {"time_max": 0.2}, id="sa"),
+    pytest.param(tabu_search, {"max_it": 200}, id="tabu_search"),
+    pytest.param(consistent_neighborhood_search, {"time_max": 0.5}, id="cns"),
+    pytest.param(imperialist_competitive_algorithm, {"max_it": 20}, id="ica"),
+    pytest.param(memetic_algorithm, {"max_it": 20}, id="ma"),
+    pytest.param(elephant_herding_optimization, {"max_it": 20}, id="eho"),
+    pytest.param(symbiotic_organisms_search, {"max_it": 20}, id="sos"),
+    pytest.param(improved_coati_optimization_algorithm, {"max_it": 20}, id="tntwcoa"),
+    pytest.param(bat_algorithm, {"max_it": 20}, id="ba"),
+    pytest.param(artificial_bee_colony, {"max_it": 20}, id="abc"),
+    pytest.param(improved_whale_optimization_algorithm, {"max_it": 20}, id="iwoa"),
+    pytest.param(genetic_algorithm_cgt, {"max_it": 20}, id="ggacgt"),
+]
+
+
+@pytest.fixture(name="items")
+def fixture_items():
+    """
+    Thirty items above half the capacity, which need a bin each, and thirty
+    small ones, so the lower bound is never reached and every search runs to
+    its limit.
+    """
+    random.seed(0)
+    np.random.seed(0)
+    return np.r_[np.random.randint(51, 76, 30), np.random.randint(5, 41, 30)]
+
+
+@pytest.mark.parametrize("heuristic, kwargs", HEURISTICS)
+def test_packing_is_valid(heuristic, kwargs, items):
+    bins, fit = heuristic(items.copy(), CAPACITY, **kwargs)
+    assert sorted(np.concatenate(bins).tolist()) == sorted(items.tolist())
+    assert all(bin_.sum() <= CAPACITY for bin_ in bins)
+    assert fit == len(bins)
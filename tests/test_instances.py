@@ -0,0 +1,84 @@
+"""Tests of the instance reader and its memory-mapped cache."""
+
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from binpacksolver.utils import (InstanceCache, load_instances, parse_instance,
+                                 read_zip_instances)
+
+INSTANCES = {
+    "set1/a.BPP": "3\n10\n4\n5\n6\n",
+    "set1/b.txt": "2\n20\n7.0\n9\n",
+    "set2/c.BPP": "4\n15\n1\n2\n3\n4\n",
+    "set2/notes.md": "not an instance",
+}
+
+
+@pytest.fixture(name="zip_path")
+def fixture_zip_path(tmp_path):
+    """A zip file with instances in two folders."""
+    path = tmp_path / "instances.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, text in INSTANCES.items():
+            archive.writestr(name, text)
+    return str(path)
+
+
+def test_parse_instance():
+    capacity, weights = parse_instance("3 100\n10\n20.0\n30\n99\n")
+    assert capacity == 100
+    assert weights.tolist() == [10, 20, 30]
+
+
+def test_read_zip_instances(zip_path):
+    names = [name for _, name, _, _ in read_zip_instances(zip_path)]
+    assert names == ["a.BPP", "b.txt", "c.BPP"]
+    assert [name for _, name, _, _ in read_zip_instances(zip_path, ["set2"])] == [
+        "c.BPP"
+    ]
+    assert [
+        name for _, name, _, _ in read_zip_instances(zip_path, pattern="*.txt")
+    ] == ["b.txt"]
+
+
+def test_cache_matches_zip(zip_path, tmp_path):
+    cache = load_instances(zip_path, str(tmp_path / "cache"))
+    assert len(cache) == 3
+    assert "b.txt" in cache
+    for group, name, capacity, weights in read_zip_instances(zip_path):
+        cached = list(cache.select([group], name))
+        assert len(cached) == 1
+        assert cached[0][:3] == (group, name, capacity)
+        assert np.array_equal(cached[0][3], weights)
+    assert cache[0][0] == 10
+    assert cache["c.BPP"][1].tolist() == [1, 2, 3, 4]
+
+
+def test_cache_is_read_only_view(zip_path, tmp_path):
+    cache = load_instances(zip_path, str(tmp_path / "cache"))
+    _, weights = cache["a.BPP"]
+    assert np.shares_memory(weights, cache.weights)
+    assert not weights.flags.writeable
+
+
+def test_cache_is_reused_until_zip_changes(zip_path, tmp_path):
+    path = str(tmp_path / "cache")
+    load_instances(zip_path, path)
+    built = os.path.getmtime(f"{path}.npy")
+    os.utime(f"{path}.npy", (built - 100, built - 100))
+    assert load_instances(zip_path, path).source_mtime == os.path.getmtime(zip_path)
+    assert os.path.getmtime(f"{path}.npy") == built - 100
+
+    os.utime(zip_path, (built + 100, built + 100))
+    cache = load_instances(zip_path, path)
+    assert cache.source_mtime == built + 100
+    assert os.path.getmtime(f"{path}.npy") != built - 100
+
+
+def test_default_cache_path(zip_path):
+    cache = load_instances(zip_path)
+    assert isinstance(cache, InstanceCache)
+    assert os.path.exists(os.path.splitext(zip_path)[0] + ".npy")
@@ -0,0 +1,67 @@
+"""Tests of the batched population kernels against their per-row versions."""
+
+import numpy as np
+import pytest
+
+from binpacksolver.utils import (fitness, fitness_population, local_search,
+                                 local_search_population, repair_population,
+                                 repair_solution)
+
+CAPACITY = 100
+
+
+@pytest.fixture(name="population")
+def fixture_population():
+    """Eight shuffled copies of forty items, with repeated weights."""
+    rng = np.random.default_rng(7)
+    items = rng.integers(1, 60, 40)
+    return np.array([rng.permutation(items) for _ in range(8)])
+
+
+def perturb(population: np.ndarray, seed: int) -> np.ndarray:
+    """Moves the items of every row, a fifth of them to fractional values."""
+    rng = np.random.default_rng(seed)
+    moved = population + rng.integers(-5, 6, population.shape)
+    fractional = rng.random(population.shape) < 0.2
+    return np.where(fractional, moved + 0.5, moved)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_repair_population_matches_repair_solution(population, seed):
+    candidates = perturb(population, seed)
+    repaired = repair_population(population, candidates, CAPACITY)
+    assert repaired.dtype == int
+    for row, candidate, result in zip(population, candidates, repaired):
+        assert result.tolist() == repair_solution(row, candidate, CAPACITY).tolist()
+
+
+def test_repair_population_without_kept_items(population):
+    repaired = repair_population(population, population + 0.5, CAPACITY)
+    for row, result in zip(population, repaired):
+        assert sorted(result) == sorted(row)
+
+
+def test_repair_population_keeps_valid_rows(population):
+    repaired = repair_population(population, population, CAPACITY)
+    assert np.array_equal(repaired, population)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fitness_population_matches_fitness(population, seed):
+    rows = perturb(population, seed).astype(int)
+    expected = [fitness(row, CAPACITY) for row in rows]
+    assert fitness_population(rows, CAPACITY).tolist() == expected
+    assert fitness_population(rows[0], CAPACITY).tolist() == expected[:1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_local_search_population_matches_local_search(population, seed):
+    np.random.seed(seed)
+    expected = local_search(population[0], CAPACITY, 1, 59)
+    np.random.seed(seed)
+    result = local_search_population(population[:1], CAPACITY, 1, 59)
+    assert result.tolist() == [expected.tolist()]
+
+    searched = local_search_population(population, CAPACITY, 1, 59)
+    for row, result in zip(population, searched):
+        assert sorted(result) == sorted(row)
@@ -0,0 +1,102 @@
+"""Tests of the instrumentation of the hot paths."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from binpacksolver.utils import Profile, increment, profile, profiled
+
+
+@profiled("repair", batch=True)
+def repair_rows(rows: np.ndarray) -> np.ndarray:
+    """A batched kernel."""
+    return rows
+
+
+@profiled("fitness")
+def slow_fitness(delay: float) -> float:
+    """A kernel that takes some time."""
+    time.sleep(delay)
+    return delay
+
+
+@profiled("move")
+def move_with_evaluation(delay: float) -> float:
+    """A phase nested around another one."""
+    return slow_fitness(delay)
+
+
+def test_disabled_probes_pass_through():
+    assert repair_rows.__name__ == "repair_rows"
+    assert slow_fitness(0) == 0
+    increment("iterations")
+
+
+def test_counts_and_batches():
+    with profile() as current:
+        repair_rows(np.zeros((5, 3)))
+        repair_rows(np.zeros(3))
+        slow_fitness(0)
+        increment("iterations")
+        increment("iterations", 2)
+    assert current.counts == {"repair": 6, "fitness": 1, "iterations": 3}
+    assert current.elapsed > 0
+
+
+def test_nested_phases_are_exclusive():
+    with profile() as current:
+        move_with_evaluation(0.05)
+    assert current.times["fitness"] >= 0.04
+    assert current.times["move"] < current.times["fitness"]
+    assert current.counts["move"] == current.counts["fitness"] == 1
+
+
+def test_profiles_nest_and_restore():
+    with profile() as outer:
+        with profile() as inner:
+            slow_fitness(0)
+        slow_fitness(0)
+    assert inner.counts == {"fitness": 1}
+    assert outer.counts == {"fitness": 1}
+
+
+def test_phase_is_left_on_error():
+    @profiled("move")
+    def failing():
+        raise ValueError
+
+    with profile() as current:
+        with pytest.raises(ValueError):
+            failing()
+        slow_fitness(0)
+    assert current.counts == {"move": 1, "fitness": 1}
+
+
+def test_threads_are_isolated():
+    def worker():
+        slow_fitness(0)
+
+    with profile() as current:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    assert not current.counts
+
+
+def test_merge_and_summary():
+    first, second = Profile(), Profile()
+    first.counts, first.times, first.elapsed = {"fitness": 4}, {"fitness": 1.0}, 2.0
+    second.counts = {"fitness": 6, "repair": 2, "iterations": 5}
+    second.times, second.elapsed = {"repair": 1.0}, 2.0
+    first.merge(second)
+
+    stats = first.summary()
+    assert stats["iterations"] == 5
+    assert stats["evaluations"] == 10
+    assert stats["evaluations/s"] == pytest.approx(2.5)
+    assert stats["repairs/s"] == pytest.approx(0.5)
+    assert stats["% time in fitness"] == pytest.approx(25)
+    assert stats["% time in repair"] == pytest.approx(25)
+    assert stats["% time in decode"] == 0
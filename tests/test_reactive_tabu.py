@@ -0,0 +1,95 @@
+"""Tests of the reactive tabu memory."""
+
+import numpy as np
+import pytest
+
+from binpacksolver.utils import ReactiveTabu
+
+
+def blocked_iterations(tabu: ReactiveTabu, attribute: int) -> int:
+    """Makes an attribute tabu and counts the following iterations it blocks."""
+    tabu.make_tabu(attribute)
+    tabu.step()
+    blocked = 0
+    while tabu.is_tabu(attribute):
+        blocked += 1
+        tabu.step()
+    return blocked
+
+
+@pytest.mark.parametrize("size", [10, None])
+@pytest.mark.parametrize("tenure", [1, 2, 5])
+def test_tenure_blocks_next_iterations(tenure, size):
+    assert blocked_iterations(ReactiveTabu(tenure, size=size), 3) == tenure
+
+
+@pytest.mark.parametrize("size", [10, None])
+def test_is_tabu_many_matches_is_tabu(size):
+    tabu = ReactiveTabu(3, size=size)
+    for attribute in (1, 4, 7):
+        tabu.make_tabu(attribute)
+    tabu.step()
+    attributes = np.arange(10)
+    expected = [tabu.is_tabu(attribute) for attribute in attributes]
+    assert tabu.is_tabu_many(attributes).tolist() == expected
+    assert np.flatnonzero(expected).tolist() == [1, 4, 7]
+
+
+def test_out_of_range_attribute():
+    with pytest.raises(IndexError):
+        ReactiveTabu(3, size=10).make_tabu(10)
+
+
+def test_map_memory_stays_small():
+    tabu = ReactiveTabu(2)
+    for attribute in range(1000):
+        tabu.make_tabu((attribute, attribute + 1))
+        tabu.step()
+    assert tabu.memory is None
+    assert len(tabu.until) <= 4 * tabu.tenure + 65
+    assert tabu.is_tabu((999, 1000))
+    assert not tabu.is_tabu((0, 1))
+
+
+def test_visit_grows_and_improve_shrinks_tenure():
+    tabu = ReactiveTabu(4, min_tenure=2, max_tenure=6)
+    assert not tabu.visit(42)
+    assert tabu.visit(42)
+    assert tabu.cycles == 1
+    assert tabu.tenure == pytest.approx(4 * 1.2 + 1)
+    tabu.visit(42)
+    assert tabu.tenure == 6
+
+    tabu.improve()
+    assert not tabu.visited
+    assert tabu.tenure == pytest.approx(6 * 0.9)
+    for _ in range(20):
+        tabu.improve()
+    assert tabu.tenure == 2
+
+
+def test_penalty_follows_frequency():
+    tabu = ReactiveTabu(1, penalty_weight=2, size=10)
+    tabu.make_tabu(5)
+    tabu.make_tabu(5)
+    tabu.make_tabu(6)
+    for _ in range(4):
+        tabu.step()
+    assert tabu.penalty(5) == pytest.approx(2 * 2 / 4)
+    assert tabu.penalty(np.array([5, 6, 7])).tolist() == pytest.approx([1, 0.5, 0])
+
+    sparse = ReactiveTabu(1, penalty_weight=2)
+    sparse.make_tabu((1, 2))
+    sparse.step()
+    assert sparse.penalty((1, 2)) == pytest.approx(2)
+    assert sparse.penalty((2, 3)) == 0
+
+
+def test_hashes_ignore_order():
+    bins = [np.array([3, 1, 2]), np.array([5, 4])]
+    shuffled = [np.array([4, 5]), np.array([2, 3, 1])]
+    assert ReactiveTabu.bin_hash(bins[0]) == ReactiveTabu.bin_hash(shuffled[1])
+    assert ReactiveTabu.packing_hash(bins) == ReactiveTabu.packing_hash(shuffled)
+    assert ReactiveTabu.packing_hash(bins) != ReactiveTabu.packing_hash(
+        [np.array([3, 1]), np.array([5, 4, 2])]
+    )
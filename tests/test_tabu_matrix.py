@@ -0,0 +1,56 @@
+"""Tests of the dense tabu memory."""
+
+import numpy as np
+import pytest
+
+from binpacksolver.utils import TabuMatrix
+
+
+@pytest.fixture(name="matrix")
+def fixture_matrix():
+    """An empty memory of 8 attributes."""
+    return TabuMatrix(8)
+
+
+def test_insert_expires_after_tenure(matrix):
+    assert len(matrix) == 8
+    assert not matrix.find(3)
+    matrix.insert(3, 2)
+    assert matrix.find(3)
+    matrix.step()
+    assert matrix.find(3)
+    matrix.step()
+    assert not matrix.find(3)
+
+
+def test_find_many_and_insert_many(matrix):
+    matrix.insert_many(np.array([1, 5], dtype=np.int64), 1)
+    found = matrix.find_many(np.arange(8, dtype=np.int64))
+    assert found.dtype == bool
+    assert np.flatnonzero(found).tolist() == [1, 5]
+    matrix.step()
+    assert not matrix.find_many(np.arange(8, dtype=np.int64)).any()
+
+
+@pytest.mark.parametrize("attribute", [-1, 8])
+def test_out_of_range(matrix, attribute):
+    with pytest.raises(IndexError):
+        matrix.find(attribute)
+    with pytest.raises(IndexError):
+        matrix.insert(attribute, 1)
+    with pytest.raises(IndexError):
+        matrix.find_many(np.array([0, attribute], dtype=np.int64))
+
+
+def test_insert_many_is_atomic(matrix):
+    with pytest.raises(IndexError):
+        matrix.insert_many(np.array([2, 4, 8], dtype=np.int64), 3)
+    assert not matrix.find_many(np.arange(8, dtype=np.int64)).any()
+
+
+def test_clear(matrix):
+    matrix.insert(0, 5)
+    matrix.step()
+    matrix.clear()
+    assert matrix.iteration == 0
+    assert not matrix.find(0)